@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoConsulting.settings")
+# Persistent connections are per thread, and under ASGI sync code runs on
+# short-lived executor threads: connections would pile up instead of being
+# reused. Close them after each request (or set DATABASES_POOL).
+os.environ.setdefault("DATABASES_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
@@ -0,0 +1,23 @@
+"""
+Gunicorn config for the ASGI deployment (uvicorn workers).
+
+    gunicorn -c DjangoConsulting/gunicorn_asgi.py DjangoConsulting.asgi:application
+
+Async views (file downloads, ZIP streaming, search suggestions) run on the
+worker's event loop, so long S3 transfers do not pin a worker; sync views
+still run in a thread each. For a single process, uvicorn can be run
+directly:
+
+    uvicorn DjangoConsulting.asgi:application --host 0.0.0.0 --port 8000
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Streaming downloads can take longer than gunicorn's default 30 seconds.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 import environ  # Add this line to import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # Initialize environ
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -15,7 +16,8 @@ DEBUG = False
 
 ALLOWED_HOSTS = ["*"]
 
-# Database configuration
+# Database configuration. PostgreSQL only, tests included: the migrations
+# create text_pattern_ops indexes and the task queue relies on SKIP LOCKED.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -24,9 +26,45 @@ DATABASES = {
         'PASSWORD': env('DATABASES_PASSWORD'),
         'HOST': env('DATABASES_HOST'),
         'PORT': env('DATABASES_PORT'),
+        # Keep connections open between requests (seconds; 0 closes them after
+        # every request) and check they still work before reusing them. The
+        # ASGI entry point (asgi.py) defaults this to 0.
+        'CONN_MAX_AGE': env.int('DATABASES_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': env.bool('DATABASES_CONN_HEALTH_CHECKS', default=True),
+        # Behind pgbouncer in transaction mode, server-side cursors (used by
+        # QuerySet.iterator(), e.g. the exports) do not survive between
+        # transactions.
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DATABASES_PGBOUNCER', default=False),
+        'OPTIONS': {},
     }
 }
 
+# Connection pool of psycopg 3 (psycopg-pool, in requirements.txt), shared
+# by the threads of a process; mostly useful under ASGI, where persistent
+# connections are per thread. Replaces CONN_MAX_AGE, which must be 0.
+if env.bool('DATABASES_POOL', default=False):
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            'DATABASES_POOL requires psycopg 3 with the pool extra: pip install "psycopg[binary,pool]"'
+        )
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': env.int('DATABASES_POOL_MIN_SIZE', default=2),
+        'max_size': env.int('DATABASES_POOL_MAX_SIZE', default=10),
+        'timeout': env.int('DATABASES_POOL_TIMEOUT', default=10),
+    }
+
+# Per-process LocMem by default. Set CACHE_URL (e.g. redis://host:6379/1) to a
+# shared cache when running several workers: the version keys that invalidate
+# the per-process lookup tables and matching results live there.
+CACHES = {'default': env.cache('CACHE_URL', default='locmemcache://')}
+# Without a shared cache an invalidation only reaches the process that made
+# the change, so cached results and lookup tables are only kept this many
+# seconds (utilities/cache.py; `check --deploy` warns about it).
+LOCAL_CACHE_MAX_TIMEOUT = env.int('LOCAL_CACHE_MAX_TIMEOUT', default=60)
+
 # AWS S3 Configuration
 AWS_ACCESS_KEY_ID = env('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = env('AWS_SECRET_ACCESS_KEY')
@@ -37,6 +75,8 @@ AWS_S3_FILE_OVERWRITE = False
 AWS_DEFAULT_ACL = None
 AWS_S3_SIGNATURE_VERSION = 's3v4'
 AWS_QUERYSTRING_AUTH = False
+# Threads used for blocking S3 reads by the async download views.
+S3_IO_THREADS = env.int('S3_IO_THREADS', default=16)
 AWS_S3_OBJECT_PARAMETERS = {
     'CacheControl': 'max-age=86400',
 }
@@ -61,6 +101,7 @@ INSTALLED_APPS = [
     "manage_documents.apps.ManageDocumentsConfig",
     "utilities.apps.UtilitiesConfig",
     "jobs.apps.JobsConfig",
+    "background_tasks.apps.BackgroundTasksConfig",
 
 
 
@@ -72,6 +113,8 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    # Index expressions with operator classes (utilities prefix indexes).
+    "django.contrib.postgres",
 
     # Third-party apps
     "django_extensions",
@@ -83,6 +126,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "main.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -94,6 +138,33 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.LoginRequiredMiddleware",
 ]
 
+# Request metrics (main.middleware.RequestMetricsMiddleware): requests slower
+# than this, or running more queries, are logged with their worst statements.
+REQUEST_METRICS_SLOW_MS = env.int("REQUEST_METRICS_SLOW_MS", default=500)
+REQUEST_METRICS_MAX_QUERIES = env.int("REQUEST_METRICS_MAX_QUERIES", default=50)
+REQUEST_METRICS_WORST_QUERIES = 5
+REQUEST_METRICS_SERVER_TIMING = env.bool("REQUEST_METRICS_SERVER_TIMING", default=True)
+
+# Admin changelists of tables above this many rows show PostgreSQL's row
+# estimate instead of running COUNT(*) (utilities.admin_mixins).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = env.int("ADMIN_ESTIMATED_COUNT_THRESHOLD", default=50000)
+
+# History tables (utilities.history): superseded versions older than this
+# are deleted by prune_history; create_history_partitions keeps this many
+# monthly partitions ahead of the current month.
+HISTORY_RETENTION_DAYS = env.int("HISTORY_RETENTION_DAYS", default=730)
+HISTORY_PARTITION_MONTHS_AHEAD = env.int("HISTORY_PARTITION_MONTHS_AHEAD", default=3)
+
+# Upload processing of candidate documents (candidates.upload_processing):
+# uploaded images are fitted to an A4 page at this DPI, stripped of EXIF
+# and recompressed, and optionally wrapped into one-page PDFs. Originals are
+# kept under originals/ only with UPLOAD_KEEP_ORIGINALS.
+UPLOAD_PROCESSING_ENABLED = env.bool("UPLOAD_PROCESSING_ENABLED", default=False)
+UPLOAD_TARGET_DPI = env.int("UPLOAD_TARGET_DPI", default=150)
+UPLOAD_JPEG_QUALITY = env.int("UPLOAD_JPEG_QUALITY", default=75)
+UPLOAD_IMAGES_TO_PDF = env.bool("UPLOAD_IMAGES_TO_PDF", default=False)
+UPLOAD_KEEP_ORIGINALS = env.bool("UPLOAD_KEEP_ORIGINALS", default=False)
+
 ROOT_URLCONF = "DjangoConsulting.urls"
 
 TEMPLATES = [
@@ -168,8 +239,28 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STORAGES = {
 
     # Media file (image) management S3StaticStorage, S3Storage
+    # Candidate documents are stored once per distinct content
+    # (utilities/storage.py); other files go to the backend as they are.
     "default": {
-        "BACKEND": "storages.backends.s3.S3StaticStorage",
+        "BACKEND": "utilities.storage.ContentAddressedStorage",
+        "OPTIONS": {
+            "backend": "storages.backends.s3.S3StaticStorage",
+            "prefixes": ["candidates/"],
+        },
+    },
+    # Candidate exports hold personal data: private objects, in their own
+    # bucket when AWS_EXPORTS_BUCKET_NAME is set, only handed out as
+    # short-lived signed URLs by the export download view (URLs on a custom
+    # domain are never signed).
+    "exports": {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": env("AWS_EXPORTS_BUCKET_NAME", default=AWS_STORAGE_BUCKET_NAME),
+            "location": "exports",
+            "custom_domain": None,
+            "querystring_auth": True,
+            "querystring_expire": 300,
+        },
     },
     # Static file management
     "staticfiles": {
@@ -177,6 +268,10 @@ STORAGES = {
     },
 }
 
+# Exports older than this are deleted after each new export and by the
+# delete_old_exports command.
+EXPORT_RETENTION_DAYS = env.int("EXPORT_RETENTION_DAYS", default=7)
+
 
 
 
@@ -196,6 +291,11 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 X_FRAME_OPTIONS = "SAMEORIGIN"
 
+# Background tasks (manage.py run_workers)
+BACKGROUND_TASKS_RETRY_BACKOFF = 30  # seconds, doubled on every retry
+BACKGROUND_TASKS_MAX_BACKOFF = 3600
+BACKGROUND_TASKS_STALE_AFTER = 3600  # re-queue running tasks locked longer than this
+
 
 # CKEditor Configuration
 customColorPalette = [
@@ -334,5 +434,16 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'background_tasks': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        # Slow request reports of main.middleware, one JSON object per line.
+        'main.middleware': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
\ No newline at end of file
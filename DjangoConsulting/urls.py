@@ -27,5 +27,7 @@ urlpatterns = [
                   path("candidates/", include("candidates.urls", namespace="candidates")),
                   path('documents/', include('manage_documents.urls')),
                   path('jobs/', include('jobs.urls', namespace='jobs')),
+                  path('tasks/', include('background_tasks.urls', namespace='background_tasks')),
+                  path('utilities/', include('utilities.urls', namespace='utilities')),
 
               ]
@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "progress", "attempts", "run_after", "created_by", "created_at")
+    list_filter = ("status", "name")
+    search_fields = ("name",)
+    readonly_fields = ("created_at", "updated_at", "finished_at", "locked_by", "locked_at")
+    actions = ["requeue"]
+
+    @admin.action(description="Re-queue selected tasks")
+    def requeue(self, request, queryset):
+        queryset.update(status=Task.QUEUED, attempts=0, locked_by="", locked_at=None)
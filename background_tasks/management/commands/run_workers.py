@@ -0,0 +1,106 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from background_tasks.worker import (
+    STALE_CHECK_SECONDS,
+    requeue_stale_tasks,
+    work,
+    worker_name,
+)
+
+
+def _run_worker(stop_event, poll_interval, max_tasks):
+    # Let the parent handle Ctrl+C and SIGTERM, then stop through the event.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    work(stop_event, poll_interval=poll_interval, max_tasks=max_tasks)
+
+
+class Command(BaseCommand):
+    help = "Run a pool of worker processes that execute queued background tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=multiprocessing.cpu_count())
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds an idle worker waits before polling the queue again.",
+        )
+        parser.add_argument(
+            "--max-tasks-per-worker",
+            type=int,
+            default=None,
+            help="Restart a worker process after it ran this many tasks.",
+        )
+
+    def requeue(self, processes=None):
+        """
+        Requeue the tasks left running by the exited ``processes``, or the
+        stale tasks of any worker. The parent's connection is closed again:
+        forked children must not share it.
+        """
+        locked_by = None if processes is None else [worker_name(p.pid) for p in processes]
+        requeued = requeue_stale_tasks(locked_by=locked_by)
+        connections.close_all()
+        if requeued:
+            self.stdout.write(f"Re-queued {requeued} stale tasks.")
+
+    def handle(self, *args, **options):
+        self.requeue()
+
+        context = multiprocessing.get_context("fork")
+        stop_event = context.Event()
+
+        # The handler only flips a flag: setting the multiprocessing Event from
+        # inside a signal handler can deadlock on its internal lock.
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        def spawn():
+            process = context.Process(
+                target=_run_worker,
+                args=(stop_event, options["poll_interval"], options["max_tasks_per_worker"]),
+                daemon=True,
+            )
+            process.start()
+            return process
+
+        pool = [spawn() for _ in range(options["concurrency"])]
+        self.stdout.write(self.style.SUCCESS(f"Started {len(pool)} workers."))
+
+        checked_at = time.monotonic()
+        while not stopping:
+            time.sleep(1)
+            # Replace workers that exited (recycled or crashed), putting back
+            # the task a crashed one was running.
+            exited = [process for process in pool if not process.is_alive()]
+            if exited and not stopping:
+                self.requeue(exited)
+                pool = [process if process.is_alive() else spawn() for process in pool]
+            # Workers of other hosts may have died too.
+            if time.monotonic() - checked_at >= STALE_CHECK_SECONDS:
+                self.requeue()
+                checked_at = time.monotonic()
+
+        self.stdout.write("Stopping workers...")
+        stop_event.set()
+        for process in pool:
+            process.join(timeout=30)
+        killed = [process for process in pool if process.is_alive()]
+        for process in killed:
+            process.kill()
+            process.join()
+        if killed:
+            self.requeue(killed)
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
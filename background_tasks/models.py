@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Task(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, _("Queued")),
+        (RUNNING, _("Running")),
+        (SUCCEEDED, _("Succeeded")),
+        (FAILED, _("Failed")),
+    ]
+
+    name = models.CharField(max_length=255, verbose_name=_("Task Name"))
+    args = models.JSONField(default=list, blank=True, verbose_name=_("Arguments"))
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name=_("Keyword Arguments"))
+    status = models.CharField(
+        choices=STATUS_CHOICES,
+        max_length=20,
+        default=QUEUED,
+        verbose_name=_("Status"),
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("Attempts"))
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name=_("Max Attempts"))
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Run After"),
+        help_text=_("The task is not picked up by a worker before this time."),
+    )
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name=_("Progress (%)"))
+    progress_message = models.CharField(
+        max_length=255, blank=True, verbose_name=_("Progress Message")
+    )
+    result = models.JSONField(null=True, blank=True, verbose_name=_("Result"))
+    error = models.TextField(blank=True, verbose_name=_("Last Error"))
+    locked_by = models.CharField(max_length=255, blank=True, verbose_name=_("Locked By"))
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Locked At"))
+    created_by = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="background_tasks",
+        verbose_name=_("Created By"),
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Finished At"))
+
+    class Meta:
+        verbose_name = _("Background Task")
+        verbose_name_plural = _("Background Tasks")
+        ordering = ["-created_at"]
+        indexes = [
+            # The queue poll: status = 'queued' AND run_after <= now() ORDER BY run_after
+            models.Index(
+                fields=["run_after"],
+                condition=models.Q(status="queued"),
+                name="task_queued_run_after_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def is_visible_to(self, user):
+        """Tasks, and their results, are shown to the user who queued them and to staff."""
+        return user.is_staff or (self.created_by_id is not None and self.created_by_id == user.pk)
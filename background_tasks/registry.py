@@ -0,0 +1,89 @@
+# background_tasks/registry.py
+import contextvars
+import logging
+
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+_current_task = contextvars.ContextVar("current_task", default=None)
+
+
+class TaskFunction:
+    """
+    A function registered with @task. Calling it runs it inline; enqueue()
+    stores a Task row that a `run_workers` process picks up.
+    """
+
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, user=None, run_after=None, **kwargs):
+        return Task.objects.create(
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs,
+            max_attempts=self.max_attempts,
+            run_after=run_after or timezone.now(),
+            created_by=user if user is not None and user.is_authenticated else None,
+        )
+
+    def enqueue_once(self, *args, **kwargs):
+        """Enqueue unless an identical call is already waiting in the queue."""
+        pending = Task.objects.filter(
+            name=self.name, args=list(args), kwargs=kwargs, status=Task.QUEUED
+        ).first()
+        return pending or self.enqueue(*args, **kwargs)
+
+
+def task(name=None, max_attempts=3):
+    """
+    Register a function as a background task. Arguments must be JSON
+    serializable since they are stored on the Task row.
+    """
+
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        task_function = TaskFunction(func, task_name, max_attempts)
+        _registry[task_name] = task_function
+        return task_function
+
+    return decorator
+
+
+def get_task_function(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"No background task registered as {name!r}.")
+
+
+def set_progress(percent, message=""):
+    """Report progress of the task currently running in this worker (no-op inline)."""
+    task_id = _current_task.get()
+    if task_id is None:
+        return
+    Task.objects.filter(pk=task_id).update(
+        progress=max(0, min(100, int(percent))),
+        progress_message=message[:255],
+        updated_at=timezone.now(),
+    )
+
+
+def run_task(task_obj):
+    """Execute a claimed Task in the current process and return its result."""
+    task_function = get_task_function(task_obj.name)
+    token = _current_task.set(task_obj.pk)
+    try:
+        return task_function(*task_obj.args, **task_obj.kwargs)
+    finally:
+        _current_task.reset(token)
@@ -0,0 +1,8 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag("background_tasks/includes/task_status.html")
+def task_status(task):
+    return {"task": task}
@@ -0,0 +1,202 @@
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Task
+from .registry import set_progress, task
+from .worker import claim_task, execute, requeue_stale_tasks, retry_delay
+
+
+@task(name="background_tasks.tests.add")
+def add(a, b):
+    set_progress(50, "adding")
+    return a + b
+
+
+@task(name="background_tasks.tests.fail", max_attempts=2)
+def fail():
+    raise ValueError("boom")
+
+
+@task(name="background_tasks.tests.crash_once", max_attempts=2)
+def crash_once(marker):
+    # Kills the worker process the first time, as an out-of-memory kill would.
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "done"
+
+
+class TaskQueueTests(TestCase):
+    def test_enqueue_once(self):
+        first = add.enqueue_once(1, 2)
+        self.assertEqual(add.enqueue_once(1, 2), first)
+        self.assertNotEqual(add.enqueue_once(1, 3), first)
+        claim_task("test")
+        # A running task is not "waiting": the same call is queued again.
+        self.assertNotEqual(add.enqueue_once(1, 2), first)
+
+    def test_claim_and_execute(self):
+        later = add.enqueue(2, 2, run_after=timezone.now() + timedelta(hours=1))
+        queued = add.enqueue(1, 2)
+        claimed = claim_task("test")
+        self.assertEqual(claimed, queued)
+        self.assertEqual((claimed.status, claimed.attempts, claimed.locked_by), (Task.RUNNING, 1, "test"))
+        # The other task is not due yet.
+        self.assertIsNone(claim_task("test"))
+
+        self.assertTrue(execute(claimed))
+        claimed.refresh_from_db()
+        self.assertEqual((claimed.status, claimed.result, claimed.progress), (Task.SUCCEEDED, 3, 100))
+        self.assertEqual(claimed.locked_by, "")
+        self.assertIsNotNone(claimed.finished_at)
+        later.refresh_from_db()
+        self.assertEqual(later.status, Task.QUEUED)
+
+    def test_failures_are_retried_with_backoff(self):
+        queued = fail.enqueue()
+        claimed = claim_task("test")
+        self.assertFalse(execute(claimed))
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, Task.QUEUED)
+        self.assertIn("ValueError: boom", claimed.error)
+        self.assertGreater(claimed.run_after, timezone.now() + retry_delay(1) - timedelta(seconds=5))
+        self.assertIsNone(claim_task("test"))
+
+        Task.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        claimed = claim_task("test")
+        self.assertEqual(claimed.attempts, 2)
+        self.assertFalse(execute(claimed))
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, Task.FAILED)
+        self.assertIsNotNone(claimed.finished_at)
+
+    def test_retry_delay_is_capped(self):
+        self.assertEqual(retry_delay(2), 2 * retry_delay(1))
+        self.assertEqual(retry_delay(100), retry_delay(99))
+
+    def test_stale_tasks_are_requeued(self):
+        add.enqueue(1, 2)
+        claimed = claim_task("dead worker")
+        Task.objects.filter(pk=claimed.pk).update(locked_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(requeue_stale_tasks(), 1)
+        claimed.refresh_from_db()
+        self.assertEqual((claimed.status, claimed.locked_by), (Task.QUEUED, ""))
+
+    def test_stale_tasks_out_of_attempts_fail(self):
+        fail.enqueue()
+        claimed = claim_task("dead worker")
+        Task.objects.filter(pk=claimed.pk).update(attempts=2)
+        # Not stale yet, unless its worker is known to be gone.
+        self.assertEqual(requeue_stale_tasks(), 0)
+        self.assertEqual(requeue_stale_tasks(locked_by=["other worker"]), 0)
+        self.assertEqual(requeue_stale_tasks(locked_by=["dead worker"]), 1)
+        claimed.refresh_from_db()
+        self.assertEqual((claimed.status, claimed.locked_by), (Task.FAILED, ""))
+        self.assertEqual(claimed.error, "The worker running the task stopped.")
+        self.assertIsNotNone(claimed.finished_at)
+
+
+class TaskViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.owner = User.objects.create_user("owner", "owner@example.com", "x")
+        cls.other = User.objects.create_user("other", "other@example.com", "x")
+        cls.staff = User.objects.create_user("staff", "staff@example.com", "x", is_staff=True)
+        cls.task = add.enqueue(1, 2, user=cls.owner)
+        Task.objects.filter(pk=cls.task.pk).update(status=Task.SUCCEEDED, result={"url": "/secret"})
+
+    def test_tasks_are_only_shown_to_their_owner_and_staff(self):
+        urls = [
+            reverse("background_tasks:task_detail", args=[self.task.pk]),
+            reverse("background_tasks:task_status", args=[self.task.pk]),
+        ]
+        for user, status in [(self.owner, 200), (self.staff, 200), (self.other, 404)]:
+            self.client.force_login(user)
+            for url in urls:
+                with self.subTest(user=user.username, url=url):
+                    self.assertEqual(self.client.get(url).status_code, status)
+
+    def test_status(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("background_tasks:task_status", args=[self.task.pk]))
+        self.assertEqual(response.json()["result"], {"url": "/secret"})
+
+
+class ClaimConcurrencyTests(TransactionTestCase):
+    def test_locked_tasks_are_skipped(self):
+        first, second = add.enqueue(1, 1), add.enqueue(2, 2)
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_first():
+            # Another worker in the middle of claiming the first task.
+            try:
+                with transaction.atomic():
+                    Task.objects.select_for_update().get(pk=first.pk)
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=hold_first)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            self.assertEqual(claim_task("test"), second)
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(claim_task("test"), first)
+
+
+class RunWorkersTests(TransactionTestCase):
+    def setUp(self):
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+        for signum, handler in handlers.items():
+            self.addCleanup(signal.signal, signum, handler)
+
+    def run_until_done(self, **options):
+        def stop_when_done():
+            try:
+                deadline = time.monotonic() + 30
+                while time.monotonic() < deadline:
+                    if not Task.objects.exclude(status=Task.SUCCEEDED).exists():
+                        break
+                    time.sleep(0.1)
+            finally:
+                connection.close()
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=stop_when_done)
+        thread.start()
+        with open(os.devnull, "w") as devnull:
+            call_command("run_workers", poll_interval=0.1, stdout=devnull, **options)
+        thread.join()
+
+    def test_workers_run_the_queue_and_stop_on_sigterm(self):
+        tasks = [add.enqueue(i, i) for i in range(4)]
+        self.run_until_done(concurrency=2)
+        results = dict(Task.objects.values_list("pk", "result"))
+        self.assertEqual([results[task_obj.pk] for task_obj in tasks], [0, 2, 4, 6])
+
+    def test_tasks_of_crashed_workers_are_requeued(self):
+        marker = os.path.join(tempfile.mkdtemp(), "crashed")
+        self.addCleanup(shutil.rmtree, os.path.dirname(marker))
+        task_obj = crash_once.enqueue(marker)
+        self.run_until_done(concurrency=1)
+        task_obj.refresh_from_db()
+        self.assertEqual(
+            (task_obj.status, task_obj.attempts, task_obj.result), (Task.SUCCEEDED, 2, "done")
+        )
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = "background_tasks"
+
+urlpatterns = [
+    path("<int:pk>/", views.task_detail, name="task_detail"),
+    path("<int:pk>/status/", views.task_status, name="task_status"),
+]
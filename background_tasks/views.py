@@ -0,0 +1,34 @@
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
+
+from .models import Task
+
+
+def get_visible_task(request, pk):
+    task = get_object_or_404(Task, pk=pk)
+    if not task.is_visible_to(request.user):
+        raise Http404("No Task matches the given query.")
+    return task
+
+
+def task_detail(request, pk):
+    task = get_visible_task(request, pk)
+    return render(request, "background_tasks/task_detail.html", {"task": task})
+
+
+def task_status(request, pk):
+    task = get_visible_task(request, pk)
+    return JsonResponse(
+        {
+            "id": task.pk,
+            "name": task.name,
+            "status": task.status,
+            "status_display": task.get_status_display(),
+            "progress": task.progress,
+            "progress_message": task.progress_message,
+            "attempts": task.attempts,
+            "max_attempts": task.max_attempts,
+            "is_finished": task.is_finished,
+            "result": task.result if task.status == Task.SUCCEEDED else None,
+        }
+    )
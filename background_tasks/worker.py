@@ -0,0 +1,141 @@
+# background_tasks/worker.py
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import run_task
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_SECONDS = getattr(settings, "BACKGROUND_TASKS_RETRY_BACKOFF", 30)
+MAX_BACKOFF_SECONDS = getattr(settings, "BACKGROUND_TASKS_MAX_BACKOFF", 3600)
+STALE_AFTER_SECONDS = getattr(settings, "BACKGROUND_TASKS_STALE_AFTER", 3600)
+# How often `run_workers` looks for the stale tasks of workers that died.
+STALE_CHECK_SECONDS = getattr(settings, "BACKGROUND_TASKS_STALE_CHECK", 60)
+
+
+def worker_name(pid=None):
+    return f"{socket.gethostname()}:{pid or os.getpid()}"
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2 * base, 4 * base, ... capped."""
+    return timedelta(
+        seconds=min(RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS)
+    )
+
+
+def claim_task(name):
+    """
+    Atomically take the next due task. SKIP LOCKED lets several workers poll
+    the same table without blocking or double-claiming (PostgreSQL only, like
+    the rest of the project).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        task_obj = (
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.QUEUED, run_after__lte=now)
+            .order_by("run_after", "pk")
+            .first()
+        )
+        if task_obj is None:
+            return None
+        task_obj.status = Task.RUNNING
+        task_obj.attempts += 1
+        task_obj.locked_by = name
+        task_obj.locked_at = now
+        task_obj.save(update_fields=["status", "attempts", "locked_by", "locked_at", "updated_at"])
+    return task_obj
+
+
+def execute(task_obj):
+    try:
+        result = run_task(task_obj)
+    except Exception as e:
+        logger.exception("Task %s failed (attempt %s)", task_obj, task_obj.attempts)
+        task_obj.error = "".join(traceback.format_exception(e))
+        if task_obj.attempts < task_obj.max_attempts:
+            task_obj.status = Task.QUEUED
+            task_obj.run_after = timezone.now() + retry_delay(task_obj.attempts)
+        else:
+            task_obj.status = Task.FAILED
+            task_obj.finished_at = timezone.now()
+        task_obj.locked_by = ""
+        task_obj.locked_at = None
+        task_obj.save(
+            update_fields=[
+                "error", "status", "run_after", "finished_at",
+                "locked_by", "locked_at", "updated_at",
+            ]
+        )
+        return False
+
+    task_obj.status = Task.SUCCEEDED
+    task_obj.result = result
+    task_obj.progress = 100
+    task_obj.finished_at = timezone.now()
+    task_obj.locked_by = ""
+    task_obj.locked_at = None
+    task_obj.save(
+        update_fields=[
+            "status", "result", "progress", "finished_at",
+            "locked_by", "locked_at", "updated_at",
+        ]
+    )
+    return True
+
+
+def requeue_stale_tasks(stale_after=STALE_AFTER_SECONDS, locked_by=None):
+    """
+    Put back the tasks whose worker died while running them: the tasks of
+    the ``locked_by`` workers if given (known to be gone), otherwise those
+    locked more than ``stale_after`` seconds ago. Tasks that used up their
+    attempts are marked failed instead. Returns the number of tasks handled.
+    """
+    now = timezone.now()
+    stale = Task.objects.filter(status=Task.RUNNING)
+    if locked_by is not None:
+        stale = stale.filter(locked_by__in=locked_by)
+    else:
+        stale = stale.filter(locked_at__lt=now - timedelta(seconds=stale_after))
+    with transaction.atomic():
+        failed = stale.filter(attempts__gte=F("max_attempts")).update(
+            status=Task.FAILED,
+            error="The worker running the task stopped.",
+            finished_at=now,
+            locked_by="",
+            locked_at=None,
+            updated_at=now,
+        )
+        requeued = stale.update(
+            status=Task.QUEUED, locked_by="", locked_at=None, run_after=now, updated_at=now
+        )
+    return failed + requeued
+
+
+def work(stop_event, poll_interval=2.0, max_tasks=None):
+    """Worker loop run by each process of `run_workers`."""
+    name = worker_name()
+    processed = 0
+    logger.info("Background worker %s started", name)
+    while not stop_event.is_set():
+        close_old_connections()
+        task_obj = claim_task(name)
+        if task_obj is None:
+            stop_event.wait(poll_interval)
+            continue
+        execute(task_obj)
+        processed += 1
+        if max_tasks and processed >= max_tasks:
+            break
+    close_old_connections()
+    logger.info("Background worker %s stopped after %s tasks", name, processed)
@@ -1,60 +1,162 @@
 # candidates/admin.py
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from utilities.admin_mixins import LargeTableAdminMixin, LookupListFilter
+
+from .forms import CandidateImportForm
+from .importers import CandidateImporter
 from .models import (
     Candidate,
     Education,
     Experience,
     Language,
+    License,
     TrainingCourse,
     CandidateApplicationData,
+    StoredFile,
 )
+from .storage_usage import usage_report
+
+# Prefix searches (""), served by the candidate_*_prefix_idx indexes.
+CANDIDATE_SEARCH_FIELDS = ("candidate__first_name", "candidate__last_name", "candidate__email")
 
 
 @admin.register(Candidate)
-class CandidateAdmin(admin.ModelAdmin):
+class CandidateAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("full_name", "email", "country", "created_at")
-    search_fields = ("first_name", "last_name", "email")
-    list_filter = ("country", "created_at")
+    list_select_related = ("country",)
+    search_fields = ("first_name", "last_name", "email", "passport_id", "call_phone_number")
+    list_filter = (("country", LookupListFilter), "created_at")
     ordering = ("-created_at",)
     readonly_fields = ("pk",)
+    autocomplete_fields = ("nationality", "country")
+    change_list_template = "admin/candidates/candidate/change_list.html"
+
+    @admin.display(description="Full name", ordering="first_name")
+    def full_name(self, obj):
+        return obj.full_name
+
+    def get_urls(self):
+        urls = [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="candidates_candidate_import",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        report = None
+        if request.method == "POST":
+            form = CandidateImportForm(request.POST, request.FILES)
+            if form.is_valid():
+                upload = form.cleaned_data["file"]
+                importer = CandidateImporter(dry_run=form.cleaned_data["dry_run"])
+                report = importer.run(upload, upload.name)
+        else:
+            form = CandidateImportForm()
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import candidates",
+            "form": form,
+            "report": report,
+        }
+        return TemplateResponse(
+            request, "admin/candidates/candidate/import_candidates.html", context
+        )
 
 
 @admin.register(Education)
-class EducationAdmin(admin.ModelAdmin):
+class EducationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("candidate", "degree", "field_of_study", "start_date", "end_date")
-    search_fields = ("candidate__first_name", "candidate__last_name")
-    list_filter = ("degree", "start_date")
+    list_select_related = ("candidate", "degree", "field_of_study")
+    search_fields = CANDIDATE_SEARCH_FIELDS
+    list_filter = (("degree", LookupListFilter), "start_date")
+    autocomplete_fields = ("candidate", "institution", "degree", "field_of_study", "grade")
 
 
 @admin.register(Experience)
-class ExperienceAdmin(admin.ModelAdmin):
+class ExperienceAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("candidate", "company_name", "job_title", "start_date", "end_date")
-    search_fields = ("candidate__first_name", "candidate__last_name", "company_name")
-    list_filter = ("company_name", "start_date")
+    list_select_related = ("candidate",)
+    search_fields = (*CANDIDATE_SEARCH_FIELDS, "company_name")
+    # No filter on company_name: its choices are a DISTINCT over the table.
+    list_filter = ("start_date",)
+    autocomplete_fields = ("candidate", "departments")
 
 
 @admin.register(Language)
-class LanguageAdmin(admin.ModelAdmin):
+class LanguageAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("candidate", "language")
-    search_fields = (
-        "candidate__first_name",
-        "candidate__last_name",
-        "language__language",
-    )
+    list_select_related = ("candidate", "language")
+    search_fields = (*CANDIDATE_SEARCH_FIELDS, "language__language")
+    autocomplete_fields = ("candidate", "language")
+
+
+@admin.register(License)
+class LicenseAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ("candidate", "license_name", "license_provider", "expiry_date")
+    list_select_related = ("candidate", "license_provider__country")
+    search_fields = (*CANDIDATE_SEARCH_FIELDS, "license_number")
+    list_filter = (("license_provider", LookupListFilter), "expiry_date")
+    autocomplete_fields = ("candidate", "license_provider")
 
 
 @admin.register(TrainingCourse)
-class TrainingCourseAdmin(admin.ModelAdmin):
+class TrainingCourseAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("candidate", "course_name", "institution", "start_date", "end_date")
-    search_fields = ("candidate__first_name", "candidate__last_name", "course_name")
-    list_filter = ("institution", "start_date")
+    list_select_related = ("candidate",)
+    search_fields = (*CANDIDATE_SEARCH_FIELDS, "course_name")
+    # No filter on institution (free text): its choices are a DISTINCT over the table.
+    list_filter = ("start_date",)
+    autocomplete_fields = ("candidate",)
 
 
 @admin.register(CandidateApplicationData)
-class CandidateApplicationDataAdmin(admin.ModelAdmin):
+class CandidateApplicationDataAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("candidate", "HMC_Portal_email", "JOB_OFFER_ID")
-    search_fields = (
-        "candidate__first_name",
-        "candidate__last_name",
-        "HMC_Portal_email",
-    )
+    list_select_related = ("candidate",)
+    search_fields = (*CANDIDATE_SEARCH_FIELDS, "HMC_Portal_email")
+    autocomplete_fields = ("candidate", "follow_up_assigned_to")
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Read-only: the rows are maintained by signals and reconcile_storage_usage."""
+
+    list_display = ("key", "candidate", "model", "field_name", "size", "content_type", "updated_at")
+    list_select_related = ("candidate",)
+    search_fields = CANDIDATE_SEARCH_FIELDS
+    change_list_template = "admin/candidates/storedfile/change_list.html"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                "report/",
+                self.admin_site.admin_view(self.report_view),
+                name="candidates_storedfile_report",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def report_view(self, request):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Storage usage",
+            "report": usage_report(),
+        }
+        return TemplateResponse(request, "admin/candidates/storedfile/report.html", context)
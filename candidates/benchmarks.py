@@ -0,0 +1,202 @@
+# candidates/benchmarks.py
+import csv
+import json
+import math
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import JobOpportunity
+
+from .exporters import export_queryset, iter_csv, write_xlsx
+from .models import Candidate
+
+
+@dataclass
+class BenchmarkResult:
+    scale: int
+    scenario: str
+    runs: int
+    median_ms: float
+    p95_ms: float
+    min_ms: float
+    max_ms: float
+    queries: int
+    status: int
+
+
+class ScaleBenchmark:
+    """
+    Time the key pages and exports against the current database. Every run
+    starts with an empty cache, so the numbers are for the uncached path.
+    """
+
+    def __init__(self, repeat=5, exports=True):
+        self.repeat = repeat
+        self.exports = exports
+        user = get_user_model().objects.filter(is_superuser=True, is_active=True).first()
+        if user is None:
+            raise ValueError("A superuser is needed to request the pages.")
+        self.client = Client()
+        self.client.force_login(user)
+
+    def scenarios(self):
+        """(name, callable returning the HTTP status) for the current data."""
+        candidate_count = Candidate.objects.count()
+        candidate = Candidate.objects.order_by("pk")[candidate_count // 2 : candidate_count // 2 + 1].first()
+        job = JobOpportunity.objects.order_by("pk").first()
+        # The middle page of the default 10-per-page list.
+        deep_page = max(candidate_count // 10 // 2, 1)
+
+        pages = [
+            ("candidate_list", reverse("candidates:candidate_list"), {}),
+            ("candidate_list_deep_page", reverse("candidates:candidate_list"), {"page": deep_page}),
+            (
+                "candidate_list_sort_experience",
+                reverse("candidates:candidate_list"),
+                {"sort": "total_experience", "order": "desc"},
+            ),
+            ("pipeline_board", reverse("candidates:pipeline_board"), {}),
+            ("expirations_dashboard", reverse("candidates:expirations_dashboard"), {"days": 90}),
+        ]
+        if candidate:
+            pages += [
+                ("candidate_detail", reverse("candidates:candidate_detail", args=[candidate.pk]), {}),
+                (
+                    "candidate_search",
+                    reverse("candidates:candidate_search"),
+                    {"query": candidate.last_name or candidate.email},
+                ),
+                (
+                    "candidate_search_suggest",
+                    reverse("candidates:candidate_search_suggest"),
+                    {"q": (candidate.first_name or candidate.email)[:3]},
+                ),
+                (
+                    "candidate_cv_pdf",
+                    reverse("documents:candidate_export_pdf_CV", args=[candidate.pk]),
+                    {},
+                ),
+                ("hmc_sheet", reverse("documents:HMC_Sheet", args=[candidate.pk]), {}),
+            ]
+        if job:
+            pages.append(
+                (
+                    "job_compatible_candidates",
+                    reverse("jobs:job_opportunity_compatible_candidates", args=[job.pk]),
+                    {},
+                )
+            )
+        scenarios = [(name, self.page(url, params)) for name, url, params in pages]
+        if self.exports:
+            scenarios += [("export_csv", self.export_csv), ("export_xlsx", self.export_xlsx)]
+        return scenarios
+
+    def page(self, url, params):
+        def request():
+            response = self.client.get(url, params)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            return response.status_code
+
+        return request
+
+    def export_csv(self):
+        for _ in iter_csv(export_queryset({})):
+            pass
+        return 200
+
+    def export_xlsx(self):
+        with tempfile.TemporaryFile() as stream:
+            write_xlsx(export_queryset({}), stream)
+        return 200
+
+    def run(self, progress=None):
+        scale = Candidate.objects.count()
+        results = []
+        for name, scenario in self.scenarios():
+            # Exports are slow at scale; time them once.
+            runs = 1 if name.startswith("export_") else self.repeat
+            timings = []
+            for _ in range(runs):
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    status = scenario()
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            result = BenchmarkResult(
+                scale=scale,
+                scenario=name,
+                runs=runs,
+                median_ms=round(statistics.median(timings), 2),
+                p95_ms=round(timings[math.ceil(len(timings) * 0.95) - 1], 2),
+                min_ms=round(timings[0], 2),
+                max_ms=round(timings[-1], 2),
+                queries=len(queries),
+                status=status,
+            )
+            results.append(result)
+            if progress:
+                progress(result)
+        return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(results, json_path=None, csv_path=None):
+    """Write the results as JSON (with the commit and date) and/or CSV."""
+    metadata = {"commit": git_commit(), "created_at": timezone.now().isoformat()}
+    rows = [asdict(result) for result in results]
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as stream:
+            json.dump({**metadata, "results": rows}, stream, indent=2)
+    if csv_path:
+        with open(csv_path, "w", newline="", encoding="utf-8") as stream:
+            writer = csv.DictWriter(stream, fieldnames=["commit", *rows[0]] if rows else ["commit"])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({"commit": metadata["commit"], **row})
+
+
+def compare_reports(baseline_path, results):
+    """
+    (scenario, scale, baseline median, current median, change) for every
+    result that the baseline JSON report also measured.
+    """
+    with open(baseline_path, encoding="utf-8") as stream:
+        baseline = {
+            (row["scenario"], row["scale"]): row for row in json.load(stream)["results"]
+        }
+    comparison = []
+    for result in results:
+        previous = baseline.get((result.scenario, result.scale))
+        if previous:
+            change = (result.median_ms - previous["median_ms"]) / previous["median_ms"]
+            comparison.append(
+                (result.scenario, result.scale, previous["median_ms"], result.median_ms, change)
+            )
+    return comparison
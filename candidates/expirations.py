@@ -0,0 +1,165 @@
+# candidates/expirations.py
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import CharField, Count, F, IntegerField, Value
+
+from .models import (
+    APPLICATION_DATA_EXPIRY_FIELDS,
+    Candidate,
+    CandidateApplicationData,
+    License,
+)
+
+EXPIRATION_WINDOWS = (30, 60, 90)
+EXPIRATIONS_PAGE_SIZE = 50
+EXPIRATIONS_MAX_PAGE_SIZE = 200
+EXPIRATIONS_CACHE_TIMEOUT = 60 * 5
+
+
+@dataclass(frozen=True)
+class ExpirySource:
+    document: str
+    model: type
+    date_field: str
+    # Field shown next to the document (e.g. the license name), if any.
+    detail_field: str = None
+
+    def owner_expression(self):
+        return F("pk") if self.model is Candidate else F("candidate_id")
+
+    def detail_expression(self):
+        if self.detail_field:
+            return F(self.detail_field)
+        return Value("", output_field=CharField())
+
+
+# Every date column shown on the dashboard; each one has a partial index on
+# "<date_field> IS NOT NULL" (see candidates/models.py).
+EXPIRY_SOURCES = [
+    ExpirySource("Passport", Candidate, "passport_expiration_date", "passport_id"),
+    ExpirySource("License", License, "expiry_date", "license_name"),
+] + [
+    ExpirySource(field.split("_")[0], CandidateApplicationData, field)
+    for field in APPLICATION_DATA_EXPIRY_FIELDS
+]
+
+
+@dataclass(frozen=True)
+class ExpirationCursor:
+    """
+    Keyset position: the (expires_on, source, record_id) of the last row,
+    ``source`` being the position in EXPIRY_SOURCES. Numbers rather than
+    document labels keep the database and Python ordering identical.
+    """
+
+    expires_on: date
+    source: int
+    record_id: int
+
+    def encode(self):
+        return f"{self.expires_on.isoformat()}.{self.source}.{self.record_id}"
+
+    @classmethod
+    def decode(cls, value):
+        """Parse a cursor from the query string; raises ValueError if malformed."""
+        expires_on, source, record_id = value.split(".")
+        return cls(date.fromisoformat(expires_on), int(source), int(record_id))
+
+
+def _source_rows(index, start, end, after, limit):
+    source = EXPIRY_SOURCES[index]
+    date_field = source.date_field
+    queryset = source.model.objects.filter(**{f"{date_field}__range": (start, end)})
+    if after is not None:
+        # The source is constant per branch, so the keyset condition collapses
+        # to a plain range on the indexed date column (plus pk on ties).
+        if index > after.source:
+            queryset = queryset.filter(**{f"{date_field}__gte": after.expires_on})
+        elif index < after.source:
+            queryset = queryset.filter(**{f"{date_field}__gt": after.expires_on})
+        else:
+            queryset = queryset.filter(
+                **{f"{date_field}__gt": after.expires_on}
+            ) | queryset.filter(**{date_field: after.expires_on, "pk__gt": after.record_id})
+    return (
+        queryset.order_by(date_field, "pk")
+        .annotate(
+            record_id=F("pk"),
+            source=Value(index, output_field=IntegerField()),
+            owner_id=source.owner_expression(),
+            document=Value(source.document, output_field=CharField()),
+            expires_on=F(date_field),
+            detail=source.detail_expression(),
+        )
+        .values("record_id", "source", "owner_id", "document", "expires_on", "detail")[:limit]
+    )
+
+
+def upcoming_expirations(days=30, after=None, limit=EXPIRATIONS_PAGE_SIZE, today=None):
+    """
+    One page of documents expiring within ``days`` days, soonest first, as a
+    single UNION ALL query. Every branch is an index range scan limited to
+    the page size. Returns (rows, next_cursor).
+    """
+    today = today or date.today()
+    end = today + timedelta(days=days)
+    branches = [
+        _source_rows(index, today, end, after, limit + 1) for index in range(len(EXPIRY_SOURCES))
+    ]
+    rows = list(
+        branches[0]
+        .union(*branches[1:], all=True)
+        .order_by("expires_on", "source", "record_id")[: limit + 1]
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = ExpirationCursor(last["expires_on"], last["source"], last["record_id"])
+
+    names = Candidate.objects.only(
+        "first_name", "second_name", "third_name", "last_name"
+    ).in_bulk({row["owner_id"] for row in rows})
+    for row in rows:
+        candidate = names.get(row["owner_id"])
+        row["candidate_name"] = candidate.full_name if candidate else ""
+        row["days_left"] = (row["expires_on"] - today).days
+    return rows, next_cursor
+
+
+def expiration_counts(days=30, today=None):
+    """Number of documents expiring within ``days`` days, per document type."""
+    today = today or date.today()
+    end = today + timedelta(days=days)
+    branches = [
+        source.model.objects.filter(**{f"{source.date_field}__range": (today, end)})
+        .order_by()
+        .annotate(document=Value(source.document, output_field=CharField()))
+        .values("document")
+        .annotate(total=Count("pk"))
+        for source in EXPIRY_SOURCES
+    ]
+    counts = dict(
+        branches[0].union(*branches[1:], all=True).values_list("document", "total")
+    )
+    return {source.document: counts.get(source.document, 0) for source in EXPIRY_SOURCES}
+
+
+def cached_expirations(days, after=None, limit=EXPIRATIONS_PAGE_SIZE):
+    """upcoming_expirations() and expiration_counts(), cached for a few minutes."""
+    today = date.today()
+    key = "candidates:expirations:{}:{}:{}:{}".format(
+        today.isoformat(), days, after.encode() if after else "", limit
+    )
+    result = cache.get(key)
+    if result is None:
+        rows, next_cursor = upcoming_expirations(days, after, limit, today)
+        result = {
+            "rows": rows,
+            "next_cursor": next_cursor.encode() if next_cursor else None,
+            "counts": expiration_counts(days, today),
+        }
+        cache.set(key, result, EXPIRATIONS_CACHE_TIMEOUT)
+    return result
@@ -0,0 +1,178 @@
+# candidates/exporters.py
+import csv
+import tempfile
+from datetime import timedelta
+
+import openpyxl
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from utilities.lookups import lookup_table
+from utilities.models import Country, Nationality
+
+from .models import Candidate
+from .queries import (
+    candidate_sort_criteria,
+    search_candidates,
+    with_experience_annotations,
+)
+
+# Rows fetched per round-trip of the server-side cursor.
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = ("csv", "xlsx", "parquet")
+
+# (header, values_list expression)
+EXPORT_COLUMNS = [
+    ("ID", "pk"),
+    ("Email", "email"),
+    ("First Name", "first_name"),
+    ("Second Name", "second_name"),
+    ("Third Name", "third_name"),
+    ("Last Name", "last_name"),
+    ("Gender", "gender"),
+    ("Birthday", "birthday"),
+    ("Nationality", "nationality_id"),
+    ("Country", "country_id"),
+    ("Call Phone Number", "call_phone_number"),
+    ("WhatsApp Phone Number", "whatsapp_phone_number"),
+    ("Passport ID", "passport_id"),
+    ("Passport Expiration Date", "passport_expiration_date"),
+    ("Open to Work", "is_open_to_work"),
+    ("Total Experience (Months)", "experience_months"),
+    ("Departments", "department_names"),
+    ("Created At", "created_at"),
+    ("Updated At", "updated_at"),
+]
+EXPORT_HEADERS = [header for header, _ in EXPORT_COLUMNS]
+# Foreign key columns written as the lookup's name, resolved from the
+# lookup registry instead of joining the lookup tables.
+EXPORT_LOOKUP_COLUMNS = {"nationality_id": Nationality, "country_id": Country}
+
+
+def export_queryset(params):
+    """
+    Candidates to export, filtered and sorted the same way as the candidate
+    list (``sort``/``order``) and search page (``query``).
+    """
+    queryset = with_experience_annotations(Candidate.objects.all())
+    queryset = search_candidates(queryset, params.get("query"))
+    sort_criteria = candidate_sort_criteria(
+        params.get("sort", "created_at"), params.get("order", "desc")
+    )
+    return queryset.order_by(*sort_criteria, "pk")
+
+
+def iter_export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """
+    Stream export rows as value sequences without instantiating model objects.
+    ``progress(rows_done)`` is called once per fetched chunk.
+    """
+    rows = queryset.values_list(
+        *[expression for _, expression in EXPORT_COLUMNS]
+    ).iterator(chunk_size=chunk_size)
+    lookups = [
+        (index, lookup_table(EXPORT_LOOKUP_COLUMNS[expression]).labels)
+        for index, (_, expression) in enumerate(EXPORT_COLUMNS)
+        if expression in EXPORT_LOOKUP_COLUMNS
+    ]
+    for count, row in enumerate(rows, start=1):
+        if lookups:
+            row = list(row)
+            for index, labels in lookups:
+                row[index] = labels.get(row[index])
+        yield row
+        if progress and count % chunk_size == 0:
+            progress(count)
+
+
+class Echo:
+    """File-like object whose write() just returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADERS)
+    for row in iter_export_rows(queryset):
+        yield writer.writerow(row)
+
+
+def write_xlsx(queryset, stream, progress=None):
+    # write_only workbooks flush rows to disk instead of keeping every cell.
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Candidates")
+    sheet.append(EXPORT_HEADERS)
+    for row in iter_export_rows(queryset, progress=progress):
+        sheet.append(
+            [
+                timezone.make_naive(value) if hasattr(value, "tzinfo") and value.tzinfo else value
+                for value in row
+            ]
+        )
+    workbook.save(stream)
+
+
+def write_parquet(queryset, stream, progress=None):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires the pyarrow package.")
+
+    column_types = {
+        "pk": pa.int64(),
+        "birthday": pa.date32(),
+        "passport_expiration_date": pa.date32(),
+        "experience_months": pa.int64(),
+        "created_at": pa.timestamp("us", tz="UTC"),
+        "updated_at": pa.timestamp("us", tz="UTC"),
+    }
+    schema = pa.schema(
+        [
+            (header, column_types.get(expression, pa.string()))
+            for header, expression in EXPORT_COLUMNS
+        ]
+    )
+    chunk = []
+    with pq.ParquetWriter(stream, schema) as writer:
+        for row in iter_export_rows(queryset, progress=progress):
+            chunk.append(dict(zip(EXPORT_HEADERS, row)))
+            if len(chunk) >= EXPORT_CHUNK_SIZE:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                chunk.clear()
+        if chunk:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+
+
+def export_to_storage(queryset, export_format, progress=None):
+    """
+    Write an XLSX or Parquet export to the exports storage and return its
+    name; the random part keeps the names of other exports unguessable.
+    """
+    writers = {"xlsx": write_xlsx, "parquet": write_parquet}
+    timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+    with tempfile.TemporaryFile() as tmp:
+        writers[export_format](queryset, tmp, progress=progress)
+        tmp.seek(0)
+        return storages["exports"].save(
+            f"candidates_{timestamp}_{get_random_string(16)}.{export_format}", File(tmp)
+        )
+
+
+def delete_old_exports(max_age=None):
+    """Delete the exports older than EXPORT_RETENTION_DAYS; returns how many."""
+    if max_age is None:
+        max_age = timedelta(days=settings.EXPORT_RETENTION_DAYS)
+    storage = storages["exports"]
+    cutoff = timezone.now() - max_age
+    _, names = storage.listdir("")
+    old = [name for name in names if storage.get_modified_time(name) < cutoff]
+    for name in old:
+        storage.delete(name)
+    return len(old)
@@ -0,0 +1,145 @@
+# candidates/factories.py
+from datetime import timedelta
+
+import factory
+from factory.django import DjangoModelFactory
+
+from utilities.factories import (
+    CountryFactory,
+    DegreeChoicesFactory,
+    DepartmentFactory,
+    FieldOfStudyFactory,
+    InstitutionFactory,
+    LanguageChoicesFactory,
+    LicenseProviderFactory,
+    NationalityFactory,
+)
+
+from .models import (
+    Candidate,
+    CandidateApplicationData,
+    Education,
+    Experience,
+    Language,
+    License,
+    TrainingCourse,
+)
+
+
+class CandidateFactory(DjangoModelFactory):
+    class Meta:
+        model = Candidate
+        skip_postgeneration_save = True
+
+    is_open_to_work = "Yes"
+    email = factory.Sequence(lambda n: f"candidate{n}@example.com")
+    first_name = factory.Faker("first_name")
+    second_name = factory.Faker("first_name")
+    third_name = factory.Faker("first_name")
+    last_name = factory.Faker("last_name")
+    gender = factory.Iterator(["M", "F"])
+    birthday = factory.Faker("date_of_birth", minimum_age=22, maximum_age=50)
+    nationality = factory.SubFactory(NationalityFactory)
+    country = factory.SubFactory(CountryFactory)
+    address = factory.Faker("street_address")
+    call_phone_number = factory.Faker("numerify", text="+9627########")
+    whatsapp_phone_number = factory.Faker("numerify", text="+9627########")
+    national_id_number = factory.Faker("numerify", text="##########")
+    passport_id = factory.Faker("bothify", text="?#######", letters="ABCDEFGHJKLMNPRSTUVWXYZ")
+    passport_expiration_date = factory.Faker("date_between", start_date="-30d", end_date="+5y")
+
+
+class EducationFactory(DjangoModelFactory):
+    class Meta:
+        model = Education
+
+    candidate = factory.SubFactory(CandidateFactory)
+    institution = factory.SubFactory(InstitutionFactory)
+    degree = factory.SubFactory(DegreeChoicesFactory)
+    field_of_study = factory.SubFactory(FieldOfStudyFactory)
+    start_date = factory.Faker("date_between", start_date="-20y", end_date="-6y")
+    end_date = factory.LazyAttribute(lambda education: education.start_date + timedelta(days=4 * 365))
+    gpa = factory.Faker("pyfloat", min_value=2, max_value=4, right_digits=2)
+
+
+class ExperienceFactory(DjangoModelFactory):
+    class Meta:
+        model = Experience
+        skip_postgeneration_save = True
+
+    candidate = factory.SubFactory(CandidateFactory)
+    company_name = factory.Faker("company")
+    company_location = factory.Iterator(["JO", "SA", "QA", "AE"])
+    reference_name = factory.Faker("name")
+    reference_job_title = "Head Nurse"
+    reference_contact_info = factory.Faker("email")
+    job_title = factory.Iterator(["Staff Nurse", "Charge Nurse", "Nurse Specialist"])
+    start_date = factory.Faker("date_between", start_date="-15y", end_date="-1y")
+    end_date = factory.Maybe(
+        factory.Faker("boolean", chance_of_getting_true=70),
+        yes_declaration=factory.LazyAttribute(
+            lambda experience: experience.start_date + timedelta(days=300)
+        ),
+        no_declaration=None,
+    )
+    job_responsibilities = factory.Faker("paragraph", nb_sentences=4)
+
+    @factory.post_generation
+    def departments(self, create, extracted, **kwargs):
+        if not create:
+            return
+        self.departments.set(extracted if extracted is not None else [DepartmentFactory()])
+
+
+class LicenseFactory(DjangoModelFactory):
+    class Meta:
+        model = License
+
+    candidate = factory.SubFactory(CandidateFactory)
+    license_name = "Registered Nurse"
+    license_number = factory.Sequence(lambda n: f"RN-{n:06d}")
+    license_provider = factory.SubFactory(LicenseProviderFactory)
+    issued_date = factory.Faker("date_between", start_date="-10y", end_date="-1y")
+    expiry_date = factory.LazyAttribute(lambda license: license.issued_date + timedelta(days=3 * 365))
+
+
+class TrainingCourseFactory(DjangoModelFactory):
+    class Meta:
+        model = TrainingCourse
+
+    candidate = factory.SubFactory(CandidateFactory)
+    course_name = factory.Iterator(["BLS", "ACLS", "PALS"])
+    institution = "American Heart Association"
+    location = "JO"
+    start_date = factory.Faker("date_between", start_date="-5y", end_date="-1y")
+    end_date = factory.LazyAttribute(lambda course: course.start_date + timedelta(days=2))
+
+
+class LanguageFactory(DjangoModelFactory):
+    class Meta:
+        model = Language
+
+    candidate = factory.SubFactory(CandidateFactory)
+    language = factory.SubFactory(LanguageChoicesFactory)
+
+
+class CandidateApplicationDataFactory(DjangoModelFactory):
+    class Meta:
+        model = CandidateApplicationData
+
+    candidate = factory.SubFactory(CandidateFactory)
+    DataFlow_issue_date = factory.Faker("date_between", start_date="-1y", end_date="today")
+    DataFlow_expiry_date = factory.Faker("date_between", start_date="today", end_date="+2y")
+    DataFlow_is_paid = True
+    Prometric_status = "pass"
+
+
+class FullCandidateFactory(CandidateFactory):
+    """A candidate with the related records a real profile has."""
+
+    educations = factory.RelatedFactoryList(EducationFactory, "candidate", size=2)
+    experiences = factory.RelatedFactoryList(ExperienceFactory, "candidate", size=3)
+    licenses = factory.RelatedFactoryList(LicenseFactory, "candidate", size=2)
+    training_courses = factory.RelatedFactoryList(TrainingCourseFactory, "candidate", size=2)
+    languages = factory.RelatedFactoryList(LanguageFactory, "candidate", size=2)
+    application_data = factory.RelatedFactory(CandidateApplicationDataFactory, "candidate")
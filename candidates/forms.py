@@ -4,6 +4,9 @@ from crispy_forms.layout import Submit
 from django import forms
 from django_ckeditor_5.widgets import CKEditor5Widget
 
+from utilities.lookups import LookupChoicesMixin
+from utilities.widgets import LookupAutocompleteSelect, LookupAutocompleteSelectMultiple
+
 from .models import (
     Candidate,
     Education,
@@ -15,7 +18,7 @@ from .models import (
 )
 
 
-class CandidateForm(forms.ModelForm):
+class CandidateForm(LookupChoicesMixin, forms.ModelForm):
     class Meta:
         model = Candidate
         fields = [
@@ -59,7 +62,7 @@ class CandidateForm(forms.ModelForm):
         }
 
 
-class EducationForm(forms.ModelForm):
+class EducationForm(LookupChoicesMixin, forms.ModelForm):
     class Meta:
         model = Education
         exclude = ["candidate"]
@@ -70,10 +73,10 @@ class EducationForm(forms.ModelForm):
             "end_date": forms.DateInput(
                 attrs={"type": "date", "class": "form-control"}
             ),
-            "degree": forms.Select(attrs={"class": "form-control"}),
-            "field_of_study": forms.Select(attrs={"class": "form-control"}),
-            "institution": forms.Select(attrs={"class": "form-control"}),
-            "grade": forms.Select(attrs={"class": "form-control"}),
+            "degree": LookupAutocompleteSelect(attrs={"class": "form-control"}),
+            "field_of_study": LookupAutocompleteSelect(attrs={"class": "form-control"}),
+            "institution": LookupAutocompleteSelect(attrs={"class": "form-control"}),
+            "grade": LookupAutocompleteSelect(attrs={"class": "form-control"}),
             "online": forms.CheckboxInput(attrs={"class": "form-check-input"}),
             "gpa": forms.NumberInput(attrs={"class": "form-control"}),
             "certification_copy": forms.FileInput(attrs={"class": "form-control-file"}),
@@ -92,7 +95,7 @@ class EducationForm(forms.ModelForm):
                 field.widget.attrs["class"] = "form-control"
 
 
-class ExperienceForm(forms.ModelForm):
+class ExperienceForm(LookupChoicesMixin, forms.ModelForm):
     class Meta:
         model = Experience
         exclude = ["candidate"]
@@ -106,9 +109,7 @@ class ExperienceForm(forms.ModelForm):
             "company_location": forms.Select(attrs={"class": "form-control"}),
 
             "certification_copy": forms.FileInput(attrs={"class": "form-control-file"}),
-            "departments": forms.SelectMultiple(
-                attrs={"class": "form-control select2", "multiple": "multiple"}
-            ),  # Fix
+            "departments": LookupAutocompleteSelectMultiple(attrs={"class": "form-control"}),
 
 
             "job_responsibilities": CKEditor5Widget(
@@ -117,7 +118,7 @@ class ExperienceForm(forms.ModelForm):
         }
 
 
-class LanguageForm(forms.ModelForm):
+class LanguageForm(LookupChoicesMixin, forms.ModelForm):
     class Meta:
         model = Language
         exclude = ["candidate"]
@@ -161,12 +162,12 @@ class TrainingCourseForm(forms.ModelForm):
                 field.widget.attrs["class"] = "form-control"
 
 
-class LicenseForm(forms.ModelForm):
+class LicenseForm(LookupChoicesMixin, forms.ModelForm):
     class Meta:
         model = License
         exclude = ["candidate"]
         widgets = {
-            "license_provider": forms.Select(attrs={"class": "form-control"}),
+            "license_provider": LookupAutocompleteSelect(attrs={"class": "form-control"}),
             "license_type": forms.Select(attrs={"class": "form-control"}),
             "license_number": forms.TextInput(attrs={"class": "form-control"}),
             "issued_date": forms.DateInput(
@@ -333,3 +334,21 @@ class CandidateSearchForm(forms.Form):
         self.helper.form_method = "GET"
         self.helper.add_input(Submit("search", "Search"))
 
+
+
+class CandidateImportForm(forms.Form):
+    file = forms.FileField(
+        label="Spreadsheet",
+        help_text="A .csv or .xlsx file with one candidate per row.",
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        label="Dry run",
+        help_text="Only validate the rows, do not create candidates.",
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data["file"]
+        if not file.name.lower().endswith((".csv", ".xlsx", ".xlsm")):
+            raise forms.ValidationError("Upload a .csv or .xlsx file.")
+        return file
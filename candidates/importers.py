@@ -0,0 +1,383 @@
+# candidates/importers.py
+import csv
+import io
+import logging
+from dataclasses import dataclass, field
+
+import openpyxl
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from simple_history.utils import bulk_create_with_history
+
+from utilities.models import (
+    Nationality,
+    Country,
+    Institution,
+    DegreeChoices,
+    FieldOfStudy,
+    Department,
+)
+
+from .forms import CandidateForm, EducationForm, ExperienceForm
+from .models import (
+    Candidate,
+    Education,
+    Experience,
+    validate_end_date_after_start,
+)
+from .signals import candidates_imported
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+
+# Spreadsheet columns mapped onto CandidateForm fields. File uploads cannot be
+# carried in a spreadsheet, so only the plain value fields are importable.
+CANDIDATE_COLUMNS = [
+    "email",
+    "first_name",
+    "second_name",
+    "third_name",
+    "last_name",
+    "gender",
+    "birthday",
+    "address",
+    "call_phone_number",
+    "whatsapp_phone_number",
+    "national_id_number",
+    "passport_expiration_date",
+    "passport_id",
+    "is_open_to_work",
+]
+_NOT_IMPORTED_CANDIDATE_FIELDS = [
+    f.name for f in Candidate._meta.fields if f.name not in CANDIDATE_COLUMNS
+]
+
+# Optional education / experience columns: spreadsheet column -> form field.
+EDUCATION_COLUMNS = {
+    "education_start_date": "start_date",
+    "education_end_date": "end_date",
+    "education_gpa": "gpa",
+}
+EXPERIENCE_COLUMNS = {
+    "experience_company_name": "company_name",
+    "experience_company_location": "company_location",
+    "experience_job_title": "job_title",
+    "experience_start_date": "start_date",
+    "experience_end_date": "end_date",
+}
+
+
+def _normalize(value):
+    return str(value).strip().lower() if value not in (None, "") else ""
+
+
+class LookupMap:
+    """
+    In-memory map of a lookup table, keyed by every accepted spelling
+    (e.g. a department's abbreviation and its title).
+    """
+
+    def __init__(self, queryset, *keys):
+        self.label = queryset.model._meta.verbose_name
+        self.items = {}
+        for obj in queryset:
+            for key in keys:
+                normalized = _normalize(getattr(obj, key))
+                if normalized:
+                    self.items.setdefault(normalized, obj)
+
+    def resolve(self, value, required=False):
+        normalized = _normalize(value)
+        if not normalized:
+            if required:
+                raise ValidationError(f"{self.label} is required.")
+            return None
+        try:
+            return self.items[normalized]
+        except KeyError:
+            raise ValidationError(f'Unknown {self.label} "{value}".')
+
+
+def load_lookups():
+    """Load every lookup table the importer needs, one query per table."""
+    return {
+        "nationality": LookupMap(Nationality.objects.all(), "nationality_name"),
+        "country": LookupMap(Country.objects.all(), "code", "name"),
+        "degree": LookupMap(DegreeChoices.objects.all(), "degree"),
+        "field_of_study": LookupMap(FieldOfStudy.objects.all(), "field_of_study"),
+        "institution": LookupMap(
+            Institution.objects.select_related("country"), "institution", "abbreviation"
+        ),
+        "department": LookupMap(Department.objects.all(), "abbreviation", "title"),
+    }
+
+
+def iter_rows(file, filename):
+    """
+    Stream rows out of a CSV or XLSX file as (row_number, {column: value}).
+
+    XLSX files are opened in openpyxl read-only mode so that large sheets are
+    never fully loaded into memory.
+    """
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [_normalize(header) for header in next(rows, ())]
+            for row_number, values in enumerate(rows, start=2):
+                if not any(value not in (None, "") for value in values):
+                    continue
+                yield row_number, dict(zip(headers, values))
+        finally:
+            workbook.close()
+    else:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.DictReader(text)
+            reader.fieldnames = [_normalize(header) for header in reader.fieldnames or []]
+            for row_number, row in enumerate(reader, start=2):
+                if not any(row.values()):
+                    continue
+                yield row_number, row
+        finally:
+            # Hand the binary file back to the caller instead of closing it.
+            text.detach()
+
+
+def _clean_field(form_class, name, value):
+    """Run a single ModelForm field's validation (type coercion + validators)."""
+    form_field = form_class.base_fields[name]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Spreadsheets hand phone and ID numbers back as numbers.
+        value = str(int(value)) if float(value).is_integer() else str(value)
+    return form_field.clean("" if value is None else value)
+
+
+@dataclass
+class RowError:
+    row_number: int
+    column: str
+    message: str
+
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    created: int = 0
+    educations_created: int = 0
+    experiences_created: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def failed_rows(self):
+        return len({error.row_number for error in self.errors})
+
+    def add_error(self, row_number, column, error):
+        messages = error.messages if isinstance(error, ValidationError) else [str(error)]
+        for message in messages:
+            self.errors.append(RowError(row_number, column, message))
+
+    def write_errors(self, stream):
+        writer = csv.writer(stream)
+        writer.writerow(["row", "column", "error"])
+        for error in self.errors:
+            writer.writerow([error.row_number, error.column, error.message])
+
+
+@dataclass
+class _ParsedRow:
+    row_number: int
+    candidate: Candidate
+    education: Education = None
+    experience: Experience = None
+    departments: list = field(default_factory=list)
+
+
+class CandidateImporter:
+    """
+    Validate spreadsheet rows with CandidateForm's field rules and insert
+    candidates with their education and experience in batches.
+
+    One row describes one candidate plus, optionally, one education and one
+    experience (see EDUCATION_COLUMNS / EXPERIENCE_COLUMNS).
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, dry_run=False, progress=None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.progress = progress
+        self.lookups = load_lookups()
+        self.report = ImportReport()
+        self._seen_emails = set()
+
+    def run(self, file, filename):
+        batch = []
+        for row_number, row in iter_rows(file, filename):
+            self.report.processed += 1
+            parsed = self.parse_row(row_number, row)
+            if parsed is not None:
+                batch.append(parsed)
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        self.flush(batch)
+        return self.report
+
+    def parse_row(self, row_number, row):
+        errors_before = len(self.report.errors)
+
+        data = {}
+        for name in CANDIDATE_COLUMNS:
+            try:
+                data[name] = _clean_field(CandidateForm, name, row.get(name))
+            except ValidationError as e:
+                self.report.add_error(row_number, name, e)
+        for name in ("nationality", "country"):
+            try:
+                data[name] = self.lookups[name].resolve(row.get(name), required=True)
+            except ValidationError as e:
+                self.report.add_error(row_number, name, e)
+
+        # Only valid emails are set; missing or invalid ones are already errors.
+        email = (data.get("email") or "").lower()
+        if email:
+            if email in self._seen_emails:
+                self.report.add_error(row_number, "email", "Duplicate email in this file.")
+            self._seen_emails.add(email)
+
+        candidate = Candidate(**data)
+        candidate.clean()
+        try:
+            # Model-level validators (e.g. phone numbers) are not part of the
+            # form fields, so run them for the imported columns only.
+            candidate.clean_fields(exclude=_NOT_IMPORTED_CANDIDATE_FIELDS)
+        except ValidationError as e:
+            for name, messages in e.message_dict.items():
+                if name in data:
+                    self.report.add_error(row_number, name, ValidationError(messages))
+
+        education = self.parse_education(row_number, row, candidate)
+        experience, departments = self.parse_experience(row_number, row, candidate)
+
+        if len(self.report.errors) > errors_before:
+            return None
+        return _ParsedRow(row_number, candidate, education, experience, departments)
+
+    def parse_education(self, row_number, row, candidate):
+        if not _normalize(row.get("education_degree")):
+            return None
+        data = {}
+        for column, name in EDUCATION_COLUMNS.items():
+            try:
+                data[name] = _clean_field(EducationForm, name, row.get(column))
+            except ValidationError as e:
+                self.report.add_error(row_number, column, e)
+        for column, name in (
+            ("education_degree", "degree"),
+            ("education_field_of_study", "field_of_study"),
+            ("education_institution", "institution"),
+        ):
+            try:
+                data[name] = self.lookups[name].resolve(
+                    row.get(column), required=name != "institution"
+                )
+            except ValidationError as e:
+                self.report.add_error(row_number, column, e)
+        if data.get("start_date"):
+            try:
+                validate_end_date_after_start(data["start_date"], data.get("end_date"))
+            except ValidationError as e:
+                self.report.add_error(row_number, "education_end_date", e)
+        return Education(candidate=candidate, **data)
+
+    def parse_experience(self, row_number, row, candidate):
+        if not _normalize(row.get("experience_company_name")):
+            return None, []
+        data = {}
+        for column, name in EXPERIENCE_COLUMNS.items():
+            try:
+                data[name] = _clean_field(ExperienceForm, name, row.get(column))
+            except ValidationError as e:
+                self.report.add_error(row_number, column, e)
+        departments = []
+        for value in str(row.get("experience_departments") or "").split(","):
+            if not value.strip():
+                continue
+            try:
+                departments.append(self.lookups["department"].resolve(value))
+            except ValidationError as e:
+                self.report.add_error(row_number, "experience_departments", e)
+        if data.get("start_date"):
+            try:
+                validate_end_date_after_start(data["start_date"], data.get("end_date"))
+            except ValidationError as e:
+                self.report.add_error(row_number, "experience_end_date", e)
+        return Experience(candidate=candidate, **data), departments
+
+    def flush(self, batch):
+        if not batch:
+            return
+
+        # Email uniqueness is checked against the database once per batch
+        # instead of once per row.
+        existing = set(
+            Candidate.objects.filter(
+                email__in=[parsed.candidate.email for parsed in batch]
+            ).values_list("email", flat=True)
+        )
+        rows = []
+        for parsed in batch:
+            if parsed.candidate.email in existing:
+                self.report.add_error(
+                    parsed.row_number, "email", "Candidate with this Email already exists."
+                )
+            else:
+                rows.append(parsed)
+
+        if rows and not self.dry_run:
+            self.insert(rows)
+        self.report.created += len(rows)
+        self.report.educations_created += sum(1 for row in rows if row.education)
+        self.report.experiences_created += sum(1 for row in rows if row.experience)
+
+        if self.progress:
+            self.progress(self.report)
+
+    @transaction.atomic
+    def insert(self, rows):
+        candidates = bulk_create_with_history(
+            [row.candidate for row in rows], Candidate, batch_size=self.batch_size
+        )
+        for row, candidate in zip(rows, candidates):
+            if row.education:
+                row.education.candidate = candidate
+            if row.experience:
+                row.experience.candidate = candidate
+
+        educations = [row.education for row in rows if row.education]
+        if educations:
+            bulk_create_with_history(educations, Education, batch_size=self.batch_size)
+
+        with_experience = [row for row in rows if row.experience]
+        if with_experience:
+            experiences = bulk_create_with_history(
+                [row.experience for row in with_experience],
+                Experience,
+                batch_size=self.batch_size,
+            )
+            through = Experience.departments.through
+            through.objects.bulk_create(
+                [
+                    through(experience_id=experience.pk, department_id=department.pk)
+                    for row, experience in zip(with_experience, experiences)
+                    for department in set(row.departments)
+                ],
+                batch_size=self.batch_size,
+            )
+
+        candidate_ids = [candidate.pk for candidate in candidates]
+        transaction.on_commit(
+            lambda: candidates_imported.send(sender=Candidate, candidate_ids=candidate_ids)
+        )
+        logger.info("Imported %s candidates", len(rows))
@@ -0,0 +1,103 @@
+import io
+import statistics
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-request latency of the candidate list with a new database connection "
+        "per request versus persistent connections (or the configured pool)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--path", default="/candidates/")
+        parser.add_argument(
+            "--username", help="User to log in as (defaults to the first superuser)."
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.all()
+        if options["username"]:
+            user = users.filter(username=options["username"]).first()
+        else:
+            user = users.filter(is_superuser=True).order_by("pk").first()
+        if user is None:
+            raise CommandError("No user to log in as.")
+        client = Client()
+        client.force_login(user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        if "pool" in connection.settings_dict["OPTIONS"]:
+            modes = [("psycopg pool (configured)", {})]
+        else:
+            modes = [
+                ("new connection per request", {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False}),
+                ("persistent", {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": False}),
+                ("persistent + health checks", {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True}),
+            ]
+
+        # The real WSGI handler, unlike the test client, closes connections
+        # at the end of the request according to CONN_MAX_AGE.
+        handler = WSGIHandler()
+        original = dict(connection.settings_dict)
+        opened = []
+        connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+        self.stdout.write(f"GET {options['path']} as {user.username}, {options['requests']} requests")
+        baseline = None
+        try:
+            for label, overrides in modes:
+                connection.close()
+                connection.settings_dict.update(overrides)
+                for _ in range(options["warmup"]):
+                    self.request(handler, options["path"], cookie)
+                opened.clear()
+                timings = [
+                    self.request(handler, options["path"], cookie)
+                    for _ in range(options["requests"])
+                ]
+                median = statistics.median(timings)
+                baseline = baseline or median
+                p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+                self.stdout.write(
+                    f"{label:<28} median {median * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms"
+                    f"   connections opened {len(opened):4d}"
+                    f"   {(median - baseline) / baseline:+.0%} vs first row"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.update(original)
+
+    def request(self, handler, path, cookie):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "localhost",
+            "HTTP_COOKIE": cookie,
+            "wsgi.input": io.BytesIO(),
+            "wsgi.url_scheme": "http",
+            "wsgi.errors": sys.stderr,
+        }
+        started = time.perf_counter()
+        response = handler(environ, lambda status, headers: None)
+        for _ in response:
+            pass
+        # Sends request_finished, which closes obsolete connections.
+        response.close()
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise CommandError(f"GET {path} returned {response.status_code}.")
+        return elapsed
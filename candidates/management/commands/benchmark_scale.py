@@ -0,0 +1,86 @@
+import os
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.benchmarks import ScaleBenchmark, compare_reports, git_commit, write_report
+from candidates.models import Candidate
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the candidate pages, the job matching page, the PDF documents and "
+        "the exports at one or more data scales and write a JSON/CSV report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="",
+            help=(
+                "Comma separated candidate counts, e.g. 10000,100000. Before each "
+                "benchmark seed_scale tops the database up to that many candidates. "
+                "Without it the current data is benchmarked."
+            ),
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Requests per page.")
+        parser.add_argument("--skip-exports", action="store_true")
+        parser.add_argument("--processes", type=int, default=1, help="Passed to seed_scale.")
+        parser.add_argument(
+            "--output",
+            default="benchmarks",
+            help="Directory for benchmark-<commit>.json and .csv.",
+        )
+        parser.add_argument(
+            "--compare",
+            metavar="REPORT.json",
+            help="A previous JSON report to print the median changes against.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted(int(scale) for scale in options["scales"].split(",") if scale)
+        except ValueError:
+            raise CommandError("--scales must be comma separated integers.")
+
+        results = []
+        for scale in scales or [None]:
+            if scale is not None:
+                missing = scale - Candidate.objects.count()
+                if missing > 0:
+                    call_command(
+                        "seed_scale",
+                        candidates=missing,
+                        processes=options["processes"],
+                        stdout=self.stdout,
+                    )
+            try:
+                benchmark = ScaleBenchmark(
+                    repeat=options["repeat"], exports=not options["skip_exports"]
+                )
+            except ValueError as exc:
+                raise CommandError(exc)
+            results += benchmark.run(progress=self.write_result)
+
+        os.makedirs(options["output"], exist_ok=True)
+        name = os.path.join(options["output"], "benchmark")
+        commit = git_commit()
+        if commit:
+            name += f"-{commit}"
+        write_report(results, json_path=f"{name}.json", csv_path=f"{name}.csv")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {name}.json and {name}.csv"))
+
+        if options["compare"]:
+            for scenario, scale, before, after, change in compare_reports(
+                options["compare"], results
+            ):
+                line = f"{scenario:<32} {scale:>9} {before:>10.1f}ms -> {after:>10.1f}ms {change:+.0%}"
+                if change > 0.2:
+                    line = self.style.WARNING(line)
+                self.stdout.write(line)
+
+    def write_result(self, result):
+        self.stdout.write(
+            f"{result.scale:>9} {result.scenario:<32} median {result.median_ms:>9.1f}ms "
+            f"p95 {result.p95_ms:>9.1f}ms {result.queries:>4} queries [{result.status}]"
+        )
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.exporters import delete_old_exports
+
+
+class Command(BaseCommand):
+    help = "Delete the candidate exports older than the retention period from the exports storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=float,
+            default=settings.EXPORT_RETENTION_DAYS,
+            help="Keep the exports of the last DAYS days (default: EXPORT_RETENTION_DAYS).",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        deleted = delete_old_exports(max_age=timedelta(days=options["days"]))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} old exports."))
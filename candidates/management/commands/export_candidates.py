@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.exporters import export_queryset, export_to_storage
+
+
+class Command(BaseCommand):
+    help = "Export all candidates to an XLSX or Parquet file in the exports storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=["xlsx", "parquet"], default="xlsx")
+        parser.add_argument("--query", help="Only export candidates matching this search.")
+        parser.add_argument("--sort", default="created_at")
+        parser.add_argument("--order", choices=["asc", "desc"], default="desc")
+
+    def handle(self, *args, **options):
+        params = {
+            "query": options["query"],
+            "sort": options["sort"],
+            "order": options["order"],
+        }
+        try:
+            name = export_to_storage(export_queryset(params), options["format"])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Exported candidates to {name}"))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.importers import CandidateImporter, IMPORT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Import candidates (with one education and experience per row) from a CSV or XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the .csv or .xlsx file to import.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Number of rows inserted per bulk_create batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate every row without writing to the database.",
+        )
+        parser.add_argument(
+            "--error-report",
+            help="Write the per-row error report to this CSV file.",
+        )
+
+    def handle(self, *args, **options):
+        def progress(report):
+            self.stdout.write(
+                f"Processed {report.processed} rows: "
+                f"{report.created} valid, {report.failed_rows} failed"
+            )
+
+        importer = CandidateImporter(
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            progress=progress,
+        )
+        try:
+            with open(options["path"], "rb") as file:
+                report = importer.run(file, options["path"])
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        if options["error_report"]:
+            with open(options["error_report"], "w", newline="", encoding="utf-8") as stream:
+                report.write_errors(stream)
+        else:
+            for error in report.errors:
+                self.stderr.write(f"Row {error.row_number} [{error.column}]: {error.message}")
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {report.created} candidates "
+                f"({report.educations_created} educations, "
+                f"{report.experiences_created} experiences); "
+                f"{report.failed_rows} of {report.processed} rows failed."
+            )
+        )
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.storage_migration import (
+    STORAGE_MIGRATION_BATCH_SIZE,
+    STORAGE_MIGRATION_WORKERS,
+    CandidateStorageMigrator,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move candidate files stored under name-based directories to their "
+        "candidate's storage_id directory: copy, verify, update the file "
+        "fields, then delete the old keys. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=STORAGE_MIGRATION_BATCH_SIZE,
+            help="Candidates per batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=STORAGE_MIGRATION_WORKERS,
+            help="Concurrent S3 copies.",
+        )
+        parser.add_argument(
+            "--after-id",
+            type=int,
+            default=0,
+            help="Resume after this candidate id (the last one a previous run reported).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only count the files to move."
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--batch-size and --workers must be positive.")
+
+        def progress(report):
+            self.stdout.write(
+                f"Up to candidate {report.last_candidate_id}: "
+                f"{report.moved} of {report.planned} files moved, {len(report.errors)} errors"
+            )
+
+        migrator = CandidateStorageMigrator(
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            dry_run=options["dry_run"],
+            progress=progress,
+        )
+        report = migrator.run(after_id=options["after_id"])
+
+        for key, message in report.errors:
+            self.stderr.write(f"{key}: {message}")
+        if options["dry_run"]:
+            summary = f"Would move {report.planned} files of {report.candidates} candidates."
+        else:
+            summary = (
+                f"Moved {report.moved} of {report.planned} files of {report.candidates} "
+                f"candidates; deleted {report.deleted} old keys."
+            )
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.storage_usage import RECONCILE_BATCH_SIZE, reconcile_stored_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the stored file accounting from the file fields and a "
+        "listing of the bucket: sets the sizes the upload signals could not "
+        "know and drops the rows of files that are gone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help="Rows written per upsert.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        total, missing = reconcile_stored_files(
+            batch_size=options["batch_size"],
+            progress=lambda done: self.stdout.write(f"{done} files reconciled"),
+        )
+        if missing:
+            self.stderr.write(f"{missing} file field values have no object in the bucket.")
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {total} stored files."))
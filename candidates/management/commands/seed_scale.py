@@ -0,0 +1,93 @@
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from candidates.seeding import (
+    SEED_BATCH_SIZE,
+    ScaleSeeder,
+    SeedReport,
+    seed_lookups,
+    seeded_candidates_count,
+)
+
+
+def _seed_chunk(arguments):
+    start, count, batch_size, seed, lookups = arguments
+    report = ScaleSeeder(batch_size=batch_size, seed=seed).run(count, start, lookups)
+    connections.close_all()
+    return report
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert N synthetic candidates with educations, experiences, licenses, "
+        "languages and application data, for scale testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--candidates", type=int, required=True)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEED_BATCH_SIZE,
+            help="Candidates inserted per transaction.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Seed in this many processes in parallel (for 100k+ candidates).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count, processes = options["candidates"], max(options["processes"], 1)
+
+        if processes == 1:
+            def progress(report):
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{report.candidates} candidates ({report.candidates / elapsed:.0f}/s)"
+                )
+
+            seeder = ScaleSeeder(
+                batch_size=options["batch_size"], seed=options["seed"], progress=progress
+            )
+            report = seeder.run(count)
+        else:
+            lookups = seed_lookups()
+            start = seeded_candidates_count()
+            chunk = -(-count // processes)
+            chunks = [
+                (
+                    start + offset,
+                    min(chunk, count - offset),
+                    options["batch_size"],
+                    options["seed"] + index,
+                    lookups,
+                )
+                for index, offset in enumerate(range(0, count, chunk))
+            ]
+            # Children must not share the parent's database connection.
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                reports = pool.map(_seed_chunk, chunks)
+            report = SeedReport(
+                **{
+                    field: sum(getattr(chunk_report, field) for chunk_report in reports)
+                    for field in SeedReport.__dataclass_fields__
+                }
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {report.candidates} candidates, {report.educations} educations, "
+                f"{report.experiences} experiences, {report.licenses} licenses, "
+                f"{report.languages} languages and {report.application_data} application "
+                f"data rows in {time.perf_counter() - started:.1f}s. "
+                "Run recompute_matches to score them against the jobs."
+            )
+        )
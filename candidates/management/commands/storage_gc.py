@@ -0,0 +1,72 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from candidates.s3 import S3_DELETE_BATCH_SIZE
+from candidates.storage_gc import CANDIDATE_FILES_PREFIX, GC_MIN_AGE, collect_orphans
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the objects under the candidate files prefix of the bucket "
+        "that no candidate file field refers to any more (with --prefix "
+        "blobs/, the shared blobs that have no StoredBlob row)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default=CANDIDATE_FILES_PREFIX)
+        parser.add_argument(
+            "--min-age-hours",
+            type=float,
+            default=GC_MIN_AGE.total_seconds() / 3600,
+            help="Leave objects younger than this alone (default: 24).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=S3_DELETE_BATCH_SIZE,
+            help=f"Keys per DeleteObjects call (at most {S3_DELETE_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only report the orphaned objects."
+        )
+        parser.add_argument("--report", help="Write the orphaned objects to this CSV file.")
+
+    def handle(self, *args, **options):
+        if not 0 < options["batch_size"] <= S3_DELETE_BATCH_SIZE:
+            raise CommandError(f"--batch-size must be between 1 and {S3_DELETE_BATCH_SIZE}.")
+        if options["min_age_hours"] < 0:
+            raise CommandError("--min-age-hours cannot be negative.")
+        if not options["prefix"].endswith("/"):
+            raise CommandError("--prefix must end with '/'.")
+
+        report = collect_orphans(
+            prefix=options["prefix"],
+            dry_run=options["dry_run"],
+            min_age=datetime.timedelta(hours=options["min_age_hours"]),
+            batch_size=options["batch_size"],
+            progress=lambda report: self.stdout.write(f"Deleted {report.deleted} objects"),
+        )
+
+        if options["report"]:
+            with open(options["report"], "w", newline="", encoding="utf-8") as stream:
+                report.write_orphans(stream)
+        elif options["verbosity"] > 1:
+            for orphan in report.orphans:
+                self.stdout.write(f"{orphan.key} ({filesizeformat(orphan.size)})")
+        for key, message in report.errors.items():
+            self.stderr.write(f"{key}: {message}")
+
+        self.stdout.write(
+            f"Listed {report.listed} objects; {report.referenced} referenced keys; "
+            f"{report.skipped_recent} orphans too recent to collect."
+        )
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        count = len(report.orphans) if options["dry_run"] else report.deleted
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {count} orphaned objects ({filesizeformat(report.orphan_bytes)}) "
+                f"in {report.delete_calls} DeleteObjects calls."
+            )
+        )
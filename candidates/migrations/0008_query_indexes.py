@@ -0,0 +1,113 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:29
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the tables against writes.
+    atomic = False
+
+    dependencies = [
+        (
+            "candidates",
+            "0007_rename_is_candidate_start_work_candidateapplicationdata_is_candidate_start_work_and_more",
+        ),
+        ("utilities", "0004_alter_historicalinstitution_type_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                fields=["gender", "birthday"], name="candidate_gender_birthday_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(fields=["-created_at"], name="candidate_created_at_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(fields=["updated_at"], name="candidate_updated_at_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                fields=["first_name", "second_name", "last_name"],
+                name="candidate_full_name_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                condition=models.Q(("passport_expiration_date__isnull", False)),
+                fields=["passport_expiration_date"],
+                name="candidate_passport_expiry_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidateapplicationdata",
+            index=models.Index(
+                condition=models.Q(("DataFlow_expiry_date__isnull", False)),
+                fields=["DataFlow_expiry_date"],
+                name="appdata_dataflow_expiry_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidateapplicationdata",
+            index=models.Index(
+                condition=models.Q(("DHP_expiry_date__isnull", False)),
+                fields=["DHP_expiry_date"],
+                name="appdata_dhp_expiry_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidateapplicationdata",
+            index=models.Index(
+                condition=models.Q(("PCC_expiry_date__isnull", False)),
+                fields=["PCC_expiry_date"],
+                name="appdata_pcc_expiry_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidateapplicationdata",
+            index=models.Index(
+                condition=models.Q(("Prometric_expiry_date__isnull", False)),
+                fields=["Prometric_expiry_date"],
+                name="appdata_prometric_expiry_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidateapplicationdata",
+            index=models.Index(
+                condition=models.Q(("Visa_expiry_date__isnull", False)),
+                fields=["Visa_expiry_date"],
+                name="appdata_visa_expiry_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="education",
+            index=models.Index(
+                fields=["degree", "field_of_study", "candidate"],
+                name="education_degree_field_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="experience",
+            index=models.Index(
+                fields=["candidate", "start_date"],
+                name="experience_candidate_start_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="license",
+            index=models.Index(
+                condition=models.Q(("expiry_date__isnull", False)),
+                fields=["expiry_date"],
+                name="license_expiry_date_idx",
+            ),
+        ),
+    ]
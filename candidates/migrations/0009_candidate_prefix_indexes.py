@@ -0,0 +1,69 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:00
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the table against writes.
+    atomic = False
+
+    dependencies = [
+        ("candidates", "0008_query_indexes"),
+        ("utilities", "0005_lookup_prefix_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="text_pattern_ops",
+                ),
+                name="candidate_first_prefix_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="text_pattern_ops",
+                ),
+                name="candidate_last_prefix_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="text_pattern_ops",
+                ),
+                name="candidate_email_prefix_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("passport_id"),
+                    name="text_pattern_ops",
+                ),
+                name="candidate_passport_prefix_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("call_phone_number"),
+                    name="text_pattern_ops",
+                ),
+                name="candidate_phone_prefix_idx",
+            ),
+        ),
+    ]
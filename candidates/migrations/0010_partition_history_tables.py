@@ -0,0 +1,41 @@
+# Range-partition the candidate history tables by month of history_date.
+
+from django.conf import settings
+from django.db import migrations
+
+from utilities.history import partition_history_table, unpartition_history_table
+
+HISTORY_TABLES = [
+    "candidates_historicalcandidate",
+    "candidates_historicaleducation",
+    "candidates_historicalexperience",
+    "candidates_historicaltrainingcourse",
+    "candidates_historicallicense",
+    "candidates_historicalcandidateapplicationdata",
+]
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in HISTORY_TABLES:
+            partition_history_table(cursor, table, settings.HISTORY_PARTITION_MONTHS_AHEAD)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in HISTORY_TABLES:
+            unpartition_history_table(cursor, table)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("candidates", "0009_candidate_prefix_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
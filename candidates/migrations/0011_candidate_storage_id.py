@@ -0,0 +1,78 @@
+# Give every candidate an immutable storage prefix (get_candidate_directory).
+# Existing files keep their keys until migrate_candidate_storage moves them.
+
+import uuid
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 2000
+
+
+def fill_storage_ids(apps, schema_editor):
+    Candidate = apps.get_model("candidates", "Candidate")
+    HistoricalCandidate = apps.get_model("candidates", "HistoricalCandidate")
+    db = schema_editor.connection.alias
+
+    pending = Candidate.objects.using(db).filter(storage_id__isnull=True).only("pk")
+    while batch := list(pending[:BATCH_SIZE]):
+        for candidate in batch:
+            candidate.storage_id = uuid.uuid4()
+        Candidate.objects.using(db).bulk_update(batch, ["storage_id"])
+
+    # History rows share their candidate's id; deleted candidates get a new one.
+    HistoricalCandidate.objects.using(db).update(
+        storage_id=Subquery(
+            Candidate.objects.using(db).filter(pk=OuterRef("id")).values("storage_id")[:1]
+        )
+    )
+    deleted = (
+        HistoricalCandidate.objects.using(db)
+        .filter(storage_id__isnull=True)
+        .values_list("id", flat=True)
+        .distinct()
+    )
+    for candidate_id in list(deleted):
+        HistoricalCandidate.objects.using(db).filter(id=candidate_id).update(
+            storage_id=uuid.uuid4()
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("candidates", "0010_partition_history_tables"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="candidate",
+            name="storage_id",
+            field=models.UUIDField(editable=False, null=True, verbose_name="Storage ID"),
+        ),
+        migrations.AddField(
+            model_name="historicalcandidate",
+            name="storage_id",
+            field=models.UUIDField(editable=False, null=True, verbose_name="Storage ID"),
+        ),
+        migrations.RunPython(fill_storage_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="candidate",
+            name="storage_id",
+            field=models.UUIDField(
+                default=uuid.uuid4,
+                editable=False,
+                unique=True,
+                verbose_name="Storage ID",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicalcandidate",
+            name="storage_id",
+            field=models.UUIDField(
+                db_index=True,
+                default=uuid.uuid4,
+                editable=False,
+                verbose_name="Storage ID",
+            ),
+        ),
+    ]
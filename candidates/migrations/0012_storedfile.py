@@ -0,0 +1,65 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidates", "0011_candidate_storage_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=50, verbose_name="Record Type")),
+                ("object_id", models.BigIntegerField(verbose_name="Record ID")),
+                (
+                    "field_name",
+                    models.CharField(max_length=100, verbose_name="Document"),
+                ),
+                ("key", models.CharField(max_length=500, verbose_name="Storage Key")),
+                (
+                    "size",
+                    models.BigIntegerField(blank=True, null=True, verbose_name="Size"),
+                ),
+                (
+                    "content_type",
+                    models.CharField(
+                        blank=True, max_length=100, verbose_name="Content Type"
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "candidate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stored_files",
+                        to="candidates.candidate",
+                        verbose_name="Candidate",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Stored File",
+                "verbose_name_plural": "Stored Files",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("model", "object_id", "field_name"),
+                        name="unique_stored_file_field",
+                    )
+                ],
+            },
+        ),
+    ]
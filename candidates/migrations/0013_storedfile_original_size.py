@@ -0,0 +1,20 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidates", "0012_storedfile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="storedfile",
+            name="original_size",
+            field=models.BigIntegerField(
+                blank=True, null=True, verbose_name="Original Size"
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:00
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the tables against writes.
+    atomic = False
+
+    dependencies = [
+        ("candidates", "0013_storedfile_original_size"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="candidate_first_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="candidate_last_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="gin_trgm_ops",
+                ),
+                name="candidate_email_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("passport_id"),
+                    name="gin_trgm_ops",
+                ),
+                name="candidate_passport_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="candidate",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("call_phone_number"),
+                    name="gin_trgm_ops",
+                ),
+                name="candidate_phone_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="experience",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("company_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="experience_company_trgm_idx",
+            ),
+        ),
+    ]
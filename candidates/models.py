@@ -1,5 +1,6 @@
 import os
 import re
+import uuid
 from audioop import reverse
 from datetime import date
 from dateutil.relativedelta import relativedelta
@@ -7,12 +8,15 @@ from django_ckeditor_5.fields import CKEditor5Field
 
 
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
-from simple_history.models import HistoricalRecords
 
+from utilities.files import ClearableFilesMixin
+from utilities.history import ChangedOnlyHistoricalRecords
 from utilities.models import (
     Nationality,
     Country,
@@ -44,10 +48,12 @@ def validate_end_date_after_start(start_date, end_date):
 
 # Helper Functions
 def get_candidate_directory(instance):
-    full_name = instance.full_name
-    sanitized_full_name = re.sub(r"[^\w\s-]", "", full_name).strip().lower()
-    sanitized_full_name = re.sub(r"[-\s]+", "-", sanitized_full_name)
-    return f"candidates/{sanitized_full_name}_{instance.pk}"
+    """
+    Storage prefix of all of a candidate's files. It is built from the
+    immutable storage_id, so renaming a candidate does not scatter their
+    files across prefixes (and it is known before the first save).
+    """
+    return f"candidates/{instance.storage_id}"
 
 
 def profile_image_upload_path(instance, filename):
@@ -212,8 +218,18 @@ def candidate_visa_certificates(instance, filename):
     return f"{candidate_directory}/{filename}"
 
 
+# Candidate columns searched by substring in the admin, each with a trigram index.
+CANDIDATE_TRIGRAM_FIELDS = [
+    ("first_name", "first"),
+    ("last_name", "last"),
+    ("email", "email"),
+    ("passport_id", "passport"),
+    ("call_phone_number", "phone"),
+]
+
+
 # Models
-class Candidate(models.Model):
+class Candidate(ClearableFilesMixin, models.Model):
     # pk = models.pkField(default=pk.pk4, editable=False, unique=True)
     is_open_to_work = models.CharField(
         choices=[("Yes", _("Yes")), ("NO", _("No"))],
@@ -337,16 +353,67 @@ class Candidate(models.Model):
         null=True,
         verbose_name=_("Resume Copy"),
     )
+    storage_id = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        unique=True,
+        verbose_name=_("Storage ID"),
+    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     class Meta:
         verbose_name = _("Candidate")
         verbose_name_plural = _("Candidates")
         ordering = ["-created_at"]
+        indexes = [
+            # Job matching: gender + birthday (age) range.
+            models.Index(fields=["gender", "birthday"], name="candidate_gender_birthday_idx"),
+            # Candidate list sort columns.
+            models.Index(fields=["-created_at"], name="candidate_created_at_idx"),
+            models.Index(fields=["updated_at"], name="candidate_updated_at_idx"),
+            models.Index(
+                fields=["first_name", "second_name", "last_name"],
+                name="candidate_full_name_idx",
+            ),
+            models.Index(
+                fields=["passport_expiration_date"],
+                condition=models.Q(passport_expiration_date__isnull=False),
+                name="candidate_passport_expiry_idx",
+            ),
+            # Case-insensitive prefix search: search suggestions and the admin.
+            models.Index(
+                OpClass(Upper("first_name"), name="text_pattern_ops"),
+                name="candidate_first_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("last_name"), name="text_pattern_ops"),
+                name="candidate_last_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("email"), name="text_pattern_ops"),
+                name="candidate_email_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("passport_id"), name="text_pattern_ops"),
+                name="candidate_passport_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("call_phone_number"), name="text_pattern_ops"),
+                name="candidate_phone_prefix_idx",
+            ),
+            # Case-insensitive substring search (icontains): the admin.
+            *[
+                GinIndex(
+                    OpClass(Upper(field), name="gin_trgm_ops"),
+                    name=f"candidate_{label}_trgm_idx",
+                )
+                for field, label in CANDIDATE_TRIGRAM_FIELDS
+            ],
+        ]
 
     @property
     def full_name(self):
@@ -421,36 +488,16 @@ class Candidate(models.Model):
         return len(filled_fields) / len(required_fields) * 100
 
     def delete_resume(self):
-        if self.resume_copy:
-            print("Deleting resume")
-            self.resume_copy.delete(save=False)
-            self.resume_copy = None
-            self.save()
+        self.clear_files("resume_copy")
 
     def delete_image(self):
-        if self.personal_image:
-            try:
-                print("Deleting image")
-                self.personal_image.delete(save=False)
-                self.personal_image = None
-                self.save()
-            except Exception as e:
-                print(f"Failed to delete image: {e}")
-                raise
+        self.clear_files("personal_image")
 
     def delete_id_copy(self):
-        if self.national_id_copy:
-            print("Deleting id copy")
-            self.national_id_copy.delete(save=False)
-            self.national_id_copy = None
-            self.save()
+        self.clear_files("national_id_copy")
 
     def delete_passport_copy(self):
-        if self.passport_copy:
-            print("Deleting passport copy")
-            self.passport_copy.delete(save=False)
-            self.passport_copy = None
-            self.save()
+        self.clear_files("passport_copy")
 
     def candidate_age(self):
         if self.birthday:
@@ -514,8 +561,8 @@ class Candidate(models.Model):
         total_years = total_months / 12.0
         return total_years
 
-class Education(models.Model):
-    history = HistoricalRecords()
+class Education(ClearableFilesMixin, models.Model):
+    history = ChangedOnlyHistoricalRecords()
 
     # Candidate Information
     candidate = models.ForeignKey(
@@ -606,16 +653,10 @@ class Education(models.Model):
     )
 
     def delete_certification_copy(self):
-        if self.certification_copy:
-            self.certification_copy.delete(save=False)
-            self.certification_copy = None
-            self.save()
+        self.clear_files("certification_copy")
 
     def delete_transcript_copy(self):
-        if self.transcript_copy:
-            self.transcript_copy.delete(save=False)
-            self.transcript_copy = None
-            self.save()
+        self.clear_files("transcript_copy")
 
     def clean(self):
         super().clean()
@@ -631,6 +672,13 @@ class Education(models.Model):
         verbose_name = _("Education")
         verbose_name_plural = _("Educations")
         ordering = ["-start_date"]
+        indexes = [
+            # Job matching: accepted degree + field of study -> candidates.
+            models.Index(
+                fields=["degree", "field_of_study", "candidate"],
+                name="education_degree_field_idx",
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(end_date__gte=models.F("start_date"))
@@ -640,7 +688,7 @@ class Education(models.Model):
         ]
 
 
-class Experience(models.Model):
+class Experience(ClearableFilesMixin, models.Model):
     candidate = models.ForeignKey(
         Candidate,
         related_name="experiences",
@@ -732,7 +780,7 @@ class Experience(models.Model):
         help_text=_("The date and time when this record was last updated."),
     )
 
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     def __str__(self):
         return f"{self.company_name} - {self.job_title}"
@@ -741,10 +789,7 @@ class Experience(models.Model):
         return self.company_location.name
 
     def delete_certification_copy(self):
-        if self.certification_copy:
-            self.certification_copy.delete(save=False)
-            self.certification_copy = None
-            self.save()
+        self.clear_files("certification_copy")
 
     def clean(self):
         super().clean()
@@ -782,6 +827,14 @@ class Experience(models.Model):
         verbose_name = _("Experience")
         verbose_name_plural = _("Experiences")
         ordering = ["-start_date"]
+        indexes = [
+            models.Index(fields=["candidate", "start_date"], name="experience_candidate_start_idx"),
+            # Case-insensitive substring search (icontains): the admin.
+            GinIndex(
+                OpClass(Upper("company_name"), name="gin_trgm_ops"),
+                name="experience_company_trgm_idx",
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(end_date__gte=models.F("start_date"))
@@ -816,7 +869,7 @@ class Language(models.Model):
         return f"{self.language}"
 
 
-class TrainingCourse(models.Model):
+class TrainingCourse(ClearableFilesMixin, models.Model):
     candidate = models.ForeignKey(
         Candidate,
         on_delete=models.CASCADE,
@@ -881,17 +934,14 @@ class TrainingCourse(models.Model):
         verbose_name=_("Updated At"),
         help_text=_("The date and time when this record was last updated."),
     )
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     def clean(self):
         super().clean()
         validate_end_date_after_start(self.start_date, self.end_date)
 
     def delete_certification_copy(self):
-        if self.certification_copy:
-            self.certification_copy.delete(save=False)
-            self.certification_copy = None
-            self.save()
+        self.clear_files("certification_copy")
 
     class Meta:
         verbose_name = _("Training Course")
@@ -907,7 +957,7 @@ class TrainingCourse(models.Model):
         ]
 
 
-class License(models.Model):
+class License(ClearableFilesMixin, models.Model):
     candidate = models.ForeignKey(
         Candidate,
         related_name="licenses",
@@ -966,7 +1016,7 @@ class License(models.Model):
         verbose_name=_("Updated At"),
         help_text=_("The date and time when this record was last updated."),
     )
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     def __str__(self):
         return f"{self.license_name} ({self.license_number})"
@@ -977,10 +1027,7 @@ class License(models.Model):
 
     def delete_license_copy(self):
         """Deletes the license copy associated with this license."""
-        if self.license_copy:
-            self.license_copy.delete(save=False)
-            self.license_copy = None
-            self.save()
+        self.clear_files("license_copy")
 
     def clean(self):
         """Custom validation to ensure that the expiry date is not before the issued date."""
@@ -998,9 +1045,26 @@ class License(models.Model):
             "candidate",
             "license_number",
         )  # Ensures a candidate doesn't have duplicate license numbers
+        indexes = [
+            models.Index(
+                fields=["expiry_date"],
+                condition=models.Q(expiry_date__isnull=False),
+                name="license_expiry_date_idx",
+            ),
+        ]
 
 
-class CandidateApplicationData(models.Model):
+# Document expiry dates of CandidateApplicationData, each with a partial index.
+APPLICATION_DATA_EXPIRY_FIELDS = [
+    "DataFlow_expiry_date",
+    "DHP_expiry_date",
+    "PCC_expiry_date",
+    "Prometric_expiry_date",
+    "Visa_expiry_date",
+]
+
+
+class CandidateApplicationData(ClearableFilesMixin, models.Model):
     candidate = models.OneToOneField(
         Candidate,
         on_delete=models.CASCADE,
@@ -1020,7 +1084,7 @@ class CandidateApplicationData(models.Model):
         related_name="assigned_candidates",
         verbose_name=_("Follow Up Assigned To"),
     )
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     HMC_Portal_email = models.EmailField(
         verbose_name=_("HMC Portal Email"),
@@ -1226,76 +1290,43 @@ class CandidateApplicationData(models.Model):
     # Delete methods for specific file fields
     def delete_blood_test_report(self):
         """Deletes the blood test report file from storage."""
-        if self.MedicalTest_blood_test_report:
-            self.MedicalTest_blood_test_report.delete(save=False)
-            self.MedicalTest_blood_test_report = None
-            self.save()
+        self.clear_files("MedicalTest_blood_test_report")
 
     def delete_xray_test_report(self):
         """Deletes the X-ray test report file from storage."""
-        if self.MedicalTest_xray_test_report:
-            self.MedicalTest_xray_test_report.delete(save=False)
-            self.MedicalTest_xray_test_report = None
-            self.save()
+        self.clear_files("MedicalTest_xray_test_report")
 
     def delete_fit_to_work_report(self):
         """Deletes the fit to work report file from storage."""
-        if self.MedicalTest_fit_to_work_report:
-            self.MedicalTest_fit_to_work_report.delete(save=False)
-            self.MedicalTest_fit_to_work_report = None
-            self.save()
+        self.clear_files("MedicalTest_fit_to_work_report")
 
     def delete_pregnancy_report(self):
         """Deletes the pregnancy report file from storage."""
-        if self.MedicalTest_pregnancy_report:
-            self.MedicalTest_pregnancy_report.delete(save=False)
-            self.MedicalTest_pregnancy_report = None
-            self.save()
+        self.clear_files("MedicalTest_pregnancy_report")
 
     def delete_dhp_certificate(self):
         """Deletes the DHP certificate copy from storage."""
-        if self.DHP_copy:
-            self.DHP_copy.delete(save=False)
-            self.DHP_copy = None
-            self.save()
+        self.clear_files("DHP_copy")
 
     def delete_prometric_certificate(self):
         """Deletes the Prometric certificate copy from storage."""
-        try:
-            if self.Prometric_certificate_copy:
-                self.Prometric_certificate_copy.delete(save=False)
-                self.Prometric_certificate_copy = None
-                self.save()
-        except Exception as e:
-            print(f"Failed to delete Prometric certificate: {e}")
+        self.clear_files("Prometric_certificate_copy")
 
     def delete_police_clearance_copy(self):
         """Deletes the Police Clearance Certificate from storage."""
-        if self.PCC_clearance_copy:
-            self.PCC_clearance_copy.delete(save=False)
-            self.PCC_clearance_copy = None
-            self.save()
+        self.clear_files("PCC_clearance_copy")
 
     def delete_visa_copy(self):
         """Deletes the Visa certificate copy from storage."""
-        if self.Visa_copy:
-            self.Visa_copy.delete(save=False)
-            self.Visa_copy = None
-            self.save()
+        self.clear_files("Visa_copy")
 
     def delete_dataflow_certificate_copy(self):
         """Deletes the DataFlow certificate copy from storage."""
-        if self.DataFlow_certificate_copy:
-            self.DataFlow_certificate_copy.delete(save=False)
-            self.DataFlow_certificate_copy = None
-            self.save()
+        self.clear_files("DataFlow_certificate_copy")
 
     def delete_prometric_appointment_copy(self):
         """Deletes the Prometric Appointment copy from storage."""
-        if self.Prometric_Appointment_copy:
-            self.Prometric_Appointment_copy.delete(save=False)
-            self.Prometric_Appointment_copy = None
-            self.save()
+        self.clear_files("Prometric_Appointment_copy")
 
     def __str__(self):
         return f"Candidate Data for {self.candidate.full_name}"
@@ -1303,3 +1334,48 @@ class CandidateApplicationData(models.Model):
     class Meta:
         verbose_name = _("Candidate Data")
         verbose_name_plural = _("Candidates Data")
+        indexes = [
+            models.Index(
+                fields=[field],
+                condition=models.Q(**{f"{field}__isnull": False}),
+                name=f"appdata_{field.split('_')[0].lower()}_expiry_idx",
+            )
+            for field in APPLICATION_DATA_EXPIRY_FIELDS
+        ]
+
+
+class StoredFile(models.Model):
+    """
+    Size and content type of one file field value of a candidate record,
+    kept up to date by the save and delete signals (candidates/storage_usage.py)
+    so that storage usage is aggregated without listing the bucket.
+    """
+
+    candidate = models.ForeignKey(
+        Candidate,
+        on_delete=models.CASCADE,
+        related_name="stored_files",
+        verbose_name=_("Candidate"),
+    )
+    model = models.CharField(max_length=50, verbose_name=_("Record Type"))
+    object_id = models.BigIntegerField(verbose_name=_("Record ID"))
+    field_name = models.CharField(max_length=100, verbose_name=_("Document"))
+    key = models.CharField(max_length=500, verbose_name=_("Storage Key"))
+    # Unknown until the reconcile_storage_usage command has listed the key.
+    size = models.BigIntegerField(null=True, blank=True, verbose_name=_("Size"))
+    # Size as uploaded, when upload processing recompressed the file.
+    original_size = models.BigIntegerField(null=True, blank=True, verbose_name=_("Original Size"))
+    content_type = models.CharField(max_length=100, blank=True, verbose_name=_("Content Type"))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.key
+
+    class Meta:
+        verbose_name = _("Stored File")
+        verbose_name_plural = _("Stored Files")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model", "object_id", "field_name"], name="unique_stored_file_field"
+            ),
+        ]
@@ -0,0 +1,140 @@
+# candidates/pipeline.py
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from utilities.cache import cache_timeout
+
+from .models import CandidateApplicationData
+
+PIPELINE_CACHE_KEY = "candidates:pipeline_counts"
+PIPELINE_CACHE_TIMEOUT = 60 * 60
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    key: str
+    label: str
+    condition: Q
+
+
+# Application steps in the order candidates usually go through them.
+PIPELINE_STAGES = [
+    PipelineStage("dataflow_paid", "DataFlow Paid", Q(DataFlow_is_paid=True)),
+    PipelineStage("dataflow_issued", "DataFlow Issued", Q(DataFlow_issue_date__isnull=False)),
+    PipelineStage("prometric_passed", "Prometric Passed", Q(Prometric_status="pass")),
+    PipelineStage("dhp_issued", "DHP Issued", Q(DHP_issue_date__isnull=False)),
+    PipelineStage("pcc_stamped", "PCC Stamped", Q(PCC_is_stamp=True)),
+    PipelineStage("medical_fit", "Medically Fit", Q(MedicalTest_is_fit_to_work=True)),
+    PipelineStage(
+        "visa_issued", "Visa Issued", Q(Visa_status="pass") | Q(Visa_issue_date__isnull=False)
+    ),
+    PipelineStage(
+        "travel_booked", "Travel Booked", Q(TravelDetails_departure_date__isnull=False)
+    ),
+    PipelineStage("started_work", "Started Work", Q(is_candidate_start_work=True)),
+]
+STAGES_BY_KEY = {stage.key: stage for stage in PIPELINE_STAGES}
+
+JOB_FIELD = "candidate__job_opportunities"
+USER_FIELD = "follow_up_assigned_to"
+
+
+def _empty_counts():
+    return {"total": 0, **{stage.key: 0 for stage in PIPELINE_STAGES}}
+
+
+def _rollup(rows, id_field, label_field, unassigned_label):
+    groups = {}
+    for row in rows:
+        group = groups.setdefault(
+            row[id_field],
+            {
+                "id": row[id_field],
+                "label": row[label_field] or unassigned_label,
+                "counts": _empty_counts(),
+            },
+        )
+        for key in group["counts"]:
+            group["counts"][key] += row[key]
+    for group in groups.values():
+        # Ordered like PIPELINE_STAGES, for the board's columns.
+        group["stages"] = [(stage.key, group["counts"][stage.key]) for stage in PIPELINE_STAGES]
+    # Unassigned (None) last, the rest alphabetically.
+    return sorted(
+        groups.values(), key=lambda group: (group["id"] is None, group["label"].lower())
+    )
+
+
+def _stage_rows(*fields):
+    return list(
+        CandidateApplicationData.objects.order_by()
+        .values(*fields)
+        .annotate(
+            total=Count("pk", distinct=True),
+            **{
+                stage.key: Count("pk", filter=stage.condition, distinct=True)
+                for stage in PIPELINE_STAGES
+            },
+        )
+    )
+
+
+def compute_pipeline_counts():
+    """
+    Stage counts per job opportunity and per follow-up user.
+
+    Two queries, application data grouped by job and by follow-up user with
+    a filtered COUNT per stage. A candidate linked to several jobs counts
+    once per job, but only once in the totals and per user.
+    """
+    job_rows = _stage_rows(JOB_FIELD, f"{JOB_FIELD}__job_title")
+    user_rows = _stage_rows(USER_FIELD, f"{USER_FIELD}__username")
+    totals = _empty_counts()
+    for row in user_rows:
+        for key in totals:
+            totals[key] += row[key]
+    return {
+        "totals": totals,
+        "stage_totals": [
+            (stage.key, stage.label, totals[stage.key]) for stage in PIPELINE_STAGES
+        ],
+        "jobs": _rollup(job_rows, JOB_FIELD, f"{JOB_FIELD}__job_title", "No Job Opportunity"),
+        "users": _rollup(user_rows, USER_FIELD, f"{USER_FIELD}__username", "Unassigned"),
+    }
+
+
+def pipeline_counts():
+    counts = cache.get(PIPELINE_CACHE_KEY)
+    if counts is None:
+        counts = compute_pipeline_counts()
+        cache.set(PIPELINE_CACHE_KEY, counts, cache_timeout(PIPELINE_CACHE_TIMEOUT))
+    return counts
+
+
+def invalidate_pipeline_counts(*args, **kwargs):
+    """Drop the cached board once the change is committed; usable as a signal receiver."""
+    transaction.on_commit(lambda: cache.delete(PIPELINE_CACHE_KEY))
+
+
+def stage_queryset(stage_key=None, job=None, user=None):
+    """
+    Application data behind one board cell. ``job`` / ``user`` are ids, or
+    "none" for the unassigned group; a missing ``stage_key`` means all.
+    """
+    queryset = CandidateApplicationData.objects.select_related(
+        "candidate", "follow_up_assigned_to"
+    )
+    if stage_key:
+        queryset = queryset.filter(STAGES_BY_KEY[stage_key].condition)
+    if job == "none":
+        queryset = queryset.filter(**{f"{JOB_FIELD}__isnull": True})
+    elif job:
+        queryset = queryset.filter(**{JOB_FIELD: job})
+    if user == "none":
+        queryset = queryset.filter(**{f"{USER_FIELD}__isnull": True})
+    elif user:
+        queryset = queryset.filter(**{USER_FIELD: user})
+    return queryset.order_by("candidate__first_name", "candidate__last_name", "pk")
@@ -0,0 +1,114 @@
+# candidates/queries.py
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db.models import F, Func, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Candidate, Experience
+
+
+class MonthsBetween(Func):
+    """
+    Whole months between two dates, matching ``relativedelta`` (years * 12 +
+    months), which is how Candidate.get_total_experience_years counts.
+    """
+
+    template = (
+        "(EXTRACT(YEAR FROM AGE(%(expressions)s)) * 12"
+        " + EXTRACT(MONTH FROM AGE(%(expressions)s)))::integer"
+    )
+    output_field = IntegerField()
+
+
+class CurrentDate(Func):
+    template = "CURRENT_DATE"
+    output_field = Experience._meta.get_field("end_date")
+
+
+def experience_months_subquery(departments=None):
+    """Total experience months of the outer candidate, optionally per department."""
+    experiences = Experience.objects.filter(candidate=OuterRef("pk"))
+    if departments is not None:
+        experiences = experiences.filter(departments__in=departments).distinct()
+    return Subquery(
+        experiences.order_by()
+        .annotate(months=MonthsBetween(Coalesce("end_date", CurrentDate()), F("start_date")))
+        .values("candidate")
+        .annotate(total=Sum("months"))
+        .values("total"),
+        output_field=IntegerField(),
+    )
+
+
+def departments_subquery():
+    """Comma separated department abbreviations of the outer candidate."""
+    return Subquery(
+        Experience.departments.through.objects.filter(
+            experience__candidate=OuterRef("pk")
+        )
+        .order_by()
+        .values("experience__candidate")
+        .annotate(
+            names=StringAgg(
+                "department__abbreviation",
+                delimiter=", ",
+                distinct=True,
+                ordering="department__abbreviation",
+            )
+        )
+        .values("names")
+    )
+
+
+def with_experience_annotations(queryset):
+    """Annotate ``experience_months`` and ``department_names`` in SQL."""
+    return queryset.annotate(
+        experience_months=Coalesce(experience_months_subquery(), 0),
+        department_names=departments_subquery(),
+    )
+
+
+# Sortable columns of the candidate list that are not plain model fields.
+ANNOTATED_SORT_FIELDS = {
+    "total_experience": "experience_months",
+    "departments": "department_names",
+    "nationality": "nationality__nationality_name",
+}
+
+
+def candidate_sort_criteria(sort_by, order):
+    """Translate the candidate list ``sort``/``order`` GET params to order_by()."""
+    order_prefix = "-" if order == "desc" else ""
+    if sort_by == "full_name":
+        fields = ["first_name", "second_name", "last_name"]
+    else:
+        fields = [ANNOTATED_SORT_FIELDS.get(sort_by, sort_by)]
+    return [f"{order_prefix}{field}" for field in fields]
+
+
+def search_candidates(queryset, query):
+    """Full-text search used by the candidate search page."""
+    if not query:
+        return queryset
+    return queryset.annotate(
+        search=SearchVector(
+            'first_name', 'second_name', 'third_name', 'last_name',
+            'national_id_number', 'passport_id',
+            'whatsapp_phone_number', 'call_phone_number', 'email'
+        )
+    ).filter(search=query)
+
+
+SUGGESTION_FIELDS = ["first_name", "last_name", "email", "passport_id", "call_phone_number"]
+
+
+def search_suggestions(query, limit=10):
+    """Candidates whose name, email, passport or phone starts with ``query``."""
+    condition = Q()
+    for field in SUGGESTION_FIELDS:
+        condition |= Q(**{f"{field}__istartswith": query})
+    return (
+        Candidate.objects.filter(condition)
+        .only("first_name", "second_name", "third_name", "last_name", "email")
+        .order_by("first_name", "second_name", "last_name", "pk")[:limit]
+    )
@@ -0,0 +1,120 @@
+# candidates/s3.py
+import asyncio
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+import boto3
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+
+# Size of the chunks read from S3 and written to the client.
+S3_CHUNK_SIZE = 64 * 1024
+# The most keys one DeleteObjects request accepts.
+S3_DELETE_BATCH_SIZE = 1000
+
+# boto3 is blocking; under ASGI every S3 call runs on this pool so that
+# transfers neither hold up the event loop nor use the threads that serve
+# sync views. Its size caps the number of concurrent S3 reads.
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "S3_IO_THREADS", 16), thread_name_prefix="s3-io"
+)
+
+
+@lru_cache(maxsize=None)
+def s3_client():
+    """Shared client; boto3 clients are thread-safe and costly to create."""
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+    )
+
+
+def object_key_from_url(file_url):
+    """Bucket key of a (URL-encoded) S3 file URL, as sent by the document preview."""
+    file_url = urllib.parse.unquote(file_url)
+    bucket_url = f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/"
+    return file_url.replace(bucket_url, "").lstrip("/")
+
+
+def iter_object(key, chunk_size=S3_CHUNK_SIZE):
+    """Chunks of an S3 object; the GET is only sent once iteration starts."""
+    response = s3_client().get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    yield from response["Body"].iter_chunks(chunk_size)
+
+
+def iter_objects(prefix):
+    """
+    The objects under ``prefix`` (dicts with Key, Size and LastModified),
+    listed one page of 1,000 at a time as the iterator is consumed.
+    """
+    paginator = s3_client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Prefix=prefix):
+        yield from page.get("Contents", [])
+
+
+def list_keys(prefix):
+    """Keys of the files under ``prefix`` (directory markers excluded)."""
+    return [obj["Key"] for obj in iter_objects(prefix) if not obj["Key"].endswith("/")]
+
+
+def copy_key(source, target):
+    """Server-side copy of ``source`` to ``target`` (objects up to 5 GB)."""
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    s3_client().copy_object(
+        Bucket=bucket, Key=target, CopySource={"Bucket": bucket, "Key": source}
+    )
+
+
+def head_key(key):
+    return s3_client().head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+
+
+def delete_keys(keys):
+    """
+    Delete up to S3_DELETE_BATCH_SIZE keys with one DeleteObjects call.
+    Returns the keys S3 reported as errors, with their messages.
+    """
+    if len(keys) > S3_DELETE_BATCH_SIZE:
+        raise ValueError(f"At most {S3_DELETE_BATCH_SIZE} keys per DeleteObjects call.")
+    if not keys:
+        return {}
+    response = s3_client().delete_objects(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+    )
+    return {error["Key"]: error.get("Message", "") for error in response.get("Errors", [])}
+
+
+async def run_blocking(func, *args):
+    """Run a blocking S3 call on the S3 thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+async def _aiter_blocking(iterator, pull):
+    iterator = iter(iterator)
+    done = object()
+    while (chunk := await pull(iterator, done)) is not done:
+        yield chunk
+
+
+def streaming_content(request, iterator, database=False):
+    """
+    Body for a StreamingHttpResponse fed by a blocking iterator.
+
+    Under ASGI each chunk is pulled on the S3 thread pool so the event loop
+    keeps serving other requests; with ``database``, in the request's sync
+    thread instead, which owns the connection (and server-side cursor) the
+    iterator reads from. Under WSGI the iterator is returned as is: Django
+    would read an async iterator into memory before sending it, as it does
+    with a sync iterator under ASGI.
+    """
+    if isinstance(request, ASGIRequest):
+        if database:
+            pull = sync_to_async(next, thread_sensitive=True)
+        else:
+            pull = partial(run_blocking, next)
+        return _aiter_blocking(iterator, pull)
+    return iterator
@@ -0,0 +1,285 @@
+# candidates/seeding.py
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from faker import Faker
+
+from utilities.lookups import invalidate_lookup
+from utilities.models import (
+    Country,
+    DegreeChoices,
+    Department,
+    EducationGradeChoices,
+    FieldOfStudy,
+    Institution,
+    LanguageChoices,
+    LicenseProvider,
+    Nationality,
+)
+
+from .models import (
+    APPLICATION_DATA_EXPIRY_FIELDS,
+    Candidate,
+    CandidateApplicationData,
+    Education,
+    Experience,
+    Language,
+    License,
+)
+
+SEED_BATCH_SIZE = 5000
+SEED_EMAIL_DOMAIN = "seed.example.com"
+
+COUNTRIES = {
+    "JO": "Jordan",
+    "EG": "Egypt",
+    "PH": "Philippines",
+    "IN": "India",
+    "QA": "Qatar",
+    "SA": "Saudi Arabia",
+    "AE": "United Arab Emirates",
+    "KE": "Kenya",
+}
+NATIONALITIES = ["Jordanian", "Egyptian", "Filipino", "Indian", "Kenyan", "Qatari"]
+DEGREES = ["Bachelor", "Master", "PhD", "Diploma"]
+FIELDS_OF_STUDY = ["Nursing", "Midwifery", "Pharmacy", "Radiology", "Laboratory", "Physiotherapy"]
+GRADES = ["Excellent", "Very Good", "Good", "Pass"]
+LANGUAGES = ["Arabic", "English", "Tagalog", "Hindi", "French"]
+DEPARTMENTS = {
+    "ICU": "Intensive Care Unit",
+    "ER": "Emergency",
+    "OR": "Operating Room",
+    "NICU": "Neonatal Intensive Care",
+    "CCU": "Coronary Care Unit",
+    "MED": "Medical Ward",
+    "SUR": "Surgical Ward",
+    "PED": "Pediatrics",
+    "OB": "Obstetrics",
+    "DIA": "Dialysis",
+}
+JOB_TITLES = ["Staff Nurse", "Charge Nurse", "Nurse Specialist", "Head Nurse", "Midwife"]
+RESPONSIBILITIES = [
+    "Assess, plan and document patient care",
+    "Administer medications and monitor their effects",
+    "Monitor vital signs and report changes to the physician",
+    "Educate patients and families on discharge plans",
+    "Supervise and mentor junior nursing staff",
+    "Maintain infection control standards",
+]
+# Names drawn from a pre-generated pool: calling Faker for every field of
+# a million rows costs more than the inserts.
+NAME_POOL_SIZE = 2000
+
+
+@dataclass
+class SeedReport:
+    candidates: int = 0
+    educations: int = 0
+    experiences: int = 0
+    licenses: int = 0
+    languages: int = 0
+    application_data: int = 0
+
+
+def seed_lookups():
+    """Create the utilities lookup rows the seeded candidates point at (idempotent)."""
+    countries = [
+        Country.objects.get_or_create(code=code, defaults={"name": name})[0]
+        for code, name in COUNTRIES.items()
+    ]
+    institutions = list(Institution.objects.filter(institution__startswith="Seed "))
+    if not institutions:
+        institutions = Institution.objects.bulk_create(
+            Institution(
+                institution=f"Seed University of {country.name}",
+                type="University",
+                abbreviation=f"SU{country.code}",
+                country=country,
+            )
+            for country in countries
+        )
+        # bulk_create sends no post_save, so refresh the registry by hand.
+        invalidate_lookup(Institution)
+    return {
+        "countries": countries,
+        "nationalities": [
+            Nationality.objects.get_or_create(nationality_name=name)[0] for name in NATIONALITIES
+        ],
+        "degrees": [DegreeChoices.objects.get_or_create(degree=name)[0] for name in DEGREES],
+        "fields_of_study": [
+            FieldOfStudy.objects.get_or_create(field_of_study=name)[0] for name in FIELDS_OF_STUDY
+        ],
+        "grades": [EducationGradeChoices.objects.get_or_create(grade=name)[0] for name in GRADES],
+        "languages": [
+            LanguageChoices.objects.get_or_create(language=name)[0] for name in LANGUAGES
+        ],
+        "departments": [
+            Department.objects.get_or_create(title=title, defaults={"abbreviation": abbreviation})[0]
+            for abbreviation, title in DEPARTMENTS.items()
+        ],
+        "license_providers": [
+            LicenseProvider.objects.get_or_create(
+                name=f"{country.name} Nursing Council", defaults={"country": country}
+            )[0]
+            for country in countries
+        ],
+        "institutions": institutions,
+        "users": list(get_user_model().objects.filter(is_active=True)[:20]),
+    }
+
+
+def seeded_candidates_count():
+    return Candidate.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").count()
+
+
+class ScaleSeeder:
+    """
+    Insert synthetic candidates with realistic related rows, ``batch_size``
+    candidates per transaction, using bulk_create only (no model signals,
+    history rows or match refreshes; run recompute_matches afterwards).
+    """
+
+    def __init__(self, batch_size=SEED_BATCH_SIZE, seed=0, progress=None):
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.progress = progress
+        faker = Faker()
+        faker.seed_instance(seed)
+        self.first_names = [faker.first_name() for _ in range(NAME_POOL_SIZE)]
+        self.last_names = [faker.last_name() for _ in range(NAME_POOL_SIZE)]
+        self.companies = [f"{faker.last_name()} Hospital" for _ in range(NAME_POOL_SIZE // 4)]
+        self.today = date.today()
+
+    def run(self, count, start=None, lookups=None):
+        """
+        Seed ``count`` candidates numbered from ``start`` (by default after
+        the ones earlier runs created, so emails stay unique).
+        """
+        lookups = lookups or seed_lookups()
+        if start is None:
+            start = seeded_candidates_count()
+        report = SeedReport()
+        for offset in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - offset)
+            with transaction.atomic():
+                self.seed_batch(start + offset, size, lookups, report)
+            if self.progress:
+                self.progress(report)
+        return report
+
+    def seed_batch(self, start, size, lookups, report):
+        rng = self.random
+        candidates = Candidate.objects.bulk_create(
+            self.candidate(start + i, lookups) for i in range(size)
+        )
+        educations, experiences, licenses, languages, application_data = [], [], [], [], []
+        for candidate in candidates:
+            graduation = candidate.birthday + timedelta(days=365 * rng.randint(21, 25))
+            for _ in range(rng.choices([1, 2, 3], weights=[70, 25, 5])[0]):
+                start_date = graduation - timedelta(days=4 * 365)
+                educations.append(
+                    Education(
+                        candidate=candidate,
+                        institution=rng.choice(lookups["institutions"]),
+                        degree=rng.choices(lookups["degrees"], weights=[70, 15, 2, 13])[0],
+                        field_of_study=rng.choice(lookups["fields_of_study"]),
+                        grade=rng.choice(lookups["grades"]),
+                        gpa=round(rng.uniform(2.0, 4.0), 2),
+                        start_date=start_date,
+                        end_date=graduation,
+                    )
+                )
+                graduation += timedelta(days=2 * 365)
+            job_start = graduation + timedelta(days=rng.randint(30, 365))
+            while job_start < self.today and rng.random() < 0.8:
+                end_date = job_start + timedelta(days=rng.randint(180, 6 * 365))
+                experiences.append(
+                    Experience(
+                        candidate=candidate,
+                        company_name=rng.choice(self.companies),
+                        company_location=rng.choice(lookups["countries"]).code,
+                        job_title=rng.choice(JOB_TITLES),
+                        reference_name=f"{rng.choice(self.first_names)} {rng.choice(self.last_names)}",
+                        reference_job_title="Head Nurse",
+                        job_responsibilities="<ul>%s</ul>"
+                        % "".join(
+                            f"<li>{item}</li>"
+                            for item in rng.sample(RESPONSIBILITIES, rng.randint(2, 4))
+                        ),
+                        start_date=job_start,
+                        end_date=end_date if end_date < self.today else None,
+                    )
+                )
+                job_start = end_date + timedelta(days=rng.randint(0, 120))
+            for provider in rng.sample(lookups["license_providers"], rng.randint(0, 2)):
+                issued = self.today - timedelta(days=rng.randint(30, 10 * 365))
+                licenses.append(
+                    License(
+                        candidate=candidate,
+                        license_name="Registered Nurse",
+                        license_number=f"RN-{candidate.pk}-{provider.pk}",
+                        license_provider=provider,
+                        issued_date=issued,
+                        expiry_date=issued + timedelta(days=rng.choice([365, 2 * 365, 3 * 365])),
+                    )
+                )
+            for language in rng.sample(lookups["languages"], rng.randint(1, 3)):
+                languages.append(Language(candidate=candidate, language=language))
+            if rng.random() < 0.4:
+                application_data.append(self.application_data(candidate, lookups))
+
+        Education.objects.bulk_create(educations)
+        experiences = Experience.objects.bulk_create(experiences)
+        Experience.departments.through.objects.bulk_create(
+            Experience.departments.through(experience=experience, department=department)
+            for experience in experiences
+            for department in rng.sample(lookups["departments"], rng.randint(1, 2))
+        )
+        License.objects.bulk_create(licenses)
+        Language.objects.bulk_create(languages)
+        CandidateApplicationData.objects.bulk_create(application_data)
+
+        report.candidates += len(candidates)
+        report.educations += len(educations)
+        report.experiences += len(experiences)
+        report.licenses += len(licenses)
+        report.languages += len(languages)
+        report.application_data += len(application_data)
+
+    def candidate(self, number, lookups):
+        rng = self.random
+        nationality = rng.choice(lookups["nationalities"])
+        return Candidate(
+            email=f"candidate{number}@{SEED_EMAIL_DOMAIN}",
+            is_open_to_work=rng.choices(["Yes", "NO"], weights=[85, 15])[0],
+            first_name=rng.choice(self.first_names),
+            second_name=rng.choice(self.first_names),
+            third_name=rng.choice(self.first_names),
+            last_name=rng.choice(self.last_names),
+            gender=rng.choices(["F", "M"], weights=[75, 25])[0],
+            birthday=self.today - timedelta(days=rng.randint(22 * 365, 55 * 365)),
+            nationality=nationality,
+            country=rng.choice(lookups["countries"]),
+            call_phone_number=f"+9627{rng.randint(0, 99999999):08d}",
+            whatsapp_phone_number=f"+9627{rng.randint(0, 99999999):08d}",
+            national_id_number=f"{rng.randint(0, 9999999999):010d}",
+            passport_id=f"P{number:08d}",
+            passport_expiration_date=self.today + timedelta(days=rng.randint(-180, 10 * 365)),
+        )
+
+    def application_data(self, candidate, lookups):
+        rng = self.random
+        data = CandidateApplicationData(
+            candidate=candidate,
+            follow_up_assigned_to=rng.choice(lookups["users"]) if lookups["users"] else None,
+            DataFlow_is_paid=rng.random() < 0.8,
+            Prometric_status=rng.choice(["undertaken", "pass", "fail", None]),
+            is_candidate_start_work=rng.random() < 0.1,
+        )
+        for field in APPLICATION_DATA_EXPIRY_FIELDS:
+            if rng.random() < 0.5:
+                setattr(data, field, self.today + timedelta(days=rng.randint(-30, 2 * 365)))
+        return data
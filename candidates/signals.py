@@ -0,0 +1,23 @@
+# candidates/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .models import CandidateApplicationData
+from .pipeline import invalidate_pipeline_counts
+from .storage_gc import file_models
+from .storage_usage import capture_uploads, forget_stored_files, record_stored_files
+from .upload_processing import process_uploads
+
+# Sent once per committed import batch with ``candidate_ids``: bulk inserts
+# bypass the post_save signals of the created rows.
+candidates_imported = Signal()
+
+receiver(post_save, sender=CandidateApplicationData)(invalidate_pipeline_counts)
+receiver(post_delete, sender=CandidateApplicationData)(invalidate_pipeline_counts)
+
+# process_uploads first: capture_uploads records the processed files.
+for model in file_models():
+    receiver(pre_save, sender=model)(process_uploads)
+    receiver(pre_save, sender=model)(capture_uploads)
+    receiver(post_save, sender=model)(record_stored_files)
+    receiver(post_delete, sender=model)(forget_stored_files)
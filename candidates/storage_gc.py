@@ -0,0 +1,176 @@
+# candidates/storage_gc.py
+import csv
+import datetime
+import os
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.utils import timezone
+
+from utilities.files import file_fields
+from utilities.models import StoredBlob
+from utilities.storage import is_blob_key
+
+from .models import Candidate, get_candidate_directory
+from .s3 import S3_DELETE_BATCH_SIZE, delete_keys, iter_objects
+
+# Every candidate upload is stored under this prefix (get_candidate_directory).
+CANDIDATE_FILES_PREFIX = "candidates/"
+# Objects younger than this are never collected: their upload may not be
+# committed to the database yet.
+GC_MIN_AGE = datetime.timedelta(hours=24)
+REFERENCE_CHUNK_SIZE = 2000
+
+
+def file_models():
+    """The candidates models that have file fields."""
+    return [model for model in apps.get_app_config("candidates").get_models() if file_fields(model)]
+
+
+def file_instances(candidates):
+    """
+    (record, candidate) pairs of the candidates and of their related
+    records with file fields, loading only the file fields.
+    """
+    instances = [(candidate, candidate) for candidate in candidates]
+    by_id = {candidate.pk: candidate for candidate in candidates}
+    for model in file_models():
+        if model is Candidate:
+            continue
+        related = (
+            model._default_manager.filter(candidate__in=candidates)
+            .order_by("pk")
+            .only("pk", "candidate_id", *file_fields(model))
+        )
+        instances.extend((instance, by_id[instance.candidate_id]) for instance in related)
+    return instances
+
+
+def candidate_files(candidate):
+    """
+    (archive name, storage key) of each of the candidate's stored files.
+    Files under the candidate's directory keep their path in it; shared
+    blobs are named after their record and field.
+    """
+    directory = get_candidate_directory(candidate) + "/"
+    files = []
+    for instance, _ in file_instances([candidate]):
+        for name in file_fields(type(instance)):
+            key = getattr(instance, name).name
+            if not key:
+                continue
+            if key.startswith(directory):
+                files.append((key[len(directory):], key))
+                continue
+            archive_name = name + os.path.splitext(key)[1]
+            if instance is not candidate:
+                archive_name = f"{instance._meta.model_name}_{instance.pk}/{archive_name}"
+            files.append((archive_name, key))
+    return files
+
+
+def referenced_keys(chunk_size=REFERENCE_CHUNK_SIZE):
+    """
+    The storage names of every file field value of the candidates models,
+    read with server-side cursors so only the set is held in memory.
+    """
+    keys = set()
+    for model in file_models():
+        names = list(file_fields(model))
+        rows = model._default_manager.values_list(*names).iterator(chunk_size=chunk_size)
+        for row in rows:
+            keys.update(name for name in row if name)
+    return keys
+
+
+def blob_keys(keys=None):
+    """
+    Keys of the shared blobs (utilities/storage.py) that have a StoredBlob
+    row, of all of them or of ``keys``. A blob with a row can get a new
+    reference at any time, whatever its age; only rowless blobs are orphans.
+    """
+    blobs = StoredBlob.objects.all()
+    if keys is not None:
+        blobs = blobs.filter(key__in=[key for key in keys if is_blob_key(key)])
+    return set(blobs.values_list("key", flat=True))
+
+
+@dataclass
+class Orphan:
+    key: str
+    size: int
+    last_modified: datetime.datetime
+
+
+@dataclass
+class GCReport:
+    listed: int = 0
+    referenced: int = 0
+    skipped_recent: int = 0
+    orphans: list = field(default_factory=list)
+    deleted: int = 0
+    delete_calls: int = 0
+    errors: dict = field(default_factory=dict)
+
+    @property
+    def orphan_bytes(self):
+        return sum(orphan.size for orphan in self.orphans)
+
+    def write_orphans(self, stream):
+        writer = csv.writer(stream)
+        writer.writerow(["key", "size", "last_modified"])
+        for orphan in self.orphans:
+            writer.writerow([orphan.key, orphan.size, orphan.last_modified.isoformat()])
+
+
+def collect_orphans(
+    prefix=CANDIDATE_FILES_PREFIX,
+    dry_run=False,
+    min_age=GC_MIN_AGE,
+    batch_size=S3_DELETE_BATCH_SIZE,
+    progress=None,
+):
+    """
+    Stream the bucket listing under ``prefix`` and delete the objects no
+    candidate file field or StoredBlob row refers to, ``batch_size`` keys
+    per DeleteObjects call. With ``dry_run`` only the report is built.
+    """
+    report = GCReport()
+    keys = referenced_keys() | blob_keys()
+    report.referenced = len(keys)
+    cutoff = timezone.now() - min_age
+    batch = []
+
+    def flush():
+        # Blobs uploaded again since the rows were read are kept.
+        revived = blob_keys(batch)
+        if revived:
+            batch[:] = [key for key in batch if key not in revived]
+            report.orphans = [orphan for orphan in report.orphans if orphan.key not in revived]
+            report.skipped_recent += len(revived)
+        if batch:
+            report.errors.update(delete_keys(batch))
+            report.deleted += len(batch) - sum(key in report.errors for key in batch)
+            report.delete_calls += 1
+        batch.clear()
+        if progress:
+            progress(report)
+
+    for obj in iter_objects(prefix):
+        key = obj["Key"]
+        if key.endswith("/"):
+            continue
+        report.listed += 1
+        if key in keys:
+            continue
+        if obj["LastModified"] > cutoff:
+            report.skipped_recent += 1
+            continue
+        report.orphans.append(Orphan(key, obj["Size"], obj["LastModified"]))
+        if not dry_run:
+            batch.append(key)
+            if len(batch) >= batch_size:
+                flush()
+    if batch:
+        flush()
+    return report
@@ -0,0 +1,179 @@
+# candidates/storage_migration.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.db import transaction
+
+from utilities.files import file_fields
+from utilities.storage import is_blob_key
+
+from .models import Candidate, get_candidate_directory
+from .s3 import S3_DELETE_BATCH_SIZE, copy_key, delete_keys, head_key
+from .storage_gc import file_instances
+
+STORAGE_MIGRATION_BATCH_SIZE = 200
+STORAGE_MIGRATION_WORKERS = 8
+
+
+def target_key(directory, key):
+    """
+    Key of ``key`` under ``directory``. The path below the old
+    ``candidates/<name>_<pk>/`` directory is kept; keys stored elsewhere
+    keep their file name only.
+    """
+    parts = key.split("/")
+    rest = parts[2:] if parts[0] == "candidates" and len(parts) > 2 else parts[-1:]
+    return "/".join([directory, *rest])
+
+
+@dataclass
+class Move:
+    instance: object
+    field_name: str
+    source: str
+    target: str
+    error: str = ""
+
+
+@dataclass
+class StorageMigrationReport:
+    candidates: int = 0
+    planned: int = 0
+    moved: int = 0
+    deleted: int = 0
+    last_candidate_id: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, key, message):
+        self.errors.append((key, message))
+
+
+def copy_and_verify(move):
+    """
+    Copy the object to its new key and check the copy has the source's
+    size (and ETag, which a copy keeps unless the source was a multipart
+    upload). Sets ``move.error`` instead of raising.
+    """
+    try:
+        copy_key(move.source, move.target)
+        source, target = head_key(move.source), head_key(move.target)
+    except (BotoCoreError, ClientError) as e:
+        move.error = str(e)
+        return move
+    if source["ContentLength"] != target["ContentLength"]:
+        move.error = "size of the copy differs"
+    elif "-" not in source["ETag"] and source["ETag"] != target["ETag"]:
+        move.error = "ETag of the copy differs"
+    return move
+
+
+class CandidateStorageMigrator:
+    """
+    Move the files of candidates, in pk order and ``batch_size`` candidates
+    at a time, to keys under their storage_id directory. Per batch the
+    objects are copied server-side on ``workers`` threads and verified, the
+    file fields still holding the copied keys are switched to the new ones,
+    and only then are those old keys deleted.
+
+    Files already under the new directory, and content-addressed blobs
+    (utilities/storage.py), are skipped, so an interrupted
+    run can simply be restarted (``after_id`` skips the batches a previous
+    run reported as done). Historical records keep the old keys.
+    """
+
+    def __init__(
+        self,
+        batch_size=STORAGE_MIGRATION_BATCH_SIZE,
+        workers=STORAGE_MIGRATION_WORKERS,
+        dry_run=False,
+        progress=None,
+    ):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.dry_run = dry_run
+        self.progress = progress
+        self.report = StorageMigrationReport()
+
+    def run(self, after_id=0):
+        candidate_fields = list(file_fields(Candidate))
+        candidates = Candidate.objects.order_by("pk").only("pk", "storage_id", *candidate_fields)
+        self.report.last_candidate_id = after_id
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="s3-move") as pool:
+            while True:
+                batch = candidates.filter(pk__gt=self.report.last_candidate_id)
+                batch = list(batch[: self.batch_size])
+                if not batch:
+                    break
+                self._migrate_batch(batch, pool)
+                self.report.candidates += len(batch)
+                self.report.last_candidate_id = batch[-1].pk
+                if self.progress:
+                    self.progress(self.report)
+        return self.report
+
+    def _plan(self, candidates):
+        instances = file_instances(candidates)
+        # Keys the batch already uses under the new directories; a move
+        # must not overwrite them.
+        taken = set()
+        pending = []
+        for instance, candidate in instances:
+            directory = get_candidate_directory(candidate)
+            for name in file_fields(type(instance)):
+                key = getattr(instance, name).name
+                if not key or is_blob_key(key):
+                    # Shared blobs belong to no candidate's directory.
+                    continue
+                if key.startswith(directory + "/"):
+                    taken.add(key)
+                else:
+                    pending.append((instance, name, key, directory))
+
+        moves = []
+        for instance, name, key, directory in pending:
+            target = target_key(directory, key)
+            if target in taken:
+                root, ext = os.path.splitext(target)
+                target = f"{root}_{instance._meta.model_name}{instance.pk}{ext}"
+            taken.add(target)
+            moves.append(Move(instance, name, key, target))
+        return moves
+
+    def _migrate_batch(self, candidates, pool):
+        moves = self._plan(candidates)
+        self.report.planned += len(moves)
+        if self.dry_run or not moves:
+            return
+
+        moved = []
+        for move in pool.map(copy_and_verify, moves):
+            if move.error:
+                self.report.add_error(move.source, move.error)
+            else:
+                moved.append(move)
+
+        # Each field is only switched if it still holds the key that was
+        # copied: a file uploaded or cleared meanwhile must not be replaced
+        # by the copy of the old one (the unused copy is left to storage_gc).
+        switched = []
+        with transaction.atomic():
+            for move in moved:
+                model = type(move.instance)
+                updated = model._default_manager.filter(
+                    pk=move.instance.pk, **{move.field_name: move.source}
+                ).update(**{move.field_name: move.target})
+                if updated:
+                    switched.append(move)
+                else:
+                    self.report.add_error(move.source, "file changed during the move; skipped")
+        self.report.moved += len(switched)
+
+        sources = [move.source for move in switched]
+        for i in range(0, len(sources), S3_DELETE_BATCH_SIZE):
+            chunk = sources[i:i + S3_DELETE_BATCH_SIZE]
+            errors = delete_keys(chunk)
+            for key, message in errors.items():
+                self.report.add_error(key, f"old key not deleted: {message}")
+            self.report.deleted += len(chunk) - len(errors)
@@ -0,0 +1,256 @@
+# candidates/storage_usage.py
+import mimetypes
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from utilities.files import file_fields
+from utilities.models import StoredBlob
+from utilities.storage import is_blob_key
+
+from .models import Candidate, StoredFile
+from .s3 import iter_objects
+from .storage_gc import CANDIDATE_FILES_PREFIX, file_models
+
+# Prefixes of the objects the file fields refer to.
+USAGE_PREFIXES = [CANDIDATE_FILES_PREFIX, "blobs/"]
+RECONCILE_BATCH_SIZE = 1000
+# Rows of the admin report's per-job and per-candidate tables.
+USAGE_REPORT_LIMIT = 20
+
+_UPDATED_FIELDS = [
+    "candidate",
+    "key",
+    "size",
+    "original_size",
+    "content_type",
+    "updated_at",
+]
+
+
+def guess_content_type(key):
+    return mimetypes.guess_type(key)[0] or ""
+
+
+def _candidate_id(instance):
+    return instance.pk if isinstance(instance, Candidate) else instance.candidate_id
+
+
+def _upsert(rows):
+    StoredFile.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["model", "object_id", "field_name"],
+        update_fields=_UPDATED_FIELDS,
+    )
+
+
+def capture_uploads(sender, instance, raw=False, **kwargs):
+    """
+    pre_save: note the size and content type of the files being uploaded;
+    once saved, the field only holds the new storage name.
+    """
+    if raw:
+        return
+    uploads = {}
+    for name in file_fields(sender):
+        field_file = getattr(instance, name)
+        if field_file and not field_file._committed:
+            upload = field_file.file
+            uploads[name] = (
+                upload.size,
+                getattr(upload, "content_type", None),
+                # Set by upload_processing on the files it recompressed.
+                getattr(upload, "original_size", None),
+            )
+    if uploads:
+        instance._stored_file_uploads = uploads
+
+
+def record_stored_files(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    post_save: record the file fields whose key changed. The size and type
+    come from the upload, or from the shared blob's row; nothing is read
+    from S3 (unknown sizes are filled in by reconcile_storage_usage).
+    """
+    uploads = instance.__dict__.pop("_stored_file_uploads", {})
+    if raw:
+        return
+    names = list(file_fields(sender))
+    if update_fields is not None:
+        names = [name for name in names if name in update_fields]
+    model = sender._meta.model_name
+    rows = StoredFile.objects.filter(model=model, object_id=instance.pk)
+    present = [name for name in names if getattr(instance, name)]
+    if not present:
+        if names:
+            rows.filter(field_name__in=names).delete()
+        return
+
+    existing = dict(rows.filter(field_name__in=names).values_list("field_name", "key"))
+    changed = []
+    for name in present:
+        key = getattr(instance, name).name
+        if existing.get(name) == key:
+            continue
+        size, content_type, original_size = uploads.get(name, (None, None, None))
+        changed.append(
+            StoredFile(
+                candidate_id=_candidate_id(instance),
+                model=model,
+                object_id=instance.pk,
+                field_name=name,
+                key=key,
+                size=size,
+                original_size=original_size,
+                content_type=content_type or guess_content_type(key),
+            )
+        )
+    unknown = {row.key: row for row in changed if row.size is None and is_blob_key(row.key)}
+    if unknown:
+        for key, size in StoredBlob.objects.filter(key__in=unknown).values_list("key", "size"):
+            unknown[key].size = size
+    if changed:
+        _upsert(changed)
+    cleared = [name for name in existing if name not in present]
+    if cleared:
+        rows.filter(field_name__in=cleared).delete()
+
+
+def forget_stored_files(sender, instance, **kwargs):
+    """post_delete: the record's files no longer count."""
+    StoredFile.objects.filter(model=sender._meta.model_name, object_id=instance.pk).delete()
+
+
+def document_labels():
+    """{(model name, field name): verbose name} of every candidate file field."""
+    return {
+        (model._meta.model_name, name): str(field.verbose_name)
+        for model in file_models()
+        for name, field in file_fields(model).items()
+    }
+
+
+def _by_document(queryset):
+    labels = document_labels()
+    rows = queryset.values("model", "field_name").annotate(files=Count("pk"), size=Sum("size"))
+    return sorted(
+        (
+            {
+                "document": labels.get((row["model"], row["field_name"]), row["field_name"]),
+                "files": row["files"],
+                "size": row["size"] or 0,
+            }
+            for row in rows
+        ),
+        key=lambda row: -row["size"],
+    )
+
+
+def candidate_usage(candidate):
+    """
+    The candidate's files and bytes in total and per document, in one
+    query. Files shared with others (utilities/storage.py) count fully.
+    """
+    documents = _by_document(StoredFile.objects.filter(candidate=candidate))
+    return {
+        "files": sum(row["files"] for row in documents),
+        "size": sum(row["size"] for row in documents),
+        "documents": documents,
+    }
+
+
+def usage_report(limit=USAGE_REPORT_LIMIT):
+    """Totals, usage per document type, and the largest jobs and candidates."""
+    files = StoredFile.objects.all()
+    return {
+        "totals": files.aggregate(
+            files=Count("pk"),
+            size=Sum("size", default=0),
+            candidates=Count("candidate", distinct=True),
+        ),
+        "unknown_sizes": files.filter(size__isnull=True).count(),
+        "processed": files.filter(original_size__isnull=False).aggregate(
+            files=Count("pk"),
+            original_size=Sum("original_size", default=0),
+            size=Sum("size", default=0),
+        ),
+        "documents": _by_document(files),
+        "jobs": list(
+            files.filter(candidate__job_opportunities__isnull=False)
+            .values("candidate__job_opportunities", "candidate__job_opportunities__job_title")
+            .annotate(
+                candidates=Count("candidate", distinct=True),
+                files=Count("pk"),
+                size=Sum("size", default=0),
+            )
+            .order_by("-size")[:limit]
+        ),
+        "candidates": list(
+            files.values("candidate", "candidate__first_name", "candidate__last_name")
+            .annotate(files=Count("pk"), size=Sum("size", default=0))
+            .order_by("-size")[:limit]
+        ),
+    }
+
+
+def reconcile_stored_files(batch_size=RECONCILE_BATCH_SIZE, progress=None):
+    """
+    Rebuild the StoredFile rows from the file fields and a listing of the
+    bucket (1,000 keys per request, sizes held in memory): sizes are set
+    from the listing, content types kept or guessed from the key, and rows
+    of files that are gone are deleted. Returns (rows, keys missing from
+    the bucket).
+    """
+    started = timezone.now()
+    sizes = {
+        obj["Key"]: obj["Size"] for prefix in USAGE_PREFIXES for obj in iter_objects(prefix)
+    }
+    total = missing = 0
+    for model in file_models():
+        names = list(file_fields(model))
+        candidate_column = "pk" if model is Candidate else "candidate_id"
+        rows = model._default_manager.values_list("pk", candidate_column, *names)
+        batch = []
+        for pk, candidate_id, *keys in rows.iterator(chunk_size=batch_size):
+            for name, key in zip(names, keys):
+                if not key:
+                    continue
+                missing += key not in sizes
+                batch.append(
+                    StoredFile(
+                        candidate_id=candidate_id,
+                        model=model._meta.model_name,
+                        object_id=pk,
+                        field_name=name,
+                        key=key,
+                        size=sizes.get(key),
+                    )
+                )
+            if len(batch) >= batch_size:
+                total += _reconcile_batch(batch)
+                batch = []
+                if progress:
+                    progress(total)
+        total += _reconcile_batch(batch)
+    StoredFile.objects.filter(updated_at__lt=started).delete()
+    return total, missing
+
+
+def _reconcile_batch(batch):
+    if not batch:
+        return 0
+    # Unchanged keys keep their recorded content type and original size.
+    recorded = {
+        (object_id, field_name, key): (content_type, original_size)
+        for object_id, field_name, key, content_type, original_size in StoredFile.objects.filter(
+            model=batch[0].model, object_id__in={row.object_id for row in batch}
+        ).values_list("object_id", "field_name", "key", "content_type", "original_size")
+    }
+    for row in batch:
+        content_type, row.original_size = recorded.get(
+            (row.object_id, row.field_name, row.key), ("", None)
+        )
+        row.content_type = content_type or guess_content_type(row.key)
+    _upsert(batch)
+    return len(batch)
@@ -0,0 +1,26 @@
+# candidates/tasks.py
+from django.urls import reverse
+
+from background_tasks.registry import set_progress, task
+
+from .exporters import delete_old_exports, export_queryset, export_to_storage
+
+
+@task(name="candidates.export_candidates", max_attempts=2)
+def export_candidates(params, export_format):
+    """Write an XLSX/Parquet candidate export to storage."""
+    candidates = export_queryset(params)
+    total = candidates.count() or 1
+
+    def progress(rows_done):
+        set_progress(rows_done * 100 // total, f"{rows_done} of {total} candidates exported")
+
+    name = export_to_storage(candidates, export_format, progress=progress)
+    remove_old_exports.enqueue_once()
+    return {"name": name, "url": reverse("candidates:export_download", args=[name])}
+
+
+@task(name="candidates.delete_old_exports")
+def remove_old_exports():
+    """Delete the exports older than EXPORT_RETENTION_DAYS."""
+    return delete_old_exports()
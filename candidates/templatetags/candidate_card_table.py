@@ -7,6 +7,10 @@ register = template.Library()
 
 
 @register.inclusion_tag("candidates/includes/candidate_card_table.html")
-def candidate_card_table(candidate_id):
-    candidate = get_object_or_404(Candidate, id=candidate_id)
+def candidate_card_table(candidate):
+    # Accepts the candidate or its pk; the page already has the candidate.
+    if not isinstance(candidate, Candidate):
+        candidate = get_object_or_404(
+            Candidate.objects.select_related("nationality", "country"), id=candidate
+        )
     return {"candidate": candidate}
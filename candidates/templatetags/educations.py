@@ -1,14 +1,16 @@
 from django import template
-from django.shortcuts import get_object_or_404
 
-from candidates.models import Candidate
+from candidates.models import Education
 
 register = template.Library()
 
 
 @register.inclusion_tag("candidates/includes/educations.html")
-def educations(candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-
-    _educations = candidate.educations.all().order_by("-start_date")
+def educations(candidate):
+    # Accepts the candidate or its pk; the page already has the candidate.
+    _educations = (
+        Education.objects.filter(candidate_id=getattr(candidate, "pk", candidate))
+        .select_related("institution__country", "degree", "field_of_study", "grade")
+        .order_by("-start_date")
+    )
     return {"educations": _educations}
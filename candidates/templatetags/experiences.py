@@ -1,13 +1,16 @@
 from django import template
-from django.shortcuts import get_object_or_404
 
-from candidates.models import Candidate
+from candidates.models import Experience
 
 register = template.Library()
 
 
 @register.inclusion_tag("candidates/includes/experiences.html")
-def experiences(candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    _experiences = candidate.experiences.all().order_by("-start_date")
+def experiences(candidate):
+    # Accepts the candidate or its pk; the page already has the candidate.
+    _experiences = (
+        Experience.objects.filter(candidate_id=getattr(candidate, "pk", candidate))
+        .prefetch_related("departments")
+        .order_by("-start_date")
+    )
     return {"experiences": _experiences}
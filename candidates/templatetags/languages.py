@@ -1,13 +1,14 @@
 from django import template
-from django.shortcuts import get_object_or_404
 
-from candidates.models import Candidate
+from candidates.models import Language
 
 register = template.Library()
 
 
 @register.inclusion_tag("candidates/includes/languages.html")
-def languages(candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    _languages = candidate.languages.all()
+def languages(candidate):
+    # Accepts the candidate or its pk; the page already has the candidate.
+    _languages = Language.objects.filter(
+        candidate_id=getattr(candidate, "pk", candidate)
+    ).select_related("language")
     return {"languages": _languages}
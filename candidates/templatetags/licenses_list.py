@@ -1,13 +1,16 @@
 from django import template
-from django.shortcuts import get_object_or_404
 
-from candidates.models import Candidate
+from candidates.models import License
 
 register = template.Library()
 
 
 @register.inclusion_tag("candidates/includes/licenses.html")
-def licenses(candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    _licenses = candidate.licenses.all().order_by("-issued_date")
+def licenses(candidate):
+    # Accepts the candidate or its pk; the page already has the candidate.
+    _licenses = (
+        License.objects.filter(candidate_id=getattr(candidate, "pk", candidate))
+        .select_related("license_provider__country")
+        .order_by("-issued_date")
+    )
     return {"licenses": _licenses}
@@ -1,14 +1,15 @@
 from django import template
-from django.shortcuts import get_object_or_404
 
-from candidates.models import Candidate
+from candidates.models import TrainingCourse
 
 register = template.Library()
 
 
 @register.inclusion_tag("candidates/includes/trainingcourse_list.html")
-def training_courses(candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    _training_courses = candidate.training_courses.all().order_by("-start_date")
+def training_courses(candidate):
+    # Accepts the candidate or its pk; the page already has the candidate.
+    _training_courses = TrainingCourse.objects.filter(
+        candidate_id=getattr(candidate, "pk", candidate)
+    ).order_by("-start_date")
 
     return {"training_courses": _training_courses}
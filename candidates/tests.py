@@ -1,3 +1,1214 @@
-from django.test import TestCase
+import csv
+import io
+import zipfile
+from datetime import date, timedelta
+from unittest import mock
+
+import factory.random
+import openpyxl
+import pyarrow.parquet
+from PIL import Image
+from moto import mock_aws
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import default_storage, storages
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from utilities.models import (
+    Country,
+    DegreeChoices,
+    Department,
+    FieldOfStudy,
+    LicenseProvider,
+    Nationality,
+    StoredBlob,
+)
+from background_tasks.models import Task
+from background_tasks.worker import claim_task, execute
+from jobs.factories import JobOpportunityFactory
+from utilities.testing import QueryBudgetMixin
+
+from . import s3
+from .expirations import ExpirationCursor, expiration_counts, upcoming_expirations
+from .exporters import EXPORT_HEADERS, delete_old_exports
+from .factories import (
+    CandidateApplicationDataFactory,
+    CandidateFactory,
+    EducationFactory,
+    FullCandidateFactory,
+    LicenseFactory,
+)
+
+from .models import (
+    APPLICATION_DATA_EXPIRY_FIELDS,
+    Candidate,
+    CandidateApplicationData,
+    Education,
+    Experience,
+    Language,
+    License,
+    StoredFile,
+    TrainingCourse,
+)
+from .importers import CandidateImporter
+from .pipeline import compute_pipeline_counts
+from .signals import candidates_imported
+from .storage_gc import collect_orphans
+from .storage_migration import CandidateStorageMigrator
+from .storage_usage import candidate_usage, reconcile_stored_files
+from .tasks import export_candidates, remove_old_exports
+
+
+class QueryIndexTests(TestCase):
+    """
+    The filters and sorts used by matching, the candidate list and the
+    expiry reports must be served by an index.
+
+    Sequential scans are disabled for the planner (they are only penalised,
+    not forbidden), so a plan that still contains one, or does not use the
+    expected index, means the index is missing or unusable.
+    """
+
+    CANDIDATES = 500
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        nationality = Nationality.objects.create(nationality_name="Jordanian")
+        country = Country.objects.create(code="JO", name="Jordan")
+        degrees = DegreeChoices.objects.bulk_create(
+            DegreeChoices(degree=f"Degree {i}") for i in range(5)
+        )
+        fields_of_study = FieldOfStudy.objects.bulk_create(
+            FieldOfStudy(field_of_study=f"Field {i}") for i in range(10)
+        )
+        cls.degree, cls.field_of_study = degrees[0], fields_of_study[0]
+        department = Department.objects.create(abbreviation="ICU", title="Intensive Care")
+        provider = LicenseProvider.objects.create(name="Nursing Council", country=country)
+
+        candidates = Candidate.objects.bulk_create(
+            Candidate(
+                email=f"candidate{i}@example.com",
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                gender="M" if i % 2 else "F",
+                birthday=today - timedelta(days=365 * 20 + i * 11),
+                nationality=nationality,
+                country=country,
+                is_open_to_work="Yes",
+                passport_expiration_date=today + timedelta(days=i) if i % 3 else None,
+            )
+            for i in range(cls.CANDIDATES)
+        )
+        Education.objects.bulk_create(
+            Education(
+                candidate=candidate,
+                degree=degrees[i % len(degrees)],
+                field_of_study=fields_of_study[i % len(fields_of_study)],
+                start_date=date(2010, 9, 1),
+                end_date=date(2014, 6, 1),
+            )
+            for i, candidate in enumerate(candidates)
+        )
+        experiences = Experience.objects.bulk_create(
+            Experience(
+                candidate=candidate,
+                company_name="Hospital",
+                company_location="JO",
+                job_title="Nurse",
+                start_date=date(2015, 1, 1) + timedelta(days=i),
+            )
+            for i, candidate in enumerate(candidates)
+        )
+        Experience.departments.through.objects.bulk_create(
+            Experience.departments.through(experience=experience, department=department)
+            for experience in experiences
+        )
+        License.objects.bulk_create(
+            License(
+                candidate=candidate,
+                license_name="RN",
+                license_number=f"RN-{i}",
+                license_provider=provider,
+                issued_date=date(2015, 1, 1),
+                expiry_date=today + timedelta(days=i) if i % 4 else None,
+            )
+            for i, candidate in enumerate(candidates)
+        )
+        CandidateApplicationData.objects.bulk_create(
+            CandidateApplicationData(
+                candidate=candidate,
+                **{
+                    field: today + timedelta(days=i) if i % 5 else None
+                    for field in APPLICATION_DATA_EXPIRY_FIELDS
+                },
+            )
+            for i, candidate in enumerate(candidates)
+        )
+        cls.candidate = candidates[0]
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        table = queryset.model._meta.db_table
+        self.assertNotIn(f"Seq Scan on {table}", plan, msg=plan)
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_matching_gender_and_age(self):
+        today = date.today()
+        self.assertUsesIndex(
+            Candidate.objects.filter(
+                gender="M",
+                birthday__range=(today - timedelta(days=365 * 30), today - timedelta(days=365 * 25)),
+            ),
+            "candidate_gender_birthday_idx",
+        )
+
+    def test_matching_degree_and_field_of_study(self):
+        educations = Education.objects.filter(
+            degree=self.degree, field_of_study=self.field_of_study
+        )
+        self.assertUsesIndex(
+            educations.order_by().values("candidate"), "education_degree_field_idx"
+        )
+
+    def test_candidate_experiences(self):
+        self.assertUsesIndex(
+            Experience.objects.filter(candidate=self.candidate).order_by("start_date"),
+            "experience_candidate_start_idx",
+        )
+
+    def test_candidate_list_sorts(self):
+        for ordering, index_name in [
+            (["-created_at"], "candidate_created_at_idx"),
+            (["updated_at"], "candidate_updated_at_idx"),
+            (["first_name", "second_name", "last_name"], "candidate_full_name_idx"),
+        ]:
+            with self.subTest(ordering=ordering):
+                self.assertUsesIndex(
+                    Candidate.objects.order_by(*ordering)[:20], index_name
+                )
+
+    def test_expiry_dates(self):
+        soon = date.today() + timedelta(days=30)
+        self.assertUsesIndex(
+            Candidate.objects.filter(passport_expiration_date__lte=soon),
+            "candidate_passport_expiry_idx",
+        )
+        self.assertUsesIndex(
+            License.objects.filter(expiry_date__lte=soon), "license_expiry_date_idx"
+        )
+        for field in APPLICATION_DATA_EXPIRY_FIELDS:
+            with self.subTest(field=field):
+                self.assertUsesIndex(
+                    CandidateApplicationData.objects.filter(**{f"{field}__lte": soon}),
+                    f"appdata_{field.split('_')[0].lower()}_expiry_idx",
+                )
+
+
+class ViewQueryCountTests(QueryBudgetMixin, TestCase):
+    """
+    Query budgets of the candidate pages. The budgets do not depend on the
+    number of candidates or related rows, so an N+1 query fails them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        factory.random.reseed_random("candidates")
+        cls.candidates = FullCandidateFactory.create_batch(15)
+        cls.user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_candidate_list(self):
+        for sort in ["created_at", "full_name", "nationality", "total_experience", "departments"]:
+            with self.subTest(sort=sort), self.assertMaxQueries(6):
+                response = self.client.get(
+                    reverse("candidates:candidate_list"), {"sort": sort, "per_page": 20}
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context["candidates"]), 15)
+
+    def test_candidate_detail(self):
+        url = reverse("candidates:candidate_detail", args=[self.candidates[0].pk])
+        # The compatible jobs box is computed on the first visit only.
+        with self.assertMaxQueries(18):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        # One of them sums the candidate's stored files.
+        with self.assertMaxQueries(10):
+            self.client.get(url)
+
+    def test_candidate_search_view(self):
+        candidate = self.candidates[0]
+        with self.assertMaxQueries(4):
+            response = self.client.get(
+                reverse("candidates:candidate_search"), {"query": candidate.email}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["candidates"]), [candidate])
+
+    def test_candidate_history(self):
+        candidate = self.candidates[0]
+        candidate.first_name = "Renamed"
+        candidate.save()
+        with self.assertMaxQueries(5):
+            response = self.client.get(reverse("candidates:candidate_history", args=[candidate.pk]))
+        self.assertContains(response, "Renamed")
+        self.assertEqual(
+            [version["action"] for version in response.context["versions"]], ["Changed", "Created"]
+        )
+
+
+class AdminChangelistQueryCountTests(QueryBudgetMixin, TestCase):
+    """Query budgets of the candidate admin changelists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        factory.random.reseed_random("candidates-admin")
+        cls.candidates = FullCandidateFactory.create_batch(15)
+        cls.user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_changelists(self):
+        for model in [
+            Candidate,
+            Education,
+            Experience,
+            Language,
+            License,
+            TrainingCourse,
+            CandidateApplicationData,
+        ]:
+            self.assertChangelistQueries(model, 6)
+
+    def test_full_name_is_sorted_in_the_database(self):
+        response = self.client.get(reverse("admin:candidates_candidate_changelist"), {"o": "1"})
+        self.assertEqual(
+            [candidate.first_name for candidate in response.context["cl"].result_list],
+            sorted(candidate.first_name for candidate in self.candidates),
+        )
+
+    def test_substring_search(self):
+        candidate = self.candidates[0]
+        response = self.client.get(
+            reverse("admin:candidates_candidate_changelist"), {"q": candidate.email[2:8].upper()}
+        )
+        self.assertIn(candidate, response.context["cl"].result_list)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1)
+    def test_unfiltered_changelist_uses_the_estimated_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Candidate._meta.db_table}")
+        with self.assertMaxQueries(6) as queries:
+            response = self.client.get(reverse("admin:candidates_candidate_changelist"))
+        self.assertEqual(response.context["cl"].result_count, 15)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+
+        with self.assertMaxQueries(6) as queries:
+            self.client.get(
+                reverse("admin:candidates_candidate_changelist"), {"q": self.candidates[0].email}
+            )
+        self.assertTrue(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    }
+)
+class ClearFilesTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.candidate = CandidateFactory()
+        self.candidate.resume_copy.save("cv.pdf", ContentFile(b"cv"), save=False)
+        self.candidate.passport_copy.save("passport.pdf", ContentFile(b"passport"), save=False)
+        self.candidate.save()
+        self.paths = [self.candidate.resume_copy.name, self.candidate.passport_copy.name]
+
+    def test_clear_files_updates_only_those_columns(self):
+        versions = self.candidate.history.count()
+        with self.captureOnCommitCallbacks(execute=True), self.assertMaxQueries(6) as queries:
+            cleared = self.candidate.clear_files("resume_copy", "passport_copy", "national_id_copy")
+        self.assertEqual(cleared, ["resume_copy", "passport_copy"])
+
+        [update] = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertIn('"resume_copy"', update)
+        self.assertIn('"passport_copy"', update)
+        self.assertNotIn('"first_name"', update)
+        self.assertFalse(any(default_storage.exists(path) for path in self.paths))
+
+        candidate = Candidate.objects.get(pk=self.candidate.pk)
+        self.assertFalse(candidate.resume_copy or candidate.passport_copy)
+        self.assertEqual(candidate.history.count(), versions + 1)
+        self.assertEqual(
+            candidate.history.first().history_change_reason, "Deleted Resume Copy, Passport Copy"
+        )
+
+        self.assertEqual(self.candidate.clear_files("resume_copy"), [])
+        with self.assertRaises(ValueError):
+            self.candidate.clear_files("first_name")
+
+    def test_files_are_kept_if_the_transaction_rolls_back(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.candidate.clear_files("resume_copy")
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(default_storage.exists(self.paths[0]))
+
+    def test_delete_files_view(self):
+        user = get_user_model().objects.create_user("recruiter", password="x")
+        self.client.force_login(user)
+        url = reverse("candidates:delete_files", args=["candidate", self.candidate.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(f"{url}?field=resume_copy&field=passport_copy")
+        self.assertRedirects(
+            response,
+            reverse("candidates:candidate_detail", args=[self.candidate.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertFalse(any(default_storage.exists(path) for path in self.paths))
+
+        application_data = CandidateApplicationDataFactory(candidate=self.candidate)
+        url = reverse(
+            "candidates:delete_files", args=["candidateapplicationdata", application_data.pk]
+        )
+        self.assertEqual(self.client.get(f"{url}?field=Visa_copy").status_code, 302)
+        self.assertEqual(self.client.get(f"{url}?field=candidate").status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse("candidates:delete_files", args=["language", 1])
+        self.assertEqual(self.client.get(f"{url}?field=resume_copy").status_code, 404)
+
+
+class ImportTests(TestCase):
+    COLUMNS = [
+        "email",
+        "first_name",
+        "second_name",
+        "third_name",
+        "last_name",
+        "gender",
+        "birthday",
+        "nationality",
+        "country",
+        "address",
+        "call_phone_number",
+        "whatsapp_phone_number",
+        "national_id_number",
+        "passport_expiration_date",
+        "passport_id",
+        "is_open_to_work",
+        "education_degree",
+        "education_field_of_study",
+        "education_start_date",
+        "education_end_date",
+        "experience_company_name",
+        "experience_company_location",
+        "experience_job_title",
+        "experience_start_date",
+        "experience_departments",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        Nationality.objects.create(nationality_name="Jordanian")
+        Country.objects.create(code="JO", name="Jordan")
+        DegreeChoices.objects.create(degree="Bachelor")
+        FieldOfStudy.objects.create(field_of_study="Nursing")
+        cls.icu = Department.objects.create(abbreviation="ICU", title="Intensive Care")
+        CandidateFactory(email="taken@example.com")
+
+    def row(self, **values):
+        row = {
+            "email": "nurse@example.com",
+            "first_name": "Lina",
+            "second_name": "Omar",
+            "third_name": "Sami",
+            "last_name": "Haddad",
+            "gender": "F",
+            "birthday": "1990-05-01",
+            "nationality": "jordanian",
+            "country": "JO",
+            "address": "Amman",
+            "call_phone_number": "+962791234567",
+            "whatsapp_phone_number": "+962791234567",
+            "national_id_number": "9901234567",
+            "passport_expiration_date": "2030-01-01",
+            "passport_id": "N1234567",
+            "is_open_to_work": "Yes",
+        }
+        row.update(values)
+        return row
+
+    def run_import(self, *rows):
+        stream = io.StringIO()
+        writer = csv.DictWriter(stream, fieldnames=self.COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+        return CandidateImporter(batch_size=2).run(io.BytesIO(stream.getvalue().encode()), "rows.csv")
+
+    def errors(self, report):
+        return [(error.row_number, error.column, error.message) for error in report.errors]
+
+    def test_valid_rows_are_imported_with_education_and_experience(self):
+        report = self.run_import(
+            self.row(
+                education_degree="bachelor",
+                education_field_of_study="Nursing",
+                education_start_date="2008-09-01",
+                education_end_date="2012-06-30",
+                experience_company_name="City Hospital",
+                experience_company_location="JO",
+                experience_job_title="Staff Nurse",
+                experience_start_date="2013-01-01",
+                experience_departments="ICU, intensive care",
+            ),
+            self.row(email="second@example.com"),
+            self.row(email="third@example.com"),
+        )
+        self.assertEqual(self.errors(report), [])
+        self.assertEqual(
+            (report.processed, report.created, report.educations_created, report.experiences_created),
+            (3, 3, 1, 1),
+        )
+        candidate = Candidate.objects.get(email="nurse@example.com")
+        self.assertEqual((candidate.nationality.nationality_name, candidate.country_id), ("Jordanian", "JO"))
+        self.assertEqual(candidate.educations.get().degree.degree, "Bachelor")
+        self.assertEqual(list(candidate.experiences.get().departments.all()), [self.icu])
+        self.assertEqual(candidate.history.count(), 1)
+
+    def test_errors_are_reported_per_field(self):
+        report = self.run_import(
+            self.row(
+                gender="X",
+                call_phone_number="0791234567",
+                nationality="Martian",
+                education_degree="Bachelor",
+                education_field_of_study="Nursing",
+                education_start_date="2012-01-01",
+                education_end_date="2010-01-01",
+            ),
+        )
+        self.assertEqual(
+            sorted(column for _, column, _ in self.errors(report)),
+            ["call_phone_number", "education_end_date", "gender", "nationality"],
+        )
+        self.assertIn((2, "nationality", 'Unknown Nationality "Martian".'), self.errors(report))
+        self.assertEqual((report.created, report.failed_rows), (0, 1))
+        self.assertFalse(Candidate.objects.filter(email="nurse@example.com").exists())
+
+    def test_duplicate_emails_in_the_file_and_the_database(self):
+        report = self.run_import(
+            self.row(),
+            self.row(email="NURSE@example.com"),
+            self.row(email="taken@example.com"),
+        )
+        self.assertEqual(
+            self.errors(report),
+            [
+                (3, "email", "Duplicate email in this file."),
+                (4, "email", "Candidate with this Email already exists."),
+            ],
+        )
+        self.assertEqual(report.created, 1)
+
+    def test_missing_or_invalid_emails_are_not_duplicates(self):
+        report = self.run_import(self.row(email=""), self.row(email="not an email"), self.row(email=""))
+        self.assertEqual(
+            [(row, column) for row, column, _ in self.errors(report)],
+            [(2, "email"), (3, "email"), (4, "email")],
+        )
+        self.assertNotIn("Duplicate email in this file.", [message for _, _, message in self.errors(report)])
+
+    def test_imported_candidates_are_signalled_on_commit(self):
+        handler = mock.Mock()
+        candidates_imported.connect(handler)
+        self.addCleanup(candidates_imported.disconnect, handler)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import(self.row(), self.row(email="second@example.com"))
+        handler.assert_called_once()
+        self.assertEqual(
+            set(handler.call_args.kwargs["candidate_ids"]),
+            set(Candidate.objects.exclude(email="taken@example.com").values_list("pk", flat=True)),
+        )
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        "exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    }
+)
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.candidates = CandidateFactory.create_batch(3)
+        User = get_user_model()
+        cls.owner = User.objects.create_user("owner", "owner@example.com", "x")
+        cls.other = User.objects.create_user("other", "other@example.com", "x")
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def run_export(self, export_format):
+        response = self.client.get(reverse("candidates:candidate_export"), {"format": export_format})
+        task_obj = Task.objects.get(name=export_candidates.name)
+        self.assertRedirects(response, reverse("background_tasks:task_detail", args=[task_obj.pk]))
+        self.assertTrue(execute(claim_task("test")))
+        task_obj.refresh_from_db()
+        return task_obj
+
+    def test_xlsx_export_is_only_downloaded_by_its_owner(self):
+        task_obj = self.run_export("xlsx")
+        name = task_obj.result["name"]
+        with storages["exports"].open(name) as export:
+            rows = list(openpyxl.load_workbook(export).active.values)
+        self.assertEqual(list(rows[0]), EXPORT_HEADERS)
+        self.assertEqual(len(rows), 4)
+
+        response = self.client.get(task_obj.result["url"])
+        self.assertRedirects(response, storages["exports"].url(name), fetch_redirect_response=False)
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(task_obj.result["url"]).status_code, 404)
+
+        # Each export queues the removal of the expired ones.
+        self.assertTrue(Task.objects.filter(name=remove_old_exports.name, status=Task.QUEUED).exists())
+
+    def test_csv_export_is_streamed(self):
+        response = self.client.get(
+            reverse("candidates:candidate_export"), {"format": "csv", "sort": "full_name", "order": "asc"}
+        )
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        names = sorted(self.candidates, key=lambda candidate: (candidate.first_name, candidate.last_name))
+        self.assertEqual([row[1] for row in rows[1:]], [candidate.email for candidate in names])
+        self.assertFalse(Task.objects.exists())
+
+    async def test_csv_export_is_streamed_under_asgi(self):
+        await self.async_client.aforce_login(self.owner)
+        url = reverse("candidates:candidate_export")
+        response = await self.async_client.get(url, {"format": "csv"})
+        # An async iterator: a sync one would be read into memory first.
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        rows = list(csv.reader(io.StringIO(content.decode())))
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        emails = sorted(candidate.email for candidate in self.candidates)
+        self.assertEqual(sorted(row[1] for row in rows[1:]), emails)
+
+    def test_parquet_export(self):
+        task_obj = self.run_export("parquet")
+        with storages["exports"].open(task_obj.result["name"]) as export:
+            table = pyarrow.parquet.read_table(export)
+        self.assertEqual(table.column_names, EXPORT_HEADERS)
+        self.assertEqual(
+            sorted(table.column("Email").to_pylist()),
+            sorted(candidate.email for candidate in self.candidates),
+        )
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse("candidates:candidate_export"), {"format": "pdf"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_old_exports_are_deleted(self):
+        storage = storages["exports"]
+        storage.save("candidates_old.xlsx", ContentFile(b"xlsx"))
+        self.assertEqual(delete_old_exports(), 0)
+        self.assertEqual(delete_old_exports(max_age=timedelta(0)), 1)
+        self.assertFalse(storage.exists("candidates_old.xlsx"))
+
+
+class PipelineCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("recruiter", "recruiter@example.com", "x")
+        self.jobs = JobOpportunityFactory.create_batch(2)
+        self.application = CandidateApplicationDataFactory(follow_up_assigned_to=self.user)
+        CandidateApplicationDataFactory(Prometric_status="fail")
+        self.application.candidate.job_opportunities.set(self.jobs)
+
+    def test_candidates_of_several_jobs_count_once_in_totals_and_per_user(self):
+        counts = compute_pipeline_counts()
+        self.assertEqual(counts["totals"]["total"], 2)
+        self.assertEqual(counts["totals"]["prometric_passed"], 1)
+        self.assertEqual(
+            [(group["label"], group["counts"]["total"]) for group in counts["users"]],
+            [("recruiter", 1), ("Unassigned", 1)],
+        )
+        # ... and once per job in the job breakdown.
+        jobs = {group["id"]: group["counts"] for group in counts["jobs"]}
+        self.assertEqual(jobs[self.jobs[0].pk]["prometric_passed"], 1)
+        self.assertEqual(jobs[self.jobs[1].pk]["prometric_passed"], 1)
+        self.assertEqual(jobs[None]["total"], 1)
+
+    def test_board(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("candidates:pipeline_board"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["totals"]["total"], 2)
+
+    def test_stage_page_size(self):
+        self.client.force_login(self.user)
+        url = reverse("candidates:pipeline_all")
+        for per_page, expected in [("5", 5), ("abc", 20), ("0", 1), ("-3", 1)]:
+            with self.subTest(per_page=per_page):
+                response = self.client.get(url, {"per_page": per_page})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context["per_page"], expected)
+
+
+class ExpirationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = date.today()
+        soon = cls.today + timedelta(days=5)
+        # Ties on the same date, within a source and across sources.
+        cls.passports = CandidateFactory.create_batch(3, passport_expiration_date=soon)
+        LicenseFactory(candidate=cls.passports[0], expiry_date=soon)
+        CandidateApplicationDataFactory(
+            candidate=cls.passports[1], DataFlow_expiry_date=cls.today + timedelta(days=10)
+        )
+        CandidateFactory(passport_expiration_date=cls.today + timedelta(days=45))
+        CandidateFactory(passport_expiration_date=cls.today - timedelta(days=1))
+
+    def setUp(self):
+        cache.clear()
+
+    def keys(self, rows):
+        return [(row["expires_on"], row["source"], row["record_id"]) for row in rows]
+
+    def test_cursor_round_trip(self):
+        cursor = ExpirationCursor(self.today, 2, 42)
+        self.assertEqual(ExpirationCursor.decode(cursor.encode()), cursor)
+        for value in ("", "2024-01-01.1", "2024-13-01.1.2", "2024-01-01.a.2"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                ExpirationCursor.decode(value)
+
+    def test_pages_follow_on_without_gaps_or_repeats(self):
+        everything, cursor = upcoming_expirations(30, today=self.today)
+        self.assertIsNone(cursor)
+        self.assertEqual(len(everything), 5)
+        self.assertEqual(self.keys(everything), sorted(self.keys(everything)))
+        self.assertEqual(
+            [row["document"] for row in everything],
+            ["Passport", "Passport", "Passport", "License", "DataFlow"],
+        )
+
+        paged, cursor = [], None
+        while True:
+            rows, cursor = upcoming_expirations(30, after=cursor, limit=2, today=self.today)
+            paged += rows
+            if cursor is None:
+                break
+            # Cursors travel through the query string.
+            cursor = ExpirationCursor.decode(cursor.encode())
+        self.assertEqual(self.keys(paged), self.keys(everything))
+
+        # A page boundary in the middle of the passport tie.
+        rows, cursor = upcoming_expirations(30, limit=1, today=self.today)
+        rows, _ = upcoming_expirations(30, after=cursor, limit=3, today=self.today)
+        self.assertEqual(self.keys(rows), self.keys(everything[1:4]))
+
+    def test_counts(self):
+        counts = expiration_counts(30, today=self.today)
+        self.assertEqual((counts["Passport"], counts["License"], counts["DataFlow"]), (3, 1, 1))
+        self.assertEqual(expiration_counts(60, today=self.today)["Passport"], 4)
+
+    def test_dashboard(self):
+        user = get_user_model().objects.create_user("viewer", "viewer@example.com", "x")
+        self.client.force_login(user)
+        url = reverse("candidates:expirations_dashboard")
+        response = self.client.get(url, {"limit": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["rows"]), 3)
+        self.assertEqual(response.context["counts"]["Passport"], 3)
+        response = self.client.get(url, {"limit": 3, "cursor": response.context["next_cursor"]})
+        documents = [row["document"] for row in response.context["rows"]]
+        self.assertEqual(documents, ["License", "DataFlow"])
+        self.assertIsNone(response.context["next_cursor"])
+
+        for params in ({"days": 7}, {"cursor": "nonsense"}, {"limit": 0}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+@mock_aws
+@override_settings(AWS_STORAGE_BUCKET_NAME="storage-gc-test")
+class StorageGCTests(TestCase):
+    """storage_gc against moto's in-process S3."""
+
+    def setUp(self):
+        s3.s3_client.cache_clear()
+        self.addCleanup(s3.s3_client.cache_clear)
+        self.bucket = settings.AWS_STORAGE_BUCKET_NAME
+        s3.s3_client().create_bucket(Bucket=self.bucket)
+
+        candidate = CandidateFactory()
+        application_data = CandidateApplicationDataFactory(candidate=candidate)
+        self.referenced = [
+            f"candidates/{candidate.pk}/resume.pdf",
+            f"candidates/{candidate.pk}/visa.pdf",
+        ]
+        Candidate.objects.filter(pk=candidate.pk).update(resume_copy=self.referenced[0])
+        CandidateApplicationData.objects.filter(pk=application_data.pk).update(
+            Visa_copy=self.referenced[1]
+        )
+        self.orphans = [f"candidates/old_name_{candidate.pk}/cv-{i}.pdf" for i in range(5)]
+        for key in [*self.referenced, *self.orphans, "candidates/", "exports/candidates.csv"]:
+            s3.s3_client().put_object(Bucket=self.bucket, Key=key, Body=b"x")
+
+    def keys(self):
+        return set(s3.list_keys(""))
+
+    def test_orphans_are_deleted_in_batches(self):
+        report = collect_orphans(min_age=timedelta(0), batch_size=2)
+        self.assertEqual(report.listed, 7)
+        self.assertEqual(report.referenced, 2)
+        self.assertEqual(report.deleted, 5)
+        self.assertEqual(report.delete_calls, 3)
+        self.assertEqual(report.orphan_bytes, 5)
+        self.assertEqual(self.keys(), {*self.referenced, "exports/candidates.csv"})
+
+    def test_dry_run_and_grace_period_delete_nothing(self):
+        out = io.StringIO()
+        call_command("storage_gc", "--dry-run", "--min-age-hours=0", stdout=out)
+        self.assertIn("Would delete 5 orphaned objects", out.getvalue())
+
+        report = collect_orphans()
+        self.assertEqual(report.skipped_recent, 5)
+        self.assertEqual(report.deleted, 0)
+        self.assertEqual(len(self.keys()), 8)
+
+    def test_blobs_with_a_row_are_never_collected(self):
+        for key in ("blobs/aa/kept.pdf", "blobs/bb/revived.pdf", "blobs/cc/orphan.pdf"):
+            s3.s3_client().put_object(Bucket=self.bucket, Key=key, Body=b"x")
+        # No file field refers to it (yet), but a dedup hit can give it one.
+        StoredBlob.objects.create(sha256="a" * 64, key="blobs/aa/kept.pdf", size=1, ref_count=0)
+        listing = s3.iter_objects
+
+        def upload_while_listing(prefix):
+            yield from listing(prefix)
+            StoredBlob.objects.create(sha256="b" * 64, key="blobs/bb/revived.pdf", size=1)
+
+        with mock.patch("candidates.storage_gc.iter_objects", upload_while_listing):
+            report = collect_orphans(prefix="blobs/", min_age=timedelta(0))
+        self.assertEqual((report.deleted, report.skipped_recent), (1, 1))
+        self.assertEqual([orphan.key for orphan in report.orphans], ["blobs/cc/orphan.pdf"])
+        self.assertEqual(set(s3.list_keys("blobs/")), {"blobs/aa/kept.pdf", "blobs/bb/revived.pdf"})
+
+
+@mock_aws
+@override_settings(AWS_STORAGE_BUCKET_NAME="s3-helpers-test")
+class S3Tests(TestCase):
+    def setUp(self):
+        s3.s3_client.cache_clear()
+        self.addCleanup(s3.s3_client.cache_clear)
+        self.bucket = settings.AWS_STORAGE_BUCKET_NAME
+        s3.s3_client().create_bucket(Bucket=self.bucket)
+
+    def put(self, key, body=b"x"):
+        s3.s3_client().put_object(Bucket=self.bucket, Key=key, Body=body)
+
+    def test_object_key_from_url(self):
+        url = f"https://{self.bucket}.s3.amazonaws.com/candidates/1/CV%20final.pdf"
+        self.assertEqual(s3.object_key_from_url(url), "candidates/1/CV final.pdf")
+        self.assertEqual(s3.object_key_from_url("/candidates/1/cv.pdf"), "candidates/1/cv.pdf")
+
+    def test_objects_are_read_in_chunks(self):
+        self.put("cv.pdf", b"abcdefgh")
+        self.assertEqual(list(s3.iter_object("cv.pdf", chunk_size=3)), [b"abc", b"def", b"gh"])
+
+    def test_listing_copy_and_delete(self):
+        for key in ("candidates/", "candidates/1/a.pdf", "candidates/1/b.pdf", "exports/c.csv"):
+            self.put(key)
+        self.assertEqual(s3.list_keys("candidates/"), ["candidates/1/a.pdf", "candidates/1/b.pdf"])
+        self.assertEqual(len(list(s3.iter_objects(""))), 4)
+
+        s3.copy_key("candidates/1/a.pdf", "candidates/2/a.pdf")
+        self.assertEqual(s3.head_key("candidates/2/a.pdf")["ContentLength"], 1)
+
+        self.assertEqual(s3.delete_keys([]), {})
+        self.assertEqual(s3.delete_keys(["candidates/1/a.pdf", "candidates/1/b.pdf"]), {})
+        self.assertEqual(s3.list_keys("candidates/"), ["candidates/2/a.pdf"])
+        with self.assertRaises(ValueError):
+            s3.delete_keys([str(i) for i in range(s3.S3_DELETE_BATCH_SIZE + 1)])
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME="downloads-test")
+class DownloadTests(TestCase):
+    """
+    The download views stream from S3 under both WSGI and ASGI. moto is
+    started in setUp: its class decorator would not await async tests.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("recruiter", "recruiter@example.com", "x")
+        cls.candidate = CandidateFactory()
+        cls.directory = f"candidates/{cls.candidate.storage_id}"
+        Candidate.objects.filter(pk=cls.candidate.pk).update(
+            resume_copy=f"{cls.directory}/resume/cv.pdf",
+            passport_copy=f"{cls.directory}/passport/passport.pdf",
+        )
+
+    def setUp(self):
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        s3.s3_client.cache_clear()
+        self.addCleanup(s3.s3_client.cache_clear)
+        bucket = settings.AWS_STORAGE_BUCKET_NAME
+        s3.s3_client().create_bucket(Bucket=bucket)
+        self.contents = {
+            "resume/cv.pdf": b"%PDF resume " * 10000,
+            "passport/passport.pdf": b"%PDF passport",
+        }
+        for name, body in self.contents.items():
+            s3.s3_client().put_object(
+                Bucket=bucket,
+                Key=f"{self.directory}/{name}",
+                Body=body,
+                ContentType="application/pdf",
+            )
+        self.client.force_login(self.user)
+
+    def file_url(self, name):
+        return reverse("candidates:download_file") + f"?file_key={self.directory}/{name}"
+
+    def directory_url(self, candidate=None):
+        candidate_id = (candidate or self.candidate).pk
+        return reverse("candidates:download_candidate_directory", args=[candidate_id])
+
+    def assertZip(self, content):
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertEqual(
+                {name: archive.read(name) for name in archive.namelist()}, self.contents
+            )
+
+    def test_wsgi_downloads_are_streamed(self):
+        response = self.client.get(self.file_url("resume/cv.pdf"))
+        self.assertFalse(response.is_async)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Content-Length"], str(len(self.contents["resume/cv.pdf"])))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="cv.pdf"')
+        self.assertEqual(b"".join(response.streaming_content), self.contents["resume/cv.pdf"])
+
+        response = self.client.get(self.directory_url())
+        self.assertFalse(response.is_async)
+        self.assertZip(b"".join(response.streaming_content))
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(reverse("candidates:download_file")).status_code, 400)
+        self.assertEqual(self.client.get(self.file_url("missing.pdf")).status_code, 404)
+        self.assertEqual(self.client.get(self.directory_url(CandidateFactory())).status_code, 404)
+
+    async def test_asgi_downloads_are_streamed_from_the_s3_thread_pool(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.file_url("resume/cv.pdf"))
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(content, self.contents["resume/cv.pdf"])
+
+        response = await self.async_client.get(self.directory_url())
+        self.assertTrue(response.is_async)
+        self.assertZip(b"".join([chunk async for chunk in response.streaming_content]))
+
+
+@mock_aws
+@override_settings(AWS_STORAGE_BUCKET_NAME="storage-migration-test")
+class StorageMigrationTests(TestCase):
+    def setUp(self):
+        s3.s3_client.cache_clear()
+        self.addCleanup(s3.s3_client.cache_clear)
+        self.bucket = settings.AWS_STORAGE_BUCKET_NAME
+        s3.s3_client().create_bucket(Bucket=self.bucket)
+
+        self.candidate = CandidateFactory()
+        pk = self.candidate.pk
+        # Files uploaded before and after the candidate was renamed.
+        self.keys = {
+            "resume": f"candidates/jon-doe_{pk}/resume.pdf",
+            "first": f"candidates/jon-doe_{pk}/BCc1.pdf",
+            "second": f"candidates/john-doe_{pk}/BCc1.pdf",
+            "visa": f"candidates/john-doe_{pk}/visa.pdf",
+        }
+        Candidate.objects.filter(pk=pk).update(resume_copy=self.keys["resume"])
+        self.educations = EducationFactory.create_batch(2, candidate=self.candidate)
+        for education, key in zip(self.educations, [self.keys["first"], self.keys["second"]]):
+            Education.objects.filter(pk=education.pk).update(certification_copy=key)
+        for key in self.keys.values():
+            s3.s3_client().put_object(Bucket=self.bucket, Key=key, Body=key.encode())
+        # A stored name whose object is gone.
+        application_data = CandidateApplicationDataFactory(candidate=self.candidate)
+        CandidateApplicationData.objects.filter(pk=application_data.pk).update(
+            Visa_copy=f"candidates/john-doe_{pk}/missing.pdf"
+        )
+
+    def test_files_move_to_the_storage_id_directory(self):
+        report = CandidateStorageMigrator(batch_size=1, workers=2).run()
+        self.assertEqual((report.planned, report.moved, report.deleted), (4, 3, 3))
+        self.assertEqual(
+            [key for key, _ in report.errors],
+            [f"candidates/john-doe_{self.candidate.pk}/missing.pdf"],
+        )
+
+        directory = f"candidates/{self.candidate.storage_id}"
+        self.candidate.refresh_from_db()
+        self.assertEqual(self.candidate.resume_copy.name, f"{directory}/resume.pdf")
+        first, second = [
+            Education.objects.get(pk=education.pk).certification_copy.name
+            for education in self.educations
+        ]
+        self.assertEqual(first, f"{directory}/BCc1.pdf")
+        self.assertEqual(second, f"{directory}/BCc1_education{self.educations[1].pk}.pdf")
+        self.assertEqual(
+            set(s3.list_keys("candidates/")),
+            {self.candidate.resume_copy.name, first, second, self.keys["visa"]},
+        )
+        body = s3.s3_client().get_object(Bucket=self.bucket, Key=second)["Body"].read()
+        self.assertEqual(body, self.keys["second"].encode())
+
+        # Re-running only retries what failed.
+        report = CandidateStorageMigrator().run()
+        self.assertEqual((report.planned, report.moved), (1, 0))
+
+    def test_files_changed_during_the_copy_are_left_alone(self):
+        plan = CandidateStorageMigrator._plan
+
+        def upload_after_planning(migrator, candidates):
+            moves = plan(migrator, candidates)
+            # A new file uploaded while the old one is being copied.
+            Candidate.objects.filter(pk=self.candidate.pk).update(resume_copy="candidates/new.pdf")
+            return moves
+
+        with mock.patch.object(CandidateStorageMigrator, "_plan", upload_after_planning):
+            report = CandidateStorageMigrator().run()
+        self.assertEqual((report.moved, report.deleted), (2, 2))
+        error = (self.keys["resume"], "file changed during the move; skipped")
+        self.assertIn(error, report.errors)
+        self.candidate.refresh_from_db()
+        self.assertEqual(self.candidate.resume_copy.name, "candidates/new.pdf")
+        self.assertIn(self.keys["resume"], s3.list_keys("candidates/"))
+
+    def test_dry_run_changes_nothing(self):
+        out = io.StringIO()
+        call_command("migrate_candidate_storage", "--dry-run", stdout=out)
+        self.assertIn("Would move 4 files of 1 candidates", out.getvalue())
+        self.candidate.refresh_from_db()
+        self.assertEqual(self.candidate.resume_copy.name, self.keys["resume"])
+        self.assertEqual(len(s3.list_keys("candidates/")), 4)
+
+    def test_download_candidate_directory(self):
+        CandidateStorageMigrator().run()
+        CandidateApplicationData.objects.update(Visa_copy=None)
+        self.client.force_login(get_user_model().objects.create_user("recruiter", password="x"))
+        url = reverse("candidates:download_candidate_directory", args=[self.candidate.pk])
+        response = self.client.get(url)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(
+            sorted(archive.namelist()),
+            ["BCc1.pdf", f"BCc1_education{self.educations[1].pk}.pdf", "resume.pdf"],
+        )
+        self.assertEqual(archive.read("resume.pdf"), self.keys["resume"].encode())
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    }
+)
+class StorageUsageTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.candidate = CandidateFactory()
+        self.candidate.resume_copy = SimpleUploadedFile("cv.pdf", b"x" * 300, "application/pdf")
+        self.candidate.passport_copy = SimpleUploadedFile("passport.jpg", b"x" * 200, "image/jpeg")
+        self.candidate.save()
+        self.application_data = CandidateApplicationDataFactory(candidate=self.candidate)
+        self.application_data.Visa_copy = SimpleUploadedFile(
+            "visa.pdf", b"x" * 50, "application/pdf"
+        )
+        self.application_data.save()
+
+    def test_uploads_and_deletions_are_accounted(self):
+        self.assertEqual(
+            set(StoredFile.objects.values_list("field_name", "size", "content_type")),
+            {
+                ("resume_copy", 300, "application/pdf"),
+                ("passport_copy", 200, "image/jpeg"),
+                ("Visa_copy", 50, "application/pdf"),
+            },
+        )
+        usage = candidate_usage(self.candidate)
+        self.assertEqual((usage["files"], usage["size"]), (3, 550))
+        self.assertEqual(usage["documents"][0], {"document": "Resume Copy", "files": 1, "size": 300})
+
+        # Saves that leave the files alone do not touch the rows.
+        updated_at = StoredFile.objects.get(field_name="resume_copy").updated_at
+        self.candidate.first_name = "Renamed"
+        self.candidate.save()
+        self.assertEqual(StoredFile.objects.get(field_name="resume_copy").updated_at, updated_at)
+
+        self.candidate.clear_files("passport_copy")
+        self.application_data.delete()
+        self.assertEqual(
+            list(StoredFile.objects.values_list("field_name", flat=True)), ["resume_copy"]
+        )
+
+    def test_usage_pages(self):
+        user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("candidates:candidate_detail", args=[self.candidate.pk])
+        )
+        self.assertContains(response, "Resume Copy")
+        self.assertEqual(response.context["storage_usage"]["size"], 550)
+        response = self.client.get(reverse("admin:candidates_storedfile_report"))
+        self.assertEqual(
+            response.context["report"]["totals"], {"files": 3, "size": 550, "candidates": 1}
+        )
+
+
+@mock_aws
+@override_settings(AWS_STORAGE_BUCKET_NAME="storage-usage-test")
+class StorageUsageReconcileTests(TestCase):
+    def setUp(self):
+        s3.s3_client.cache_clear()
+        self.addCleanup(s3.s3_client.cache_clear)
+        s3.s3_client().create_bucket(Bucket=settings.AWS_STORAGE_BUCKET_NAME)
+
+    def test_reconcile(self):
+        candidate = CandidateFactory()
+        key = f"candidates/{candidate.storage_id}/resume.pdf"
+        s3.s3_client().put_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, Body=b"cv")
+        # Bulk updates send no signals.
+        Candidate.objects.filter(pk=candidate.pk).update(
+            resume_copy=key, passport_copy="candidates/gone.pdf"
+        )
+        StoredFile.objects.create(
+            candidate=candidate,
+            model="education",
+            object_id=0,
+            field_name="transcript_copy",
+            key="candidates/stale.pdf",
+            size=10,
+        )
+        self.assertEqual(reconcile_stored_files(batch_size=1), (2, 1))
+        self.assertEqual(
+            set(StoredFile.objects.values_list("field_name", "key", "size", "content_type")),
+            {
+                ("resume_copy", key, 2, "application/pdf"),
+                ("passport_copy", "candidates/gone.pdf", None, "application/pdf"),
+            },
+        )
+
+
+def scan_upload(name, size=(2400, 3200), orientation=6):
+    """A noisy JPEG "scan" with an EXIF orientation, as phone cameras upload them."""
+    image = Image.effect_noise(size, 40).convert("RGB")
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=95, exif=exif)
+    return SimpleUploadedFile(name, output.getvalue(), "image/jpeg")
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    },
+    UPLOAD_PROCESSING_ENABLED=True,
+    UPLOAD_TARGET_DPI=150,
+    UPLOAD_JPEG_QUALITY=75,
+)
+class UploadProcessingTests(TestCase):
+    def setUp(self):
+        self.candidate = CandidateFactory()
+
+    def test_images_are_downscaled_and_stripped(self):
+        upload = scan_upload("passport.jpeg")
+        self.candidate.passport_copy = upload
+        self.candidate.save()
+
+        name = self.candidate.passport_copy.name
+        self.assertTrue(name.endswith("/PASS.jpg"))
+        with default_storage.open(name) as stored:
+            image = Image.open(stored)
+            # Rotated upright, then fitted to a landscape A4 page at 150 dpi.
+            self.assertEqual(image.size, (1653, 1240))
+            self.assertFalse(image.getexif())
+        stored_file = StoredFile.objects.get(field_name="passport_copy")
+        self.assertEqual(stored_file.original_size, upload.size)
+        self.assertLess(stored_file.size, upload.size / 2)
+        self.assertEqual(stored_file.content_type, "image/jpeg")
+        self.assertFalse(default_storage.exists("originals"))
+
+    @override_settings(UPLOAD_IMAGES_TO_PDF=True, UPLOAD_KEEP_ORIGINALS=True)
+    def test_images_wrapped_into_pdfs_and_originals_kept(self):
+        upload = scan_upload("cv.jpg", size=(800, 600), orientation=1)
+        self.candidate.resume_copy = upload
+        self.candidate.personal_image = scan_upload("me.png", size=(800, 600), orientation=1)
+        self.candidate.save()
+
+        self.assertTrue(self.candidate.resume_copy.name.endswith("/resume.pdf"))
+        with default_storage.open(self.candidate.resume_copy.name) as stored:
+            self.assertEqual(stored.read(5), b"%PDF-")
+        # ImageFields stay images.
+        self.assertTrue(self.candidate.personal_image.name.endswith(".jpg"))
+        directory = f"originals/candidates/{self.candidate.storage_id}"
+        self.assertEqual(default_storage.size(f"{directory}/resume_copy/cv.jpg"), upload.size)
+
+    def test_multi_page_tiffs_keep_every_page(self):
+        pages = [Image.effect_noise((1200, 1600), 40).convert("L") for _ in range(3)]
+        output = io.BytesIO()
+        pages[0].save(output, "TIFF", save_all=True, append_images=pages[1:])
+        tiff = output.getvalue()
+
+        self.candidate.resume_copy = SimpleUploadedFile("cv.tiff", tiff, "image/tiff")
+        self.candidate.save()
+        # No PDF to hold the pages: kept as uploaded.
+        with default_storage.open(self.candidate.resume_copy.name) as stored:
+            self.assertEqual(stored.read(), tiff)
+
+        with self.settings(UPLOAD_IMAGES_TO_PDF=True):
+            self.candidate.passport_copy = SimpleUploadedFile("passport.tif", tiff, "image/tiff")
+            self.candidate.save()
+        self.assertTrue(self.candidate.passport_copy.name.endswith(".pdf"))
+        with default_storage.open(self.candidate.passport_copy.name) as stored:
+            self.assertEqual(stored.read().count(b"/Type /Page\n"), 3)
+
+    def test_decompression_bombs_are_kept_as_uploaded(self):
+        upload = scan_upload("passport.jpg", size=(100, 100))
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            self.candidate.passport_copy = upload
+            self.candidate.save()
+        self.assertEqual(default_storage.size(self.candidate.passport_copy.name), upload.size)
+
+    def test_other_files_are_kept_as_uploaded(self):
+        self.candidate.resume_copy = SimpleUploadedFile(
+            "cv.pdf", b"%PDF-1.4 scan", "application/pdf"
+        )
+        self.candidate.save()
+        with default_storage.open(self.candidate.resume_copy.name) as stored:
+            self.assertEqual(stored.read(), b"%PDF-1.4 scan")
+        self.assertIsNone(StoredFile.objects.get(field_name="resume_copy").original_size)
+        with self.settings(UPLOAD_PROCESSING_ENABLED=False):
+            self.candidate.passport_copy = scan_upload("passport.jpg", size=(100, 100))
+            self.candidate.save()
+        self.assertTrue(self.candidate.passport_copy.name.endswith("/PASS.jpg"))
+        self.assertIsNone(StoredFile.objects.get(field_name="passport_copy").original_size)
 
-# Create your tests here.
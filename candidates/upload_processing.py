@@ -0,0 +1,152 @@
+# candidates/upload_processing.py
+import io
+import logging
+import os
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import models
+from PIL import Image, ImageOps, ImageSequence, UnidentifiedImageError
+
+from utilities.files import file_fields
+
+from .models import Candidate, get_candidate_directory
+
+logger = logging.getLogger(__name__)
+
+# Scans are fitted to an A4 page (in inches) at UPLOAD_TARGET_DPI.
+PAGE_INCHES = (8.27, 11.69)
+# Formats recompressed; anything else (PDFs, GIFs, Office files) is kept as uploaded.
+PROCESSED_FORMATS = {"JPEG", "MPO", "PNG", "WEBP", "TIFF", "BMP"}
+# Kept originals go here, outside the deduplicated and collected prefixes.
+ORIGINALS_PREFIX = "originals/"
+
+
+@dataclass
+class ProcessedUpload:
+    name: str
+    content: bytes
+    original_size: int
+
+    @property
+    def ratio(self):
+        return len(self.content) / self.original_size if self.original_size else 1
+
+
+def _flatten(image):
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    if image.mode not in ("RGB", "L"):
+        return image.convert("RGB")
+    return image
+
+
+def _fit_to_page(image, short_side, long_side):
+    image = _flatten(ImageOps.exif_transpose(image))
+    if image.width > image.height:
+        image.thumbnail((long_side, short_side), Image.LANCZOS)
+    else:
+        image.thumbnail((short_side, long_side), Image.LANCZOS)
+    return image
+
+
+def process_image(upload, name, dpi, quality, to_pdf=False):
+    """
+    Downscale a scanned image to fit a page at ``dpi``, apply and drop its
+    EXIF data (orientation included) and re-encode it as a JPEG, or as a
+    PDF with ``to_pdf``; multi-page TIFFs become one PDF page per frame.
+    Returns None for files kept as uploaded: other formats, multi-frame
+    images that cannot become a PDF, and images too large to decode safely.
+    """
+    upload.seek(0)
+    try:
+        image = Image.open(upload)
+        if image.format not in PROCESSED_FORMATS:
+            return None
+        # An MPO is a photo followed by previews of it.
+        frames = 1 if image.format == "MPO" else getattr(image, "n_frames", 1)
+        if frames > 1 and not (to_pdf and image.format == "TIFF"):
+            return None
+
+        short_side, long_side = (round(inches * dpi) for inches in PAGE_INCHES)
+        if frames == 1:
+            # JPEGs are decoded at a reduced scale straight away (no full decode).
+            image.draft(image.mode, (long_side, long_side))
+            pages = [_fit_to_page(image, short_side, long_side)]
+        else:
+            pages = [
+                _fit_to_page(frame, short_side, long_side)
+                for frame in ImageSequence.Iterator(image)
+            ]
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        return None
+
+    output = io.BytesIO()
+    if to_pdf:
+        pages[0].save(
+            output,
+            "PDF",
+            resolution=dpi,
+            quality=quality,
+            save_all=True,
+            append_images=pages[1:],
+        )
+        ext = ".pdf"
+    else:
+        pages[0].save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+        ext = ".jpg"
+    return ProcessedUpload(
+        name=os.path.splitext(name)[0] + ext,
+        content=output.getvalue(),
+        original_size=upload.size,
+    )
+
+
+def _keep_original(instance, field, upload, name):
+    candidate = instance if isinstance(instance, Candidate) else instance.candidate
+    path = f"{ORIGINALS_PREFIX}{get_candidate_directory(candidate)}/{field.name}/{name}"
+    upload.seek(0)
+    return field.storage.save(path, upload)
+
+
+def process_uploads(sender, instance, raw=False, **kwargs):
+    """
+    pre_save: with UPLOAD_PROCESSING_ENABLED, replace the images being
+    uploaded to the file fields by their processed version before they
+    are stored. ImageFields are recompressed but never wrapped into PDFs.
+    """
+    if raw or not settings.UPLOAD_PROCESSING_ENABLED:
+        return
+    for name, field in file_fields(sender).items():
+        field_file = getattr(instance, name)
+        if not field_file or field_file._committed:
+            continue
+        upload = field_file.file
+        processed = process_image(
+            upload,
+            field_file.name,
+            dpi=settings.UPLOAD_TARGET_DPI,
+            quality=settings.UPLOAD_JPEG_QUALITY,
+            to_pdf=settings.UPLOAD_IMAGES_TO_PDF and not isinstance(field, models.ImageField),
+        )
+        if processed is None:
+            continue
+        if settings.UPLOAD_KEEP_ORIGINALS:
+            _keep_original(instance, field, upload, field_file.name)
+        content = ContentFile(processed.content, name=processed.name)
+        # Recorded by storage_usage.capture_uploads.
+        content.original_size = processed.original_size
+        field_file.file = content
+        field_file.name = processed.name
+        logger.info(
+            "Processed %s upload %s: %s -> %s bytes (%.0f%%)",
+            name,
+            processed.name,
+            processed.original_size,
+            len(processed.content),
+            processed.ratio * 100,
+        )
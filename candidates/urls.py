@@ -9,30 +9,26 @@ urlpatterns = [
     # Candidate URLs
 
     path("search/", views.candidate_search_view, name="candidate_search"),
+    path("search/suggest/", views.candidate_search_suggest, name="candidate_search_suggest"),
 
     path("", views.candidate_list, name="candidate_list"),
+    path("export/", views.candidate_export, name="candidate_export"),
+    path("export/<str:name>/", views.export_download, name="export_download"),
+    path("expirations/", views.expirations_dashboard, name="expirations_dashboard"),
+    path("expirations/feed/", views.expirations_feed, name="expirations_feed"),
+    path("pipeline/", views.pipeline_board, name="pipeline_board"),
+    path("pipeline/all/", views.pipeline_stage, name="pipeline_all"),
+    path("pipeline/<slug:stage>/", views.pipeline_stage, name="pipeline_stage"),
     path("create/", views.candidate_create, name="candidate_create"),
     path("<int:pk>/", views.candidate_detail, name="candidate_detail"),
+    path("<int:pk>/history/", views.candidate_history, name="candidate_history"),
     path("<int:pk>/update/", views.candidate_update, name="candidate_update"),
     path("<int:pk>/delete/", views.candidate_delete, name="candidate_delete"),
-    # File Deletion URLs
+    # File Deletion URL (?field=<file field>, repeatable)
     path(
-        "<int:candidate_pk>/delete_resume/", views.delete_resume, name="delete_resume"
-    ),
-    path(
-        "<int:candidate_pk>/delete_personal_image/",
-        views.delete_personal_image,
-        name="delete_personal_image",
-    ),
-    path(
-        "<int:candidate_pk>/delete_id_copy/",
-        views.delete_id_copy,
-        name="delete_id_copy",
-    ),
-    path(
-        "<int:candidate_pk>/delete_passport_copy/",
-        views.delete_passport_copy,
-        name="delete_passport_copy",
+        "files/<str:model_name>/<int:pk>/delete/",
+        views.delete_files,
+        name="delete_files",
     ),
     # Education URLs
     path(
@@ -46,17 +42,6 @@ urlpatterns = [
     path(
         "educations/<int:pk>/delete/", views.education_delete, name="education_delete"
     ),
-    # Education File Deletion
-    path(
-        "educations/<int:education_pk>/delete_certification/",
-        views.delete_education_certification,
-        name="delete_education_certification",
-    ),
-    path(
-        "educations/<int:education_pk>/delete_transcript/",
-        views.delete_education_transcript,
-        name="delete_education_transcript",
-    ),
     # Experience URLs
     path(
         "<int:candidate_pk>/experiences/create/",
@@ -73,12 +58,6 @@ urlpatterns = [
         views.experience_delete,
         name="experience_delete",
     ),
-    # Experience File Deletion
-    path(
-        "experiences/<int:experience_pk>/delete_certification/",
-        views.delete_experience_certification,
-        name="delete_experience_certification",
-    ),
     # Language URLs
     path(
         "languages/<int:candidate_pk>/languages/create/",
@@ -102,12 +81,6 @@ urlpatterns = [
         views.training_course_delete,
         name="training_course_delete",
     ),
-    # Training Course File Deletion
-    path(
-        "<int:training_course_pk>/delete_certification/",
-        views.delete_training_course_certification,
-        name="delete_training_course_certification",
-    ),
     # License URLs
     path(
         "<int:candidate_pk>/licenses/create/",
@@ -116,12 +89,6 @@ urlpatterns = [
     ),
     path("licenses/<int:pk>/update/", views.license_update, name="license_update"),
     path("licenses/<int:pk>/delete/", views.license_delete, name="license_delete"),
-    # License File Deletion
-    path(
-        "<int:license_pk>/delete_license_copy/",
-        views.delete_license_copy,
-        name="delete_license_copy",
-    ),
     # Candidate Application Data URLs
     path(
         "<int:candidate_pk>/application_data/update/",
@@ -133,71 +100,6 @@ urlpatterns = [
         views.candidate_application_data_detail,
         name="candidate_application_data_detail",
     ),
-    path(
-        "candidate/<int:candidate_id>/delete_blood_test_report/",
-        views.delete_blood_test_report,
-        name="delete_blood_test_report",
-    ),
-    path(
-        "candidate/<int:candidate_id>/delete_xray_test_report/",
-        views.delete_xray_test_report,
-        name="delete_xray_test_report",
-    ),
-    path(
-        "candidate/<int:candidate_id>/delete_fit_to_work_report/",
-        views.delete_fit_to_work_report,
-        name="delete_fit_to_work_report",
-    ),
-    # DataFlow_certificate_copy
-    path(
-        "candidate/<int:candidate_id>/delete_dataflow_certificate/",
-        views.delete_dataflow_certificate,
-        name="delete_dataflow_certificate_copy",
-    ),
-    path(
-        "candidate/<int:candidate_id>/delete_pregnancy_report/",
-        views.delete_pregnancy_report,
-        name="delete_pregnancy_report",
-    ),
-    path(
-        "candidate/<int:candidate_id>/delete_dhp_certificate/",
-        views.delete_dhp_certificate,
-        name="delete_dhp_certificate",
-    ),
-    path(
-        "candidate/<int:candidate_id>/delete_prometric_certificate/",
-        views.delete_prometric_certificate,
-        name="delete_prometric_certificate",
-    ),
-# delete_prometric_appointment
-    path(
-        "candidate/<int:candidate_id>/delete_prometric_appointment_copy/",
-        views.delete_prometric_appointment_copy,
-        name="delete_prometric_appointment_copy",
-    ),
-    # delete_police_clearance_copy
-    path(
-        "candidate/<int:candidate_id>/delete_police_clearance_copy/",
-        views.delete_police_clearance_copy,
-        name="delete_police_clearance_copy",
-    ),
-    # delete_visa_copy
-    path(
-        "candidate/<int:candidate_id>/delete_visa_copy/",
-        views.delete_visa_copy,
-        name="delete_visa_copy",
-    ),
-    path(
-
-        "candidate/<int:candidate_id>/delete_police_clearance_copy/",
-        views.delete_police_clearance_copy,
-        name="delete_police_clearance_copy",
-    ),
-    path(
-        "candidate/<int:candidate_id>/delete_visa_copy/",
-        views.delete_visa_copy,
-        name="delete_visa_copy",
-    ),
 
     path('download/', views.download_file, name='download_file'),
 
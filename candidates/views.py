@@ -5,11 +5,20 @@ from urllib.parse import quote
 import unicodedata
 import vobject
 from django.contrib import messages
-from django.contrib.postgres.search import SearchVector
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.core.files.storage import storages
 from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.shortcuts import render
+from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.utils.text import capfirst
+
+from background_tasks.models import Task
+from utilities.files import file_fields
+from utilities.history import HISTORY_TYPES, describe_changes, history_changes
 
 from .forms import (
     CandidateForm,
@@ -20,7 +29,17 @@ from .forms import (
     CandidateApplicationDataForm,
     LicenseForm, )
 from .forms import CandidateSearchForm
+from .exporters import EXPORT_FORMATS, export_queryset, iter_csv
+from .expirations import (
+    EXPIRATION_WINDOWS,
+    EXPIRATIONS_MAX_PAGE_SIZE,
+    EXPIRATIONS_PAGE_SIZE,
+    ExpirationCursor,
+    cached_expirations,
+)
+from .pipeline import PIPELINE_STAGES, STAGES_BY_KEY, pipeline_counts, stage_queryset
 from .models import (
+    Candidate,
     Education,
     Experience,
     Language,
@@ -28,22 +47,34 @@ from .models import (
     CandidateApplicationData,
     License,
 )
+from .storage_usage import candidate_usage
+from .tasks import export_candidates
+from .queries import (
+    ANNOTATED_SORT_FIELDS,
+    candidate_sort_criteria,
+    search_candidates,
+    search_suggestions,
+    with_experience_annotations,
+)
 
 
 def candidate_list(request):
     # Sorting logic
     sort_by = request.GET.get("sort", "created_at")  # Default sorting by created_at
     order = request.GET.get("order", "desc")  # Default order is descending
-    order_prefix = "-" if order == "desc" else ""
 
-    # Map "full_name" to "first_name" and add secondary sorting for other name fields
-    if sort_by == "full_name":
-        sort_criteria = [f"{order_prefix}first_name", f"{order_prefix}second_name", f"{order_prefix}last_name"]
-    else:
-        sort_criteria = [f"{order_prefix}{sort_by}"]
+    # Map "full_name" to "first_name" and add secondary sorting for other name fields,
+    # computed columns (total experience, departments) are sorted on SQL annotations
+    sort_criteria = candidate_sort_criteria(sort_by, order)
 
-    # Query and sort candidates
-    candidates = Candidate.objects.all().order_by(*sort_criteria)
+    # Query and sort candidates; the rows show the nationality and the
+    # experience totals / departments, so load those with the page.
+    candidates = Candidate.objects.select_related("nationality").prefetch_related(
+        "experiences__departments"
+    )
+    if sort_by in ANNOTATED_SORT_FIELDS:
+        candidates = with_experience_annotations(candidates)
+    candidates = candidates.order_by(*sort_criteria)
 
     # Items per page logic
     per_page = request.GET.get("per_page", 10)  # Default is 10 items per page
@@ -79,12 +110,40 @@ def candidate_list(request):
 
 
 def candidate_detail(request, pk):
-    candidate = get_object_or_404(Candidate, pk=pk)
+    candidate = get_object_or_404(
+        Candidate.objects.select_related("nationality", "country"), pk=pk
+    )
 
-    context = {"candidate": candidate}
+    context = {"candidate": candidate, "storage_usage": candidate_usage(candidate)}
     return render(request, "candidates/candidate_detail.html", context)
 
 
+def candidate_history(request, pk):
+    """The candidate's versions, newest first, with only the changed fields."""
+    candidate = get_object_or_404(Candidate, pk=pk)
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+    history_model = Candidate.history.model
+    versions, has_next = history_changes(history_model, candidate.pk, page)
+    users = get_user_model().objects.in_bulk(
+        {version["history_user_id"] for version in versions} - {None}
+    )
+    for version in versions:
+        version["action"] = HISTORY_TYPES[version["history_type"]]
+        version["user"] = users.get(version["history_user_id"])
+        version["changes"] = describe_changes(history_model, version["changes"] or {})
+
+    context = {
+        "candidate": candidate,
+        "versions": versions,
+        "page": page,
+        "has_next": has_next,
+    }
+    return render(request, "candidates/candidate_history.html", context)
+
+
 def candidate_create(request):
     if request.method == "POST":
         form = CandidateForm(request.POST, request.FILES)
@@ -416,240 +475,48 @@ def license_delete(request, pk):
 
 # DELETE FILE VIEW
 
-
-# View to delete resume
-def delete_resume(request, candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    if request.method == "GET":
-        try:
-            candidate.delete_resume()
-            messages.success(request, "Resume deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting resume: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete personal image
-def delete_personal_image(request, candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    if request.method == "GET":
-        try:
-            candidate.delete_image()
-            messages.success(request, "Personal image deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting personal image: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete national ID copy
-def delete_id_copy(request, candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    if request.method == "GET":
-        try:
-            candidate.delete_id_copy()
-            messages.success(request, "National ID copy deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting national ID copy: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete passport copy
-def delete_passport_copy(request, candidate_pk):
-    candidate = get_object_or_404(Candidate, pk=candidate_pk)
-    if request.method == "GET":
-        try:
-            candidate.delete_passport_copy()
-            messages.success(request, "Passport copy deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting passport copy: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete education certification
-def delete_education_certification(request, education_pk):
-    education = get_object_or_404(Education, pk=education_pk)
-    candidate = education.candidate
-    if request.method == "GET":
-        try:
-            education.delete_certification_copy()
-            messages.success(request, "Education certification deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting education certification: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete education transcript
-def delete_education_transcript(request, education_pk):
-    education = get_object_or_404(Education, pk=education_pk)
-    candidate = education.candidate
-    if request.method == "GET":
-        try:
-            education.delete_transcript_copy()
-            messages.success(request, "Education certification deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting education certification: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete experience certification
-def delete_experience_certification(request, experience_pk):
-    experience = get_object_or_404(Experience, pk=experience_pk)
-    candidate = experience.candidate
-    if request.method == "GET":
-        try:
-            experience.delete_certification_copy()
-            messages.success(request, "Experience certification deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting experience certification: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete training course certification
-def delete_training_course_certification(request, training_course_pk):
-    training_course = get_object_or_404(TrainingCourse, pk=training_course_pk)
-    candidate = training_course.candidate
-    if request.method == "GET":
-        try:
-            training_course.delete_certification_copy()
-            messages.success(
-                request, "Training course certification deleted successfully."
-            )
-        except Exception as e:
-            messages.error(
-                request, f"Error deleting training course certification: {e}"
-            )
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete license copy
-def delete_license_copy(request, license_pk):
-    _license = get_object_or_404(License, pk=license_pk)
-    candidate = _license.candidate
-    if request.method == "GET":
-        try:
-            _license.delete_license_copy()
-            messages.success(request, "License copy deleted successfully.")
-        except Exception as e:
-            messages.error(request, f"Error deleting license copy: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete Blood Test Report
-def delete_blood_test_report(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
+# Candidate records whose files delete_files can delete, by model name.
+FILE_MODELS = {
+    model._meta.model_name: model
+    for model in (
+        Candidate,
+        Education,
+        Experience,
+        TrainingCourse,
+        License,
+        CandidateApplicationData,
     )
-    try:
-        candidate_data.delete_blood_test_report()
-        messages.success(request, "Blood Test Report deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting Blood Test Report: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
+}
 
 
-# View to delete X-Ray Test Report
-def delete_xray_test_report(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_xray_test_report()
-        messages.success(request, "X-Ray Test Report deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting X-Ray Test Report: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete Fit to Work Report
-def delete_fit_to_work_report(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_fit_to_work_report()
-        messages.success(request, "Fit to Work Report deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting Fit to Work Report: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# delete_dataflow_certificate
-def delete_dataflow_certificate(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_dataflow_certificate_copy()
-        messages.success(request, "Dataflow Certificate deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting Dataflow Certificate: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete Pregnancy Report
-def delete_pregnancy_report(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_pregnancy_report()
-        messages.success(request, "Pregnancy Report deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting Pregnancy Report: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete DHP Certificate Copy
-def delete_dhp_certificate(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_dhp_certificate()
-        messages.success(request, "DHP Certificate deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting DHP Certificate: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete Prometric Certificate Copy
-def delete_prometric_certificate(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_prometric_certificate()
-        messages.success(request, "Prometric Certificate deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting Prometric Certificate: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete Police Clearance Certificate Copy
-def delete_police_clearance_copy(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_police_clearance_copy()
-        messages.success(request, "Police Clearance Certificate deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting Police Clearance Certificate: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
-
-
-# View to delete Visa Copy
-def delete_visa_copy(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
+def delete_files(request, model_name, pk):
+    """
+    Delete the files named by the ``field`` parameters (one or more) of a
+    candidate record in one update, then go back to the referring page.
+    """
+    model = FILE_MODELS.get(model_name)
+    if model is None:
+        raise Http404("Unknown record type")
+    instance = get_object_or_404(model, pk=pk)
+    fields = file_fields(model)
+    names = request.GET.getlist("field")
+    if not names or any(name not in fields for name in names):
+        raise Http404("Unknown file field")
+
+    labels = ", ".join(str(fields[name].verbose_name) for name in names)
     try:
-        candidate_data.delete_visa_copy()
-        messages.success(request, "Visa Copy deleted successfully.")
+        instance.clear_files(*names)
+        messages.success(request, f"{capfirst(labels)} deleted successfully.")
     except Exception as e:
-        messages.error(request, f"Error deleting Visa Copy: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
+        messages.error(request, f"Error deleting {labels}: {e}")
 
+    next_url = request.META.get("HTTP_REFERER")
+    if not url_has_allowed_host_and_scheme(
+        next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()
+    ):
+        candidate_pk = instance.pk if model is Candidate else instance.candidate_id
+        next_url = reverse("candidates:candidate_detail", args=[candidate_pk])
+    return redirect(next_url)
 
 
 # views.py
@@ -664,14 +531,7 @@ def candidate_search_view(request):
 
     if form.is_valid():
         query = form.cleaned_data.get("query")
-        if query:
-            candidates = Candidate.objects.annotate(
-                search=SearchVector(
-                    'first_name', 'second_name', 'third_name', 'last_name',
-                    'national_id_number', 'passport_id',
-                    'whatsapp_phone_number', 'call_phone_number', 'email'
-                )
-            ).filter(search=query)
+        candidates = search_candidates(candidates, query)
 
     # Sorting logic
     sort_by = request.GET.get("sort", "first_name")  # Default sort field
@@ -695,137 +555,238 @@ def candidate_search_view(request):
     return render(request, "candidates/search.html", context)
 
 
-# baseapp/candidates/views.py
-import urllib.parse
-
-def download_file(request):
-    """
-    Download a file by its key from the S3 bucket and return as response.
-    """
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-    )
-    bucket_name = settings.AWS_STORAGE_BUCKET_NAME
+async def candidate_search_suggest(request):
+    """JSON suggestions for the search box, read with the async ORM."""
+    query = request.GET.get("q", "").strip()
+    if len(query) < 2:
+        return JsonResponse({"results": []})
+    results = [
+        {
+            "id": candidate.pk,
+            "name": candidate.full_name,
+            "email": candidate.email,
+            "url": reverse("candidates:candidate_detail", args=[candidate.pk]),
+        }
+        async for candidate in search_suggestions(query)
+    ]
+    return JsonResponse({"results": results})
 
-    file_url = request.GET.get('file_key')
 
-    if not file_url:
-        return HttpResponse("File key not provided", status=400)
+def candidate_export(request):
+    """
+    Export the candidates matching the current list sort / search query.
 
-    try:
-        # Decode URL-encoded file URL
-        file_url = urllib.parse.unquote(file_url)
-
-        # Extract key from the file URL
-        file_key = file_url.replace(f"https://{bucket_name}.s3.amazonaws.com/", "")
-        file_key = file_key.lstrip('/')
-
-        # Get file from S3
-        response = s3_client.get_object(Bucket=bucket_name, Key=file_key)
-
-        # Return file as HTTP response
-        file_data = response['Body'].read()
-        content_type = response.get('ContentType', 'application/octet-stream')
-
-        return HttpResponse(
-            file_data,
-            content_type=content_type,
-            headers={
-                'Content-Disposition': f'attachment; filename="{file_key.split("/")[-1]}"',
-            }
+    CSV is streamed straight to the client; XLSX and Parquet are built by a
+    background task and the user is sent to its progress page.
+    """
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponse("Unsupported export format", status=400)
+
+    if export_format == "csv":
+        candidates = export_queryset(request.GET)
+        response = StreamingHttpResponse(
+            streaming_content(request, iter_csv(candidates), database=True),
+            content_type="text/csv",
         )
-    except NoCredentialsError:
-        return HttpResponse("AWS credentials not available", status=500)
-    except PartialCredentialsError:
-        return HttpResponse("Incomplete AWS credentials", status=500)
-    except s3_client.exceptions.NoSuchKey:
-        raise Http404("File not found")
-    except Exception as e:
-        return HttpResponse(f"An error occurred: {str(e)}", status=500)
+        response["Content-Disposition"] = 'attachment; filename="candidates.csv"'
+        return response
 
+    params = {key: request.GET.get(key) for key in ("query", "sort", "order") if request.GET.get(key)}
+    task = export_candidates.enqueue(params, export_format, user=request.user)
+    return redirect("background_tasks:task_detail", pk=task.pk)
 
-# baseapp/candidates/views.py
 
-import zipfile
-from django.http import HttpResponse, Http404, StreamingHttpResponse
-import boto3
-from botocore.exceptions import NoCredentialsError, PartialCredentialsError
-from django.conf import settings
-from .models import Candidate, get_candidate_directory
-from django.contrib.auth.decorators import login_required
-import zipstream  # For streaming large ZIP files
-
-@login_required
-def download_candidate_directory(request, candidate_id):
+def export_download(request, name):
     """
-    Download the candidate's directory from S3 as a ZIP file.
+    Send the user who queued an export (or staff) to a signed URL of the
+    file, valid for a few minutes.
     """
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-    )
-    bucket_name = settings.AWS_STORAGE_BUCKET_NAME
-
+    task = Task.objects.filter(
+        name=export_candidates.name, status=Task.SUCCEEDED, result__name=name
+    ).first()
+    if task is None or not task.is_visible_to(request.user):
+        raise Http404("No export matches the given query.")
+    storage = storages["exports"]
+    if not storage.exists(name):
+        raise Http404("The export has expired.")
+    return redirect(storage.url(name))
+
+
+def _expiration_params(request):
+    """Validated (days, cursor, limit) from the query string; raises ValueError."""
+    days = int(request.GET.get("days", EXPIRATION_WINDOWS[0]))
+    if days not in EXPIRATION_WINDOWS:
+        raise ValueError(f"days must be one of {EXPIRATION_WINDOWS}")
+    cursor = request.GET.get("cursor")
+    after = ExpirationCursor.decode(cursor) if cursor else None
+    limit = min(int(request.GET.get("limit", EXPIRATIONS_PAGE_SIZE)), EXPIRATIONS_MAX_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return days, after, limit
+
+
+def expirations_dashboard(request):
     try:
-        # Get the candidate instance
-        candidate = Candidate.objects.get(pk=candidate_id)
+        days, after, limit = _expiration_params(request)
+    except ValueError as e:
+        return HttpResponse(str(e), status=400)
+    expirations = cached_expirations(days, after, limit)
+    context = {
+        "days": days,
+        "windows": EXPIRATION_WINDOWS,
+        "limit": limit,
+        "rows": expirations["rows"],
+        "counts": expirations["counts"],
+        "next_cursor": expirations["next_cursor"],
+    }
+    return render(request, "candidates/expirations.html", context)
 
-        # Construct the candidate directory path
-        candidate_directory = get_candidate_directory(candidate)
 
-        # Ensure the directory path ends with '/'
-        if not candidate_directory.endswith('/'):
-            candidate_directory += '/'
+def pipeline_board(request):
+    context = {"stages": PIPELINE_STAGES, **pipeline_counts()}
+    return render(request, "candidates/pipeline_board.html", context)
 
-        # List all objects in the candidate's directory
-        paginator = s3_client.get_paginator('list_objects_v2')
-        page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=candidate_directory)
 
-        # Initialize zipstream.ZipFile for streaming
-        z = zipstream.ZipFile(mode='w', compression=zipfile.ZIP_DEFLATED)
+def pipeline_stage(request, stage=None):
+    """Drill-down list behind one cell of the pipeline board."""
+    if stage is not None and stage not in STAGES_BY_KEY:
+        raise Http404("Unknown pipeline stage")
+    job = request.GET.get("job")
+    user = request.GET.get("user")
+    for value in (job, user):
+        if value and value != "none" and not value.isdigit():
+            raise Http404("Unknown pipeline group")
+    application_data = stage_queryset(stage, job=job, user=user)
 
-        files_found = False
-        for page in page_iterator:
-            if 'Contents' in page:
-                files_found = True
-                for obj in page['Contents']:
-                    file_key = obj['Key']
+    try:
+        per_page = max(int(request.GET.get("per_page", 20)), 1)
+    except ValueError:
+        per_page = 20
+    paginator = Paginator(application_data, per_page)
+    page_obj = paginator.get_page(request.GET.get("page"))
 
-                    # Exclude directories
-                    if file_key.endswith('/'):
-                        continue
+    context = {
+        "stage": STAGES_BY_KEY.get(stage),
+        "application_data": page_obj,
+        "job": job,
+        "user": user,
+        "per_page": per_page,
+    }
+    return render(request, "candidates/pipeline_stage.html", context)
 
-                    # Get the file content as a stream
-                    file_obj = s3_client.get_object(Bucket=bucket_name, Key=file_key)
-                    file_stream = file_obj['Body']
 
-                    # Use relative paths inside the ZIP file
-                    relative_path = file_key[len(candidate_directory):]
+def expirations_feed(request):
+    """JSON version of the expirations dashboard, paginated with ``cursor``."""
+    try:
+        days, after, limit = _expiration_params(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    expirations = cached_expirations(days, after, limit)
+    return JsonResponse(
+        {
+            "days": days,
+            "counts": expirations["counts"],
+            "results": [
+                {
+                    "document": row["document"],
+                    "detail": row["detail"],
+                    "expires_on": row["expires_on"],
+                    "days_left": row["days_left"],
+                    "candidate": {
+                        "id": row["owner_id"],
+                        "name": row["candidate_name"],
+                        "url": reverse("candidates:candidate_detail", args=[row["owner_id"]]),
+                    },
+                }
+                for row in expirations["rows"]
+            ],
+            "next_cursor": expirations["next_cursor"],
+        }
+    )
 
-                    # Add the file to the ZIP archive
-                    z.write_iter(relative_path, file_stream)
 
-        if not files_found:
-            return HttpResponse("No files found in the candidate's directory.", status=404)
+# baseapp/candidates/views.py
+import zipfile
+from django.http import HttpResponse, StreamingHttpResponse
+from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from django.conf import settings
+from .models import Candidate
+from .storage_gc import candidate_files
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+import zipstream  # For streaming large ZIP files
+from .s3 import (
+    S3_CHUNK_SIZE,
+    iter_object,
+    object_key_from_url,
+    run_blocking,
+    s3_client,
+    streaming_content,
+)
 
-        # Stream the ZIP file as HTTP response
-        response = StreamingHttpResponse(z, content_type='application/zip')
-        response['Content-Disposition'] = f'attachment; filename="{candidate.full_name}_files.zip"'
 
-        return response
+async def download_file(request):
+    """
+    Stream a file from the S3 bucket by its key (or URL).
+    """
+    file_url = request.GET.get('file_key')
+    if not file_url:
+        return HttpResponse("File key not provided", status=400)
 
-    except Candidate.DoesNotExist:
-        raise Http404("Candidate not found.")
+    file_key = object_key_from_url(file_url)
+    try:
+        s3_object = await run_blocking(
+            lambda: s3_client().get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_key)
+        )
     except NoCredentialsError:
-        return HttpResponse("AWS credentials not available.", status=500)
+        return HttpResponse("AWS credentials not available", status=500)
     except PartialCredentialsError:
-        return HttpResponse("Incomplete AWS credentials.", status=500)
-    except Exception as e:
+        return HttpResponse("Incomplete AWS credentials", status=500)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+            raise Http404("File not found")
         return HttpResponse(f"An error occurred: {str(e)}", status=500)
 
+    response = StreamingHttpResponse(
+        streaming_content(request, s3_object['Body'].iter_chunks(S3_CHUNK_SIZE)),
+        content_type=s3_object.get('ContentType', 'application/octet-stream'),
+        headers={
+            'Content-Disposition': f'attachment; filename="{file_key.split("/")[-1]}"',
+        },
+    )
+    if 'ContentLength' in s3_object:
+        response['Content-Length'] = s3_object['ContentLength']
+    return response
+
+
+@login_required
+async def download_candidate_directory(request, candidate_id):
+    """
+    Download the candidate's directory from S3 as a streamed ZIP file.
+    """
+    try:
+        candidate = await Candidate.objects.aget(pk=candidate_id)
+    except Candidate.DoesNotExist:
+        raise Http404("Candidate not found.")
+
+    # The file fields, not a listing of the candidate's directory: shared
+    # (content-addressed) files are stored outside of it.
+    files = await sync_to_async(candidate_files)(candidate)
+    if not files:
+        return HttpResponse("No files found for the candidate.", status=404)
+
+    z = zipstream.ZipFile(mode='w', compression=zipfile.ZIP_DEFLATED)
+    for archive_name, file_key in files:
+        # Each object is only fetched when the archive reaches it.
+        z.write_iter(archive_name, iter_object(file_key))
+
+    response = StreamingHttpResponse(
+        streaming_content(request, z), content_type='application/zip'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{candidate.full_name}_files.zip"'
+    return response
+
 
 # baseapp/candidates/views.py (continued)
 def slugify_filename(filename):
@@ -928,15 +889,3 @@ def generate_candidate_vcf(candidate):
     vcf_content = vcard.serialize()
 
     return vcf_content
-
-
-def delete_prometric_appointment_copy(request, candidate_id):
-    candidate_data = get_object_or_404(
-        CandidateApplicationData, candidate_id=candidate_id
-    )
-    try:
-        candidate_data.delete_prometric_appointment_copy()
-        messages.success(request, "Prometric Appointment Copy deleted successfully.")
-    except Exception as e:
-        messages.error(request, f"Error deleting Prometric Appointment Copy: {e}")
-    return redirect(request.META.get("HTTP_REFERER"))
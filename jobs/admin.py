@@ -1,15 +1,30 @@
 from django.contrib import admin
-from .models import JobOpportunity
+
+from utilities.admin_mixins import LargeTableAdminMixin, LookupListFilter
+
+from .models import JobOpportunity, JobCandidateMatch
 
 @admin.register(JobOpportunity)
 class JobOpportunityAdmin(admin.ModelAdmin):
     list_display = ('job_title', 'job_department', 'company_name', 'created_at')
+    list_select_related = ('job_department',)
     search_fields = ('job_title', 'company_name')
-    list_filter = ('job_department', 'gender')
-    filter_horizontal = (
+    list_filter = (('job_department', LookupListFilter), 'gender')
+    # Searched as you type rather than rendering every candidate/lookup row.
+    autocomplete_fields = (
+        'job_department',
         'accepted_degrees',
         'fields_of_study',
         'nationalities',
         'departments',
         'candidates',
     )
+
+
+@admin.register(JobCandidateMatch)
+class JobCandidateMatchAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('job', 'candidate', 'score', 'is_compatible', 'computed_at')
+    list_filter = ('is_compatible', 'job')
+    list_select_related = ('job', 'candidate')
+    raw_id_fields = ('job', 'candidate')
+    readonly_fields = ('computed_at',)
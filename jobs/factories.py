@@ -0,0 +1,46 @@
+# jobs/factories.py
+import factory
+from factory.django import DjangoModelFactory
+
+from utilities.factories import (
+    DegreeChoicesFactory,
+    DepartmentFactory,
+    FieldOfStudyFactory,
+)
+
+from .models import JobOpportunity
+
+
+class JobOpportunityFactory(DjangoModelFactory):
+    class Meta:
+        model = JobOpportunity
+        skip_postgeneration_save = True
+
+    job_title = factory.Iterator(["Staff Nurse", "ICU Nurse", "ER Nurse"])
+    job_description = factory.Faker("paragraph")
+    job_department = factory.SubFactory(DepartmentFactory)
+    company_name = factory.Faker("company")
+    minimum_years_of_experience = 2
+    minimum_age = 22
+    maximum_age = 50
+    gender = "Any"
+
+    @factory.post_generation
+    def accepted_degrees(self, create, extracted, **kwargs):
+        if create:
+            self.accepted_degrees.set(extracted or [DegreeChoicesFactory(degree="Bachelor")])
+
+    @factory.post_generation
+    def fields_of_study(self, create, extracted, **kwargs):
+        if create:
+            self.fields_of_study.set(extracted or [FieldOfStudyFactory(field_of_study="Nursing")])
+
+    @factory.post_generation
+    def nationalities(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.nationalities.set(extracted)
+
+    @factory.post_generation
+    def departments(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.departments.set(extracted)
@@ -1,8 +1,11 @@
 from django import forms
 from django.utils.translation import gettext_lazy as _
+
+from utilities.lookups import LookupChoicesMixin
+
 from .models import JobOpportunity
 
-class JobOpportunityForm(forms.ModelForm):
+class JobOpportunityForm(LookupChoicesMixin, forms.ModelForm):
     class Meta:
         model = JobOpportunity
         fields = [
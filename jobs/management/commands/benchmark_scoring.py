@@ -0,0 +1,137 @@
+import random
+import time
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.models import Candidate
+from jobs.scoring import rank_candidates, score_pool
+
+
+def _per_object_scores(candidates, experiences, department_ids, today):
+    """The relativedelta-per-experience path the compatible list used to take."""
+    by_candidate = {}
+    for candidate_id, experience_id, start_date, end_date, department_id in experiences:
+        experience = by_candidate.setdefault(candidate_id, {}).setdefault(
+            experience_id, [start_date, end_date, set()]
+        )
+        if department_id is not None:
+            experience[2].add(department_id)
+
+    scores = {}
+    for candidate_id, birthday in candidates:
+        total_months = department_months = 0
+        covered = set()
+        for start_date, end_date, departments in by_candidate.get(candidate_id, {}).values():
+            delta = relativedelta(end_date or today, start_date)
+            months = delta.years * 12 + delta.months
+            total_months += months
+            if departments & department_ids:
+                department_months += months
+                covered |= departments & department_ids
+        age = relativedelta(today, birthday).years if birthday else -1
+        coverage = len(covered) / len(department_ids) if department_ids else 1.0
+        if not department_ids:
+            department_months = total_months
+        scores[candidate_id] = (coverage, department_months, total_months, age)
+    return sorted(
+        scores, key=lambda pk: (-scores[pk][0], -scores[pk][1], -scores[pk][2], pk)
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare vectorized candidate scoring (jobs.scoring) with the per-object "
+        "relativedelta path on synthetic candidates, or on the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--candidates", type=int, default=50000)
+        parser.add_argument("--max-experiences", type=int, default=5)
+        parser.add_argument("--departments", type=int, default=20)
+        parser.add_argument(
+            "--required-departments",
+            type=int,
+            default=3,
+            help="Departments a job requires experience in.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--database",
+            action="store_true",
+            help="Benchmark against the candidates in the database instead.",
+        )
+
+    def handle(self, *args, **options):
+        if options["database"]:
+            return self.benchmark_database(options)
+
+        rng = random.Random(options["seed"])
+        today = date.today()
+        candidates, experiences = [], []
+        experience_id = 0
+        for candidate_id in range(1, options["candidates"] + 1):
+            birthday = today - timedelta(days=rng.randint(18 * 365, 60 * 365))
+            candidates.append((candidate_id, None if rng.random() < 0.01 else birthday))
+            for _ in range(rng.randint(0, options["max_experiences"])):
+                experience_id += 1
+                start_date = today - timedelta(days=rng.randint(30, 20 * 365))
+                end_date = None
+                if rng.random() < 0.7:
+                    end_date = start_date + timedelta(days=rng.randint(30, (today - start_date).days))
+                departments = rng.sample(range(1, options["departments"] + 1), rng.randint(0, 2))
+                for department_id in departments or [None]:
+                    experiences.append(
+                        (candidate_id, experience_id, start_date, end_date, department_id)
+                    )
+        required = set(range(1, options["required_departments"] + 1))
+        self.stdout.write(
+            f"{len(candidates)} candidates, {experience_id} experiences, "
+            f"{len(experiences)} experience/department rows"
+        )
+
+        started = time.perf_counter()
+        expected = _per_object_scores(candidates, experiences, required, today)
+        per_object = time.perf_counter() - started
+
+        started = time.perf_counter()
+        ranked = score_pool(
+            [pk for pk, _ in candidates],
+            [birthday for _, birthday in candidates],
+            experiences,
+            required,
+            today,
+        ).ranked_ids()
+        vectorized = time.perf_counter() - started
+
+        if ranked != expected:
+            raise CommandError("Vectorized ranking differs from the per-object ranking.")
+        self.report(per_object, vectorized)
+
+    def benchmark_database(self, options):
+        candidates = Candidate.objects.all()
+        department_ids = set(range(1, options["required_departments"] + 1))
+
+        started = time.perf_counter()
+        per_object = sorted(
+            candidates.prefetch_related("experiences"),
+            key=lambda candidate: (
+                -candidate.get_total_experience_years_based_on_departments(department_ids),
+                -candidate.get_total_experience_years(),
+                candidate.pk,
+            ),
+        )
+        per_object_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        rank_candidates(candidates, department_ids, keys=("department_months", "experience_months"))
+        vectorized_time = time.perf_counter() - started
+
+        self.stdout.write(f"{len(per_object)} candidates in the database")
+        self.report(per_object_time, vectorized_time)
+
+    def report(self, per_object, vectorized):
+        self.stdout.write(f"per-object: {per_object:.3f}s")
+        self.stdout.write(f"vectorized: {vectorized:.3f}s")
+        self.stdout.write(self.style.SUCCESS(f"speedup: {per_object / vectorized:.1f}x"))
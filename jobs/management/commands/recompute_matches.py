@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from jobs.matching import refresh_all_matches, refresh_candidate_matches, refresh_job_matches
+from jobs.models import JobOpportunity
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the job / candidate match table. Run it daily: ages and "
+        "ongoing experience change with the date alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job", type=int, action="append", help="Only this job (repeatable).")
+        parser.add_argument(
+            "--candidate", type=int, action="append", help="Only this candidate (repeatable)."
+        )
+
+    def handle(self, *args, **options):
+        if options["candidate"]:
+            total = refresh_candidate_matches(options["candidate"])
+        elif options["job"]:
+            total = sum(
+                refresh_job_matches(job)
+                for job in JobOpportunity.objects.filter(pk__in=options["job"])
+            )
+        else:
+            total = refresh_all_matches(
+                progress=lambda done, count: self.stdout.write(f"{done}/{count} jobs")
+            )
+        self.stdout.write(self.style.SUCCESS(f"Recomputed {total} matches."))
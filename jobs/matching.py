@@ -0,0 +1,339 @@
+# jobs/matching.py
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, Min, OuterRef
+
+from candidates.models import Candidate, Education, Experience
+from utilities.cache import cache_timeout
+from utilities.lookups import lookup_table
+from utilities.models import Department
+
+from . import scoring
+from .models import JobCandidateMatch, JobOpportunity
+
+logger = logging.getLogger(__name__)
+
+MATCH_BATCH_SIZE = 1000
+# Columns a refresh overwrites on an existing match.
+MATCH_UPDATE_FIELDS = [
+    "score",
+    "gender_ok",
+    "age_ok",
+    "nationality_ok",
+    "degree_ok",
+    "field_of_study_ok",
+    "experience_ok",
+    "department_experience_ok",
+    "is_compatible",
+    "experience_months",
+    "department_experience_months",
+    "computed_at",
+]
+
+COMPATIBLE_JOBS_CACHE_TIMEOUT = 60 * 60 * 24
+JOBS_VERSION_CACHE_KEY = "jobs:requirements_version"
+
+# Points (out of 100) for each criterion. The two experience criteria give
+# partial credit in proportion to the required years.
+MATCH_WEIGHTS = {
+    "gender": 10,
+    "age": 15,
+    "nationality": 15,
+    "degree": 15,
+    "field_of_study": 15,
+    "experience": 15,
+    "department_experience": 15,
+}
+
+
+@dataclass
+class CandidateProfile:
+    pk: int
+    gender: str
+    birthday: date
+    nationality_id: int
+    # (degree_id, field_of_study_id) per education
+    educations: list = field(default_factory=list)
+    # (months, {department_id, ...}) per experience
+    experiences: list = field(default_factory=list)
+
+    @property
+    def experience_months(self):
+        return sum(months for months, _ in self.experiences)
+
+    def department_experience_months(self, department_ids):
+        return sum(
+            months for months, departments in self.experiences if departments & department_ids
+        )
+
+
+@dataclass
+class JobRequirements:
+    job: JobOpportunity
+    nationality_ids: set
+    degree_ids: set
+    field_of_study_ids: set
+    department_ids: set
+
+
+def load_profiles(candidate_ids=None, today=None):
+    """Matching facts of the given (or all) candidates, in four queries."""
+    today = today or date.today()
+    candidates = Candidate.objects.all()
+    educations = Education.objects.all()
+    experiences = Experience.objects.all()
+    if candidate_ids is not None:
+        candidates = candidates.filter(pk__in=candidate_ids)
+        educations = educations.filter(candidate_id__in=candidate_ids)
+        experiences = experiences.filter(candidate_id__in=candidate_ids)
+
+    profiles = {
+        pk: CandidateProfile(pk, gender, birthday, nationality_id)
+        for pk, gender, birthday, nationality_id in candidates.values_list(
+            "pk", "gender", "birthday", "nationality_id"
+        ).iterator(chunk_size=MATCH_BATCH_SIZE)
+    }
+    for candidate_id, degree_id, field_of_study_id in educations.values_list(
+        "candidate_id", "degree_id", "field_of_study_id"
+    ).iterator(chunk_size=MATCH_BATCH_SIZE):
+        # Rows of candidates created after the first query are skipped.
+        if candidate_id in profiles:
+            profiles[candidate_id].educations.append((degree_id, field_of_study_id))
+
+    experience_departments = defaultdict(set)
+    for experience_id, department_id in Experience.departments.through.objects.filter(
+        experience__in=experiences
+    ).values_list("experience_id", "department_id").iterator(chunk_size=MATCH_BATCH_SIZE):
+        experience_departments[experience_id].add(department_id)
+    experience_rows = list(
+        experiences.values_list("pk", "candidate_id", "start_date", "end_date").iterator(
+            chunk_size=MATCH_BATCH_SIZE
+        )
+    )
+    if experience_rows:
+        pks, candidate_ids, start_dates, end_dates = zip(*experience_rows)
+        months = scoring.months_between(
+            scoring.to_dates(start_dates), scoring.to_dates(end_dates, default=today)
+        )
+        for pk, candidate_id, experience_months in zip(pks, candidate_ids, months.tolist()):
+            if candidate_id in profiles:
+                profiles[candidate_id].experiences.append(
+                    (experience_months, experience_departments[pk])
+                )
+    return profiles
+
+
+def load_requirements(jobs):
+    jobs = jobs.prefetch_related(
+        "nationalities", "accepted_degrees", "fields_of_study", "departments"
+    )
+    return [
+        JobRequirements(
+            job,
+            {obj.pk for obj in job.nationalities.all()},
+            {obj.pk for obj in job.accepted_degrees.all()},
+            {obj.pk for obj in job.fields_of_study.all()},
+            {obj.pk for obj in job.departments.all()},
+        )
+        for job in jobs
+    ]
+
+
+def evaluate(requirements, profile, today=None):
+    """Score one candidate against one job; returns an unsaved JobCandidateMatch."""
+    today = today or date.today()
+    job = requirements.job
+    age = relativedelta(today, profile.birthday).years if profile.birthday else None
+    required_months = job.minimum_years_of_experience * 12
+
+    experience_months = profile.experience_months
+    if requirements.department_ids:
+        department_months = profile.department_experience_months(requirements.department_ids)
+    else:
+        department_months = experience_months
+
+    checks = {
+        "gender": job.gender == "Any" or profile.gender == job.gender,
+        "age": age is not None and job.minimum_age <= age <= job.maximum_age,
+        "nationality": profile.nationality_id in requirements.nationality_ids,
+        "degree": any(
+            degree_id in requirements.degree_ids for degree_id, _ in profile.educations
+        ),
+        # The field of study has to belong to an education with an accepted degree.
+        "field_of_study": any(
+            degree_id in requirements.degree_ids
+            and field_of_study_id in requirements.field_of_study_ids
+            for degree_id, field_of_study_id in profile.educations
+        ),
+        "experience": experience_months >= required_months,
+        "department_experience": department_months >= required_months,
+    }
+
+    score = 0
+    for criterion, passed in checks.items():
+        weight = MATCH_WEIGHTS[criterion]
+        if criterion in ("experience", "department_experience") and not passed:
+            months = experience_months if criterion == "experience" else department_months
+            score += weight * months / required_months
+        elif passed:
+            score += weight
+
+    return JobCandidateMatch(
+        job=job,
+        candidate_id=profile.pk,
+        score=round(score),
+        gender_ok=checks["gender"],
+        age_ok=checks["age"],
+        nationality_ok=checks["nationality"],
+        degree_ok=checks["degree"],
+        field_of_study_ok=checks["field_of_study"],
+        experience_ok=checks["experience"],
+        department_experience_ok=checks["department_experience"],
+        is_compatible=all(checks.values()),
+        experience_months=experience_months,
+        department_experience_months=department_months,
+    )
+
+
+def save_matches(matches):
+    """
+    Insert or update ``matches`` in place. Refreshes of the same job or
+    candidate may run at the same time (workers, on-commit refreshes): an
+    upsert lets them overlap where a delete and insert would violate
+    unique_job_candidate_match. Rows are written in (candidate, job) order,
+    so concurrent refreshes lock them in the same order and cannot deadlock.
+    Matches of deleted jobs and candidates go with them (CASCADE).
+    """
+    matches.sort(key=lambda match: (match.candidate_id, match.job_id))
+    with transaction.atomic():
+        JobCandidateMatch.objects.bulk_create(
+            matches,
+            batch_size=MATCH_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["job", "candidate"],
+            update_fields=MATCH_UPDATE_FIELDS,
+        )
+
+
+def refresh_job_matches(job, profiles=None):
+    """Rebuild every candidate's match with one job."""
+    profiles = load_profiles() if profiles is None else profiles
+    [requirements] = load_requirements(JobOpportunity.objects.filter(pk=job.pk))
+    today = date.today()
+    matches = [evaluate(requirements, profile, today) for profile in profiles.values()]
+    save_matches(matches)
+    logger.info("Recomputed %s matches for job %s", len(matches), job.pk)
+    return len(matches)
+
+
+def job_matches_are_stale(job):
+    """
+    True when the stored matches of ``job`` may not reflect the job or the
+    candidates any more: the job changed after its matches were computed, or
+    a candidate was created or changed since without getting a newer match
+    (their refreshes are left to the background workers).
+    """
+    oldest = job.matches.aggregate(oldest=Min("computed_at"))["oldest"]
+    if oldest is None or job.updated_at > oldest:
+        return True
+    fresh = JobCandidateMatch.objects.filter(
+        job=job, candidate=OuterRef("pk"), computed_at__gte=OuterRef("updated_at")
+    )
+    return Candidate.objects.filter(updated_at__gt=oldest).filter(~Exists(fresh)).exists()
+
+
+def refresh_candidate_matches(candidate_ids):
+    """Rebuild the matches of the given candidates with every job."""
+    profiles = load_profiles(candidate_ids)
+    all_requirements = load_requirements(JobOpportunity.objects.all())
+    today = date.today()
+    matches = [
+        evaluate(requirements, profile, today)
+        for profile in profiles.values()
+        for requirements in all_requirements
+    ]
+    save_matches(matches)
+    return len(matches)
+
+
+def refresh_all_matches(progress=None):
+    """Rebuild the whole match table, loading candidate profiles only once."""
+    profiles = load_profiles()
+    jobs = list(JobOpportunity.objects.all())
+    total = 0
+    for done, job in enumerate(jobs, start=1):
+        total += refresh_job_matches(job, profiles)
+        if progress:
+            progress(done, len(jobs))
+    return total
+
+
+def _get_version(key):
+    return cache.get(key, 0)
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def _candidate_version_key(candidate_id):
+    return f"jobs:candidate_profile_version:{candidate_id}"
+
+
+def bump_candidate_profile_version(candidate_id):
+    _bump_version(_candidate_version_key(candidate_id))
+
+
+def bump_jobs_version():
+    _bump_version(JOBS_VERSION_CACHE_KEY)
+
+
+def compatible_jobs(candidate_id):
+    """
+    Every job evaluated against one candidate, best score first, as plain
+    dicts. Costs the same few queries however many jobs exist and is cached
+    until the candidate's profile or any job's requirements change (or the
+    day changes, for age).
+    """
+    today = date.today()
+    key = "jobs:compatible_jobs:{}:{}:{}:{}".format(
+        candidate_id,
+        _get_version(_candidate_version_key(candidate_id)),
+        _get_version(JOBS_VERSION_CACHE_KEY),
+        today.isoformat(),
+    )
+    results = cache.get(key)
+    if results is not None:
+        return results
+
+    profile = load_profiles([candidate_id], today).get(candidate_id)
+    results = []
+    if profile is not None:
+        departments = lookup_table(Department)
+        for requirements in load_requirements(JobOpportunity.objects.all()):
+            match = evaluate(requirements, profile, today)
+            results.append(
+                {
+                    "job_id": requirements.job.pk,
+                    "job_title": requirements.job.job_title,
+                    "company_name": requirements.job.company_name,
+                    "job_department": str(departments.get(requirements.job.job_department_id)),
+                    "score": match.score,
+                    "is_compatible": match.is_compatible,
+                    "criteria": {
+                        criterion: getattr(match, f"{criterion}_ok") for criterion in MATCH_WEIGHTS
+                    },
+                }
+            )
+        results.sort(key=lambda result: (not result["is_compatible"], -result["score"]))
+    cache.set(key, results, cache_timeout(COMPATIBLE_JOBS_CACHE_TIMEOUT))
+    return results
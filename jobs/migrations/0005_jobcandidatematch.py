@@ -0,0 +1,113 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "candidates",
+            "0007_rename_is_candidate_start_work_candidateapplicationdata_is_candidate_start_work_and_more",
+        ),
+        ("jobs", "0004_alter_historicaljobopportunity_company_name_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobCandidateMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "score",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="Score"),
+                ),
+                (
+                    "gender_ok",
+                    models.BooleanField(default=False, verbose_name="Gender"),
+                ),
+                ("age_ok", models.BooleanField(default=False, verbose_name="Age")),
+                (
+                    "nationality_ok",
+                    models.BooleanField(default=False, verbose_name="Nationality"),
+                ),
+                (
+                    "degree_ok",
+                    models.BooleanField(default=False, verbose_name="Degree"),
+                ),
+                (
+                    "field_of_study_ok",
+                    models.BooleanField(default=False, verbose_name="Field of Study"),
+                ),
+                (
+                    "experience_ok",
+                    models.BooleanField(default=False, verbose_name="Experience"),
+                ),
+                (
+                    "department_experience_ok",
+                    models.BooleanField(
+                        default=False, verbose_name="Department Experience"
+                    ),
+                ),
+                (
+                    "is_compatible",
+                    models.BooleanField(default=False, verbose_name="Compatible"),
+                ),
+                (
+                    "experience_months",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Total Experience (Months)"
+                    ),
+                ),
+                (
+                    "department_experience_months",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Department Experience (Months)"
+                    ),
+                ),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "candidate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="job_matches",
+                        to="candidates.candidate",
+                        verbose_name="Candidate",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="matches",
+                        to="jobs.jobopportunity",
+                        verbose_name="Job Opportunity",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Job Candidate Match",
+                "verbose_name_plural": "Job Candidate Matches",
+                "indexes": [
+                    models.Index(
+                        fields=["job", "is_compatible", "-score"],
+                        name="match_job_compatible_score_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("job", "candidate"), name="unique_job_candidate_match"
+                    )
+                ],
+            },
+        ),
+    ]
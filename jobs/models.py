@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from simple_history.models import HistoricalRecords
 
+from utilities.history import ChangedOnlyHistoricalRecords
 from utilities.models import (
     Nationality,
     DegreeChoices,
@@ -63,7 +63,7 @@ class JobOpportunity(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     class Meta:
         verbose_name = _("Job Opportunity")
@@ -72,3 +72,66 @@ class JobOpportunity(models.Model):
 
     def __str__(self):
         return self.job_title
+
+
+class JobCandidateMatch(models.Model):
+    """
+    Precomputed compatibility of a candidate with a job opportunity, kept up
+    to date by jobs/signals.py and rebuilt nightly by `recompute_matches`
+    (age and ongoing experience change with the date alone).
+    """
+
+    job = models.ForeignKey(
+        JobOpportunity,
+        on_delete=models.CASCADE,
+        related_name="matches",
+        verbose_name=_("Job Opportunity"),
+    )
+    candidate = models.ForeignKey(
+        Candidate,
+        on_delete=models.CASCADE,
+        related_name="job_matches",
+        verbose_name=_("Candidate"),
+    )
+    score = models.PositiveSmallIntegerField(default=0, verbose_name=_("Score"))
+    gender_ok = models.BooleanField(default=False, verbose_name=_("Gender"))
+    age_ok = models.BooleanField(default=False, verbose_name=_("Age"))
+    nationality_ok = models.BooleanField(default=False, verbose_name=_("Nationality"))
+    degree_ok = models.BooleanField(default=False, verbose_name=_("Degree"))
+    field_of_study_ok = models.BooleanField(default=False, verbose_name=_("Field of Study"))
+    experience_ok = models.BooleanField(default=False, verbose_name=_("Experience"))
+    department_experience_ok = models.BooleanField(
+        default=False, verbose_name=_("Department Experience")
+    )
+    is_compatible = models.BooleanField(default=False, verbose_name=_("Compatible"))
+    experience_months = models.PositiveIntegerField(
+        default=0, verbose_name=_("Total Experience (Months)")
+    )
+    department_experience_months = models.PositiveIntegerField(
+        default=0, verbose_name=_("Department Experience (Months)")
+    )
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Job Candidate Match")
+        verbose_name_plural = _("Job Candidate Matches")
+        constraints = [
+            models.UniqueConstraint(fields=["job", "candidate"], name="unique_job_candidate_match"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["job", "is_compatible", "-score"],
+                name="match_job_compatible_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_id} / {self.job_id}: {self.score}"
+
+    @property
+    def experience_years(self):
+        return round(self.experience_months / 12, 1)
+
+    @property
+    def department_experience_years(self):
+        return round(self.department_experience_months / 12, 1)
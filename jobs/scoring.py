@@ -0,0 +1,163 @@
+# jobs/scoring.py
+"""
+Vectorized scoring of a candidate pool with NumPy.
+
+Only (candidate, experience, start date, end date, department) tuples and
+birthdays are loaded; experience months, age and department coverage are
+then computed for the whole pool at once instead of calling relativedelta
+per experience per candidate.
+"""
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from candidates.models import Experience
+
+# Ranking keys of PoolScores.ranked_ids(), most significant first.
+DEFAULT_RANKING = ("department_coverage", "department_months", "experience_months")
+
+
+def _split_dates(dates):
+    """Month number (since 1970) and day of month arrays of a datetime64[D] array."""
+    months = dates.astype("datetime64[M]")
+    days = (dates - months).astype(np.int64) + 1
+    return months, days
+
+
+def months_between(start_dates, end_dates):
+    """
+    Whole months from start to end, element-wise. Same result as
+    ``relativedelta(end, start)`` years * 12 + months, including its
+    clamping to the end of shorter months (Jan 30 + 1 month = Feb 28).
+    """
+    start_months, start_days = _split_dates(start_dates)
+    end_months, end_days = _split_dates(end_dates)
+    end_month_lengths = ((end_months + 1).astype("datetime64[D]") - end_months).astype(np.int64)
+    return (end_months - start_months).astype(np.int64) - (
+        np.minimum(start_days, end_month_lengths) > end_days
+    )
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NAT = np.datetime64("NaT").astype(np.int64)
+
+
+def to_dates(values, default=None):
+    """
+    datetime64[D] array of Python dates, with ``None`` replaced by ``default``
+    (or NaT). Going through date ordinals is much faster than letting NumPy
+    convert date objects.
+    """
+    missing = _NAT if default is None else default.toordinal() - _EPOCH_ORDINAL
+    days = np.fromiter(
+        (missing if value is None else value.toordinal() - _EPOCH_ORDINAL for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return days.view("datetime64[D]")
+
+
+@dataclass
+class PoolScores:
+    candidate_ids: np.ndarray
+    # -1 when the birthday is unknown
+    age: np.ndarray
+    experience_months: np.ndarray
+    department_months: np.ndarray
+    # Share (0..1) of the required departments the candidate has worked in.
+    department_coverage: np.ndarray
+
+    def ranked_ids(self, keys=DEFAULT_RANKING, descending=True):
+        """Candidate ids ordered by ``keys``; ties keep ascending id order."""
+        sign = -1 if descending else 1
+        # np.lexsort sorts by the last key first.
+        order = np.lexsort(
+            [self.candidate_ids] + [sign * getattr(self, key) for key in reversed(keys)]
+        )
+        return self.candidate_ids[order].tolist()
+
+
+def score_pool(candidate_ids, birthdays, experiences, department_ids=(), today=None):
+    """
+    Score a pool of candidates.
+
+    ``birthdays`` is aligned with ``candidate_ids``. ``experiences`` is a
+    sequence of (candidate_id, experience_id, start_date, end_date,
+    department_id) rows: one per experience department, with a ``None``
+    department for experiences without any.
+    """
+    today = today or date.today()
+    candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+    order = np.argsort(candidate_ids)
+    candidate_ids = candidate_ids[order]
+    birthdays = to_dates(birthdays)[order]
+    size = len(candidate_ids)
+
+    known_birthday = ~np.isnat(birthdays)
+    today_array = np.full(size, np.datetime64(today, "D"))
+    age = np.where(
+        known_birthday,
+        months_between(np.where(known_birthday, birthdays, today_array), today_array) // 12,
+        -1,
+    )
+
+    if experiences:
+        owners, experience_ids, starts, ends, departments = zip(*experiences)
+    else:
+        owners = experience_ids = starts = ends = departments = ()
+    owners = np.asarray(owners, dtype=np.int64)
+    experience_ids = np.asarray(experience_ids, dtype=np.int64)
+    departments = np.fromiter(
+        (-1 if department is None else department for department in departments),
+        dtype=np.int64,
+        count=len(departments),
+    )
+    months = months_between(to_dates(starts), to_dates(ends, default=today))
+
+    # Position of each row's candidate in the pool; rows outside it are dropped.
+    positions = np.searchsorted(candidate_ids, owners)
+    in_pool = positions < size
+    in_pool[in_pool] = candidate_ids[positions[in_pool]] == owners[in_pool]
+    positions, experience_ids, departments, months = (
+        positions[in_pool], experience_ids[in_pool], departments[in_pool], months[in_pool]
+    )
+
+    def months_per_candidate(rows):
+        # An experience listed under several departments counts once.
+        _, first = np.unique(experience_ids[rows], return_index=True)
+        rows = np.flatnonzero(rows)[first]
+        return np.bincount(positions[rows], weights=months[rows], minlength=size).astype(np.int64)
+
+    experience_months = months_per_candidate(np.ones(len(positions), dtype=bool))
+    required = np.asarray(list(department_ids), dtype=np.int64)
+    if len(required):
+        in_required = np.isin(departments, required)
+        department_months = months_per_candidate(in_required)
+        pairs = np.unique(
+            np.stack([positions[in_required], departments[in_required]], axis=1), axis=0
+        )
+        department_coverage = np.bincount(pairs[:, 0], minlength=size) / len(required)
+    else:
+        department_months = experience_months
+        department_coverage = np.ones(size)
+
+    return PoolScores(candidate_ids, age, experience_months, department_months, department_coverage)
+
+
+def score_queryset(candidates, department_ids=(), today=None):
+    """Score a Candidate queryset in two queries."""
+    candidate_rows = list(candidates.values_list("pk", "birthday"))
+    experiences = list(
+        Experience.objects.filter(candidate__in=candidates.values("pk")).values_list(
+            "candidate_id", "pk", "start_date", "end_date", "departments"
+        )
+    )
+    candidate_ids = [pk for pk, _ in candidate_rows]
+    birthdays = [birthday for _, birthday in candidate_rows]
+    return score_pool(candidate_ids, birthdays, experiences, department_ids, today)
+
+
+def rank_candidates(candidates, department_ids=(), keys=DEFAULT_RANKING, today=None):
+    """Ids of ``candidates`` best first, e.g. for a job's required departments."""
+    return score_queryset(candidates, department_ids, today).ranked_ids(keys)
@@ -0,0 +1,88 @@
+# jobs/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from candidates.models import Candidate, Education, Experience
+from candidates.pipeline import invalidate_pipeline_counts
+from candidates.signals import candidates_imported
+
+from .matching import (
+    bump_candidate_profile_version,
+    bump_jobs_version,
+    refresh_candidate_matches,
+)
+from .models import JobOpportunity
+from .tasks import refresh_candidate_matches_task, refresh_job_matches_task
+
+# Candidate fields that take part in matching.
+MATCHED_CANDIDATE_FIELDS = {"gender", "birthday", "nationality"}
+
+
+def _refresh_candidate(candidate_id):
+    def refresh():
+        bump_candidate_profile_version(candidate_id)
+        # One candidate against every job is a handful of queries: done inline.
+        refresh_candidate_matches([candidate_id])
+
+    transaction.on_commit(refresh)
+
+
+def _refresh_job(job_id):
+    def refresh():
+        bump_jobs_version()
+        # One job against every candidate can be large: left to the workers.
+        refresh_job_matches_task.enqueue_once(job_id)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Candidate)
+def candidate_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not MATCHED_CANDIDATE_FIELDS & set(update_fields):
+        return
+    _refresh_candidate(instance.pk)
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def candidate_profile_changed(sender, instance, **kwargs):
+    _refresh_candidate(instance.candidate_id)
+
+
+@receiver(m2m_changed, sender=Experience.departments.through)
+def experience_departments_changed(sender, instance, action, reverse, **kwargs):
+    if action.startswith("post_") and not reverse:
+        _refresh_candidate(instance.candidate_id)
+
+
+@receiver(candidates_imported)
+def candidates_were_imported(sender, candidate_ids, **kwargs):
+    refresh_candidate_matches_task.enqueue(candidate_ids)
+
+
+@receiver(post_save, sender=JobOpportunity)
+def job_saved(sender, instance, **kwargs):
+    _refresh_job(instance.pk)
+
+
+@receiver(post_delete, sender=JobOpportunity)
+def job_deleted(sender, instance, **kwargs):
+    transaction.on_commit(bump_jobs_version)
+
+
+@receiver(m2m_changed, sender=JobOpportunity.nationalities.through)
+@receiver(m2m_changed, sender=JobOpportunity.accepted_degrees.through)
+@receiver(m2m_changed, sender=JobOpportunity.fields_of_study.through)
+@receiver(m2m_changed, sender=JobOpportunity.departments.through)
+def job_requirements_changed(sender, instance, action, reverse, **kwargs):
+    if action.startswith("post_") and not reverse:
+        _refresh_job(instance.pk)
+
+
+# The pipeline board groups application data by job opportunity.
+receiver(post_save, sender=JobOpportunity)(invalidate_pipeline_counts)
+receiver(post_delete, sender=JobOpportunity)(invalidate_pipeline_counts)
+receiver(m2m_changed, sender=JobOpportunity.candidates.through)(invalidate_pipeline_counts)
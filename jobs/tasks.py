@@ -0,0 +1,26 @@
+# jobs/tasks.py
+from background_tasks.registry import set_progress, task
+
+from .matching import refresh_all_matches, refresh_candidate_matches, refresh_job_matches
+from .models import JobOpportunity
+
+
+@task(name="jobs.refresh_job_matches")
+def refresh_job_matches_task(job_id):
+    job = JobOpportunity.objects.filter(pk=job_id).first()
+    if job is None:
+        return {"matches": 0}
+    return {"matches": refresh_job_matches(job)}
+
+
+@task(name="jobs.refresh_candidate_matches")
+def refresh_candidate_matches_task(candidate_ids):
+    return {"matches": refresh_candidate_matches(candidate_ids)}
+
+
+@task(name="jobs.refresh_all_matches", max_attempts=1)
+def refresh_all_matches_task():
+    def progress(done, total):
+        set_progress(done * 100 // total, f"{done} of {total} jobs")
+
+    return {"matches": refresh_all_matches(progress=progress)}
@@ -0,0 +1,23 @@
+from django import template
+
+from jobs.matching import compatible_jobs as _compatible_jobs
+
+register = template.Library()
+
+# Jobs listed on the candidate detail page; the JSON endpoint returns all.
+COMPATIBLE_JOBS_LIMIT = 10
+
+
+@register.inclusion_tag("jobs/includes/compatible_jobs.html")
+def compatible_jobs(candidate_pk):
+    jobs = _compatible_jobs(candidate_pk)
+    return {
+        "candidate_pk": candidate_pk,
+        "jobs": jobs[:COMPATIBLE_JOBS_LIMIT],
+        "compatible_count": sum(1 for job in jobs if job["is_compatible"]),
+    }
+
+
+@register.filter
+def criterion_label(criterion):
+    return criterion.replace("_", " ").capitalize()
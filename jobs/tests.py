@@ -1,3 +1,236 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import date
 
-# Create your tests here.
+import factory.random
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from background_tasks.models import Task
+from background_tasks.worker import claim_task, execute
+from candidates.factories import CandidateFactory, FullCandidateFactory
+from candidates.signals import candidates_imported
+from utilities.models import DegreeChoices, FieldOfStudy, Nationality
+from utilities.testing import QueryBudgetMixin
+
+from .factories import JobOpportunityFactory
+from .models import JobCandidateMatch, JobOpportunity
+from .matching import (
+    CandidateProfile,
+    JobRequirements,
+    evaluate,
+    job_matches_are_stale,
+    refresh_job_matches,
+)
+
+
+class CompatibleCandidatesQueryCountTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        factory.random.reseed_random("jobs")
+        FullCandidateFactory.create_batch(15)
+        cls.job = JobOpportunityFactory(
+            minimum_years_of_experience=0,
+            accepted_degrees=DegreeChoices.objects.all(),
+            fields_of_study=FieldOfStudy.objects.all(),
+            nationalities=Nationality.objects.all(),
+        )
+        refresh_job_matches(cls.job)
+        cls.user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_job_opportunity_compatible_candidates(self):
+        url = reverse("jobs:job_opportunity_compatible_candidates", args=[self.job.pk])
+        for sort in ["score", "full_name", "total_experience", "department_experience", "age"]:
+            # Two of them check the stored matches are current.
+            with self.subTest(sort=sort), self.assertMaxQueries(9):
+                response = self.client.get(url, {"sort": sort, "per_page": 20})
+            self.assertEqual(response.status_code, 200)
+            self.assertGreater(len(response.context["matches"]), 1)
+
+
+class JobAdminQueryCountTests(QueryBudgetMixin, TestCase):
+    """Query budgets of the job admin changelists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        factory.random.reseed_random("jobs-admin")
+        FullCandidateFactory.create_batch(10)
+        for job in JobOpportunityFactory.create_batch(
+            3,
+            minimum_years_of_experience=0,
+            accepted_degrees=DegreeChoices.objects.all(),
+            fields_of_study=FieldOfStudy.objects.all(),
+            nationalities=Nationality.objects.all(),
+        ):
+            refresh_job_matches(job)
+        cls.user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_changelists(self):
+        self.assertChangelistQueries(JobOpportunity, 6)
+        self.assertChangelistQueries(JobCandidateMatch, 6)
+
+
+class MatchScoringTests(SimpleTestCase):
+    TODAY = date(2026, 1, 1)
+
+    def setUp(self):
+        self.job = JobOpportunity(
+            minimum_years_of_experience=2, minimum_age=22, maximum_age=50, gender="F"
+        )
+        self.requirements = JobRequirements(
+            self.job, nationality_ids={1}, degree_ids={1}, field_of_study_ids={1}, department_ids={1}
+        )
+
+    def profile(self, **kwargs):
+        values = {
+            "pk": 1,
+            "gender": "F",
+            "birthday": date(1996, 6, 1),
+            "nationality_id": 1,
+            "educations": [(1, 1)],
+            "experiences": [(24, {1})],
+        }
+        return CandidateProfile(**{**values, **kwargs})
+
+    def test_compatible_candidate_scores_full_marks(self):
+        match = evaluate(self.requirements, self.profile(), self.TODAY)
+        self.assertEqual(match.score, 100)
+        self.assertTrue(match.is_compatible)
+        self.assertEqual((match.experience_months, match.department_experience_months), (24, 24))
+
+    def test_experience_gets_partial_credit(self):
+        # A year of the two required, outside the job's departments.
+        match = evaluate(self.requirements, self.profile(experiences=[(12, {2})]), self.TODAY)
+        self.assertFalse(match.experience_ok or match.department_experience_ok)
+        self.assertFalse(match.is_compatible)
+        # 70 points, plus half of the 15 for the total experience.
+        self.assertEqual(match.score, round(70 + 7.5))
+
+    def test_field_of_study_needs_an_accepted_degree(self):
+        match = evaluate(self.requirements, self.profile(educations=[(2, 1), (1, 2)]), self.TODAY)
+        self.assertTrue(match.degree_ok)
+        self.assertFalse(match.field_of_study_ok)
+        self.assertEqual(match.score, 85)
+
+    def test_gender_age_and_nationality(self):
+        match = evaluate(
+            self.requirements,
+            self.profile(gender="M", birthday=date(1970, 1, 1), nationality_id=2),
+            self.TODAY,
+        )
+        self.assertFalse(match.gender_ok or match.age_ok or match.nationality_ok)
+        self.assertEqual(match.score, 60)
+        self.job.gender = "Any"
+        self.assertTrue(evaluate(self.requirements, self.profile(gender="M"), self.TODAY).gender_ok)
+
+
+class MatchRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        factory.random.reseed_random("jobs-refresh")
+        cls.candidates = FullCandidateFactory.create_batch(3)
+        cls.job = JobOpportunityFactory(
+            minimum_years_of_experience=0,
+            accepted_degrees=DegreeChoices.objects.all(),
+            fields_of_study=FieldOfStudy.objects.all(),
+            nationalities=Nationality.objects.all(),
+        )
+        refresh_job_matches(cls.job)
+        cls.user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+
+    def queued(self, name):
+        return list(Task.objects.filter(name=name, status=Task.QUEUED).values_list("args", flat=True))
+
+    def test_candidate_changes_are_matched_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            candidate = FullCandidateFactory()
+        self.assertTrue(self.job.matches.filter(candidate=candidate).exists())
+        self.assertFalse(job_matches_are_stale(self.job))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            candidate.save(update_fields=["address"])
+        self.assertEqual(callbacks, [])
+
+    def test_job_changes_and_imports_are_queued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.save()
+            self.job.departments.set([])
+        self.assertEqual(self.queued("jobs.refresh_job_matches"), [[self.job.pk]])
+
+        candidates_imported.send(sender=None, candidate_ids=[1, 2])
+        self.assertEqual(self.queued("jobs.refresh_candidate_matches"), [[[1, 2]]])
+
+    def test_stale_matches_are_refreshed_in_the_background(self):
+        url = reverse("jobs:job_opportunity_compatible_candidates", args=[self.job.pk])
+        self.client.force_login(self.user)
+        self.assertFalse(self.client.get(url).context["refreshing"])
+
+        # Created without its refresh having run, as after an import.
+        candidate = CandidateFactory()
+        response = self.client.get(url)
+        self.assertTrue(response.context["refreshing"])
+        self.assertContains(response, "The matches are being recomputed")
+        self.assertFalse(self.job.matches.filter(candidate=candidate).exists())
+        self.client.get(url)
+        self.assertEqual(self.queued("jobs.refresh_job_matches"), [[self.job.pk]])
+
+        self.assertTrue(execute(claim_task("test")))
+        self.assertTrue(self.job.matches.filter(candidate=candidate).exists())
+        self.assertFalse(self.client.get(url).context["refreshing"])
+
+        JobOpportunity.objects.filter(pk=self.job.pk).update(minimum_age=80, maximum_age=90)
+        self.job.refresh_from_db()
+        refresh_job_matches(self.job)
+        response = self.client.get(url)
+        self.assertEqual(len(response.context["matches"]), 0)
+        # Matches are updated in place.
+        self.assertEqual(self.job.matches.count(), len(self.candidates) + 1)
+
+
+class ConcurrentMatchRefreshTests(TransactionTestCase):
+    def test_overlapping_refreshes_update_the_same_rows(self):
+        FullCandidateFactory.create_batch(2)
+        job = JobOpportunityFactory()
+        refresh_job_matches(job)
+        started, release = threading.Event(), threading.Event()
+        errors = []
+
+        def slow_refresh():
+            # A refresh whose transaction is still open.
+            try:
+                with transaction.atomic():
+                    refresh_job_matches(job)
+                    started.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        def refresh():
+            try:
+                refresh_job_matches(job)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=slow_refresh), threading.Thread(target=refresh)]
+        threads[0].start()
+        self.assertTrue(started.wait(10))
+        threads[1].start()
+        # Let the second refresh reach the rows the first one holds.
+        time.sleep(0.5)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(job.matches.count(), 2)
@@ -12,6 +12,7 @@ urlpatterns = [
     path('job-opportunities/<int:pk>/candidates/', views.job_opportunity_candidates, name='job_opportunity_candidates'),
     # This endpoint is not used in the provided code. If you want to include it, you can uncomment it and modify the view function accordingly.
     path('job-opportunities/<int:pk>/compatible-candidates/', views.job_opportunity_compatible_candidates, name='job_opportunity_compatible_candidates'),
+    path('candidates/<int:candidate_id>/compatible-jobs/', views.candidate_compatible_jobs, name='candidate_compatible_jobs'),
     path('job-opportunities/<int:job_id>/add-candidate/<int:candidate_id>/', views.job_opportunity_add_candidate, name='job_opportunity_add_candidate'),
     path('job-opportunities/<int:job_id>/remove-candidate/<int:candidate_id>/', views.job_opportunity_remove_candidate, name='job_opportunity_remove_candidate'),
 ]
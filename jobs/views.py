@@ -1,15 +1,15 @@
-from datetime import date
-
-from dateutil.relativedelta import relativedelta
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.shortcuts import render, get_object_or_404
 
 from candidates.models import Candidate
 from .forms import JobOpportunityForm
+from .matching import compatible_jobs, job_matches_are_stale
 from .models import JobOpportunity
+from .tasks import refresh_job_matches_task
 
 
 def job_opportunity_list(request):
@@ -72,67 +72,73 @@ def job_opportunity_edit(request, pk):
 
 
 
+# Sortable columns of the compatible candidates list.
+MATCH_SORT_FIELDS = {
+    "score": ["score"],
+    "full_name": ["candidate__first_name", "candidate__second_name", "candidate__last_name"],
+    "email": ["candidate__email"],
+    "total_experience": ["experience_months"],
+    "department_experience": ["department_experience_months"],
+    # Older candidates have earlier birthdays.
+    "age": ["-candidate__birthday"],
+}
+
+
 @login_required
 def job_opportunity_compatible_candidates(request, pk):
     job_opportunity = get_object_or_404(JobOpportunity, pk=pk)
+    # Recomputing every candidate is too slow for a request: the stored
+    # matches are shown while a background worker refreshes them (the
+    # refresh queued by the last change may simply not have run yet).
+    refreshing = job_matches_are_stale(job_opportunity)
+    if refreshing:
+        refresh_job_matches_task.enqueue_once(job_opportunity.pk)
 
     # Exclude candidates already associated with any job opportunity
-    candidates = Candidate.objects.filter(job_opportunities__isnull=True)
-
-    # Filter based on gender
-    if job_opportunity.gender != 'Any':
-        candidates = candidates.filter(gender=job_opportunity.gender)
-
-    # Filter based on age
-    today = date.today()
-    min_birth_date = today - relativedelta(years=job_opportunity.maximum_age)
-    max_birth_date = today - relativedelta(years=job_opportunity.minimum_age)
-    candidates = candidates.filter(birthday__range=(min_birth_date, max_birth_date))
-
-    # Filter based on nationality
-    candidates = candidates.filter(nationality__in=job_opportunity.nationalities.all())
-
-    # Filter based on accepted degrees and fields of study
-    candidates = candidates.filter(
-        educations__degree__in=job_opportunity.accepted_degrees.all(),
-        educations__field_of_study__in=job_opportunity.fields_of_study.all()
-    ).distinct()
-
-    # Filter based on minimum years of experience
-    compatible_candidates = [
-        candidate for candidate in candidates if candidate.get_total_experience_years() >= job_opportunity.minimum_years_of_experience
-    ]
+    matches = (
+        job_opportunity.matches.filter(
+            is_compatible=True, candidate__job_opportunities__isnull=True
+        )
+        .select_related("candidate")
+        .prefetch_related("candidate__experiences__departments")
+    )
 
     # Sorting logic
-    sort_by = request.GET.get("sort", "full_name")
-    order = request.GET.get("order", "asc")
-    reverse_order = order == "desc"
-
-    if sort_by == "full_name":
-        compatible_candidates.sort(key=lambda x: x.full_name.lower(), reverse=reverse_order)
-    elif sort_by == "email":
-        compatible_candidates.sort(key=lambda x: x.email.lower(), reverse=reverse_order)
-    elif sort_by == "total_experience":
-        compatible_candidates.sort(key=lambda x: x.get_total_experience_years(), reverse=reverse_order)
-    elif sort_by == "age":
-        compatible_candidates.sort(key=lambda x: x.age_in_years or 0, reverse=reverse_order)
+    sort_by = request.GET.get("sort", "score")
+    if sort_by not in MATCH_SORT_FIELDS:
+        sort_by = "score"
+    order = request.GET.get("order", "desc")
+    order_by = []
+    for field in MATCH_SORT_FIELDS[sort_by]:
+        if order == "desc":
+            field = field[1:] if field.startswith("-") else f"-{field}"
+        order_by.append(field)
+    matches = matches.order_by(*order_by, "-score", "candidate_id")
 
     # Pagination logic
     per_page = int(request.GET.get("per_page", 10))  # Default 10 items per page
-    paginator = Paginator(compatible_candidates, per_page)
+    paginator = Paginator(matches, per_page)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     context = {
         "job_opportunity": job_opportunity,
-        "candidates": page_obj,
+        "matches": page_obj,
         "sort_by": sort_by,
         "order": order,
         "per_page": per_page,
+        "refreshing": refreshing,
     }
     return render(request, 'jobs/job_opportunity_compatible_candidates.html', context)
 
 
+@login_required
+def candidate_compatible_jobs(request, candidate_id):
+    """Every job opportunity scored against one candidate, compatible ones first."""
+    candidate = get_object_or_404(Candidate, pk=candidate_id)
+    return JsonResponse({"candidate": candidate.pk, "jobs": compatible_jobs(candidate.pk)})
+
+
 @login_required
 def job_opportunity_add_candidate(request, job_id, candidate_id):
     job_opportunity = get_object_or_404(JobOpportunity, pk=job_id)
@@ -0,0 +1,123 @@
+"""
+Do concurrent file downloads starve page rendering?
+
+Measures the latency of a normal page on its own, then again while
+``--downloads`` clients keep downloading a file or candidate ZIP in a loop.
+Run it once against the WSGI server and once against the ASGI one:
+
+    gunicorn DjangoConsulting.wsgi:application -w 4
+    gunicorn -c DjangoConsulting/gunicorn_asgi.py DjangoConsulting.asgi:application -w 4
+
+    python loadtests/download_starvation.py --base-url http://localhost:8000 \
+        --username admin --password ... \
+        --download /candidates/download-directory/1/ --downloads 16
+
+With sync workers every running download holds a worker, so once there are
+more downloads than workers the page requests queue behind them; under ASGI
+the page latency should stay close to the baseline.
+
+Only needs httpx (already in requirements.txt); run it from any machine.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def login(client, username, password):
+    await client.get("/accounts/login/")
+    response = await client.post(
+        "/accounts/login/",
+        data={
+            "username": username,
+            "password": password,
+            "csrfmiddlewaretoken": client.cookies.get("csrftoken", ""),
+        },
+        headers={"Referer": str(client.base_url) + "/accounts/login/"},
+    )
+    if "sessionid" not in client.cookies:
+        raise SystemExit(f"Login failed (HTTP {response.status_code}).")
+
+
+async def time_page(client, path, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def download_forever(client, path, stop, totals):
+    while not stop.is_set():
+        async with client.stream("GET", path) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                totals["bytes"] += len(chunk)
+                if stop.is_set():
+                    break
+        totals["downloads"] += 1
+
+
+def summary(label, timings):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(
+        f"{label:<28} p50 {statistics.median(timings) * 1000:8.1f} ms"
+        f"   p95 {p95 * 1000:8.1f} ms   max {timings[-1] * 1000:8.1f} ms"
+    )
+    return statistics.median(timings)
+
+
+async def main(options):
+    limits = httpx.Limits(max_connections=options.downloads + 2)
+    timeout = httpx.Timeout(options.timeout)
+    async with httpx.AsyncClient(
+        base_url=options.base_url, limits=limits, timeout=timeout
+    ) as client:
+        if options.username:
+            await login(client, options.username, options.password)
+
+        baseline = summary(
+            "page alone", await time_page(client, options.page, options.requests)
+        )
+
+        stop = asyncio.Event()
+        totals = {"bytes": 0, "downloads": 0}
+        downloads = [
+            asyncio.create_task(download_forever(client, options.download, stop, totals))
+            for _ in range(options.downloads)
+        ]
+        # Let every download get going before measuring.
+        await asyncio.sleep(options.warmup)
+        started = time.perf_counter()
+        loaded = summary(
+            f"page + {options.downloads} downloads",
+            await time_page(client, options.page, options.requests),
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*downloads, return_exceptions=True)
+
+    print(
+        f"downloads: {totals['downloads']} completed, "
+        f"{totals['bytes'] / elapsed / 1024 / 1024:.1f} MiB/s"
+    )
+    print(f"slowdown of the median page render: x{loaded / baseline:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--page", default="/candidates/", help="Page whose latency is measured.")
+    parser.add_argument("--download", required=True, help="Download URL path to hammer.")
+    parser.add_argument("--downloads", type=int, default=16, help="Concurrent downloads.")
+    parser.add_argument("--requests", type=int, default=30, help="Page requests per phase.")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(main(parser.parse_args()))
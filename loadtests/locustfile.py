@@ -0,0 +1,268 @@
+"""
+Recruiter workflows as Locust users, for capacity-planning gunicorn workers.
+
+Each simulated recruiter logs in through the login form, then repeats the
+tasks of its persona with a think time between them:
+
+    browsing   page and sort the candidate list, open candidate details
+    searching  full-text search and search suggestions, open a result
+    matching   open a job and its compatible candidates
+    documents  export candidate CVs (PDF) and HMC sheets (Excel)
+
+``--mix`` sets the share of each persona, either a preset name from MIXES
+or explicit weights such as ``browsing=6,searching=2,matching=1,documents=1``.
+
+    pip install locust      # a load-testing tool, not a project requirement
+    gunicorn DjangoConsulting.wsgi:application -w 4 &
+    locust -f loadtests/locustfile.py --host http://localhost:8000 \
+        --headless -u 50 -r 5 -t 5m --mix exports \
+        --recruiter-username admin --recruiter-password ... \
+        --csv results/w4
+
+then ``python loadtests/summarize.py results/w4`` (or several runs, one per
+worker count, side by side). The same summary is printed when Locust quits.
+
+The candidate and job ids are read from the list pages once, so the data
+should already be there (see ``manage.py seed_scale``).
+"""
+import random
+import re
+import threading
+
+from locust import HttpUser, between, events, task
+
+from summarize import format_summary, summarize_stats
+
+MIXES = {
+    "default": {"browsing": 5, "searching": 3, "matching": 1, "documents": 1},
+    "browsing": {"browsing": 8, "searching": 2, "matching": 0, "documents": 0},
+    "matching": {"browsing": 2, "searching": 1, "matching": 6, "documents": 1},
+    "exports": {"browsing": 3, "searching": 1, "matching": 1, "documents": 5},
+}
+LIST_SORTS = ["created_at", "full_name", "nationality", "total_experience", "departments", "updated_at"]
+CANDIDATE_LINK = re.compile(r'href="/candidates/(\d+)/"')
+JOB_LINK = re.compile(r'href="/jobs/job-opportunities/(\d+)/"')
+SEARCH_TERMS = ["a", "an", "mar", "moh", "jo", "nurse", "ali", "sa"]
+
+
+@events.init_command_line_parser.add_listener
+def add_arguments(parser):
+    parser.add_argument(
+        "--mix",
+        default="default",
+        help=f"Persona weights: one of {', '.join(MIXES)} or name=weight,...",
+    )
+    parser.add_argument("--recruiter-username", env_var="LOCUST_RECRUITER_USERNAME", default="")
+    parser.add_argument(
+        "--recruiter-password",
+        env_var="LOCUST_RECRUITER_PASSWORD",
+        default="",
+        is_secret=True,
+    )
+
+
+def parse_mix(value):
+    if value in MIXES:
+        return MIXES[value]
+    mix = {persona: 0 for persona in MIXES["default"]}
+    for item in value.split(","):
+        persona, _, weight = item.partition("=")
+        if persona.strip() not in mix:
+            raise ValueError(f"Unknown persona {persona!r} in --mix.")
+        mix[persona.strip()] = int(weight)
+    return mix
+
+
+@events.init.add_listener
+def apply_mix(environment, **kwargs):
+    if not environment.parsed_options:
+        return
+    mix = parse_mix(environment.parsed_options.mix)
+    for user_class in environment.user_classes:
+        persona = getattr(user_class, "persona", None)
+        if persona:
+            user_class.weight = mix[persona]
+    # Locust refuses a user class with weight 0, so drop them instead.
+    environment.user_classes = [
+        user_class for user_class in environment.user_classes if user_class.weight
+    ]
+
+
+@events.quitting.add_listener
+def print_summary(environment, **kwargs):
+    rows = summarize_stats(
+        {
+            "name": entry.name,
+            "method": entry.method,
+            "requests": entry.num_requests,
+            "failures": entry.num_failures,
+            "rps": entry.total_rps,
+            "p50": entry.get_response_time_percentile(0.5),
+            "p95": entry.get_response_time_percentile(0.95),
+            "p99": entry.get_response_time_percentile(0.99),
+        }
+        for entry in [*environment.stats.entries.values(), environment.stats.total]
+    )
+    if rows:
+        print(format_summary(rows))
+
+
+class Ids:
+    """Candidate and job ids found on the list pages, shared by all users."""
+
+    lock = threading.Lock()
+    candidates = []
+    jobs = []
+
+    @classmethod
+    def load(cls, client):
+        with cls.lock:
+            if cls.candidates:
+                return
+            for page in range(1, 6):
+                response = client.get(
+                    f"/candidates/?page={page}&per_page=50", name="/candidates/ [ids]"
+                )
+                cls.candidates += CANDIDATE_LINK.findall(response.text)
+            cls.jobs = JOB_LINK.findall(
+                client.get("/jobs/job-opportunities/", name="/jobs/job-opportunities/ [ids]").text
+            )
+
+
+class RecruiterUser(HttpUser):
+    abstract = True
+    wait_time = between(1, 5)
+
+    def on_start(self):
+        options = self.environment.parsed_options
+        self.client.get("/accounts/login/", name="/accounts/login/")
+        with self.client.post(
+            "/accounts/login/",
+            data={
+                "username": options.recruiter_username,
+                "password": options.recruiter_password,
+                "csrfmiddlewaretoken": self.client.cookies.get("csrftoken", ""),
+            },
+            headers={"Referer": f"{self.host}/accounts/login/"},
+            name="/accounts/login/ [post]",
+            catch_response=True,
+        ) as response:
+            if "sessionid" not in self.client.cookies:
+                response.failure("Login failed, check --recruiter-username/--recruiter-password.")
+        Ids.load(self.client)
+
+    def page(self, path, name, expected_type="text/html", **kwargs):
+        """GET a page, failing on errors, a login redirect or the wrong content type."""
+        with self.client.get(path, name=name, catch_response=True, **kwargs) as response:
+            if not response.ok:
+                response.failure(f"HTTP {response.status_code}")
+            elif response.url and "/accounts/login/" in response.url:
+                response.failure("Redirected to the login page.")
+            elif expected_type not in response.headers.get("Content-Type", ""):
+                response.failure(f"Unexpected Content-Type {response.headers.get('Content-Type')}")
+            return response
+
+    def open_candidate(self):
+        if Ids.candidates:
+            self.page(f"/candidates/{random.choice(Ids.candidates)}/", "/candidates/[pk]/")
+
+
+class BrowsingRecruiter(RecruiterUser):
+    persona = "browsing"
+
+    @task(3)
+    def list_page(self):
+        self.page(
+            "/candidates/",
+            "/candidates/?page",
+            params={"page": random.randint(1, 50), "per_page": random.choice([10, 25, 50])},
+        )
+
+    @task(2)
+    def sorted_list(self):
+        sort = random.choice(LIST_SORTS)
+        self.page(
+            "/candidates/",
+            f"/candidates/?sort={sort}",
+            params={"sort": sort, "order": random.choice(["asc", "desc"])},
+        )
+
+    @task(3)
+    def detail(self):
+        self.open_candidate()
+
+
+class SearchingRecruiter(RecruiterUser):
+    persona = "searching"
+
+    @task(2)
+    def search(self):
+        self.page(
+            "/candidates/search/",
+            "/candidates/search/",
+            params={"query": random.choice(SEARCH_TERMS)},
+        )
+
+    @task(3)
+    def suggest(self):
+        term = random.choice(SEARCH_TERMS)
+        # Type-ahead: one request per keystroke.
+        for length in range(1, len(term) + 1):
+            self.page(
+                "/candidates/search/suggest/",
+                "/candidates/search/suggest/",
+                expected_type="application/json",
+                params={"q": term[:length]},
+            )
+
+    @task(1)
+    def detail(self):
+        self.open_candidate()
+
+
+class MatchingRecruiter(RecruiterUser):
+    persona = "matching"
+
+    @task(1)
+    def job(self):
+        if Ids.jobs:
+            self.page(f"/jobs/job-opportunities/{random.choice(Ids.jobs)}/", "/jobs/job-opportunities/[pk]/")
+
+    @task(3)
+    def compatible_candidates(self):
+        if Ids.jobs:
+            self.page(
+                f"/jobs/job-opportunities/{random.choice(Ids.jobs)}/compatible-candidates/",
+                "/jobs/job-opportunities/[pk]/compatible-candidates/",
+            )
+
+    @task(1)
+    def detail(self):
+        self.open_candidate()
+
+
+class DocumentsRecruiter(RecruiterUser):
+    persona = "documents"
+
+    @task(2)
+    def cv(self):
+        if Ids.candidates:
+            self.page(
+                f"/documents/candidate/{random.choice(Ids.candidates)}/export_pdf/",
+                "/documents/candidate/[pk]/export_pdf/",
+                expected_type="application/pdf",
+            )
+
+    @task(1)
+    def hmc_sheet(self):
+        if Ids.candidates:
+            self.page(
+                f"/documents/hmc_sheet/{random.choice(Ids.candidates)}/export_pdf/",
+                "/documents/hmc_sheet/[pk]/export_pdf/",
+                # Despite the URL, the HMC sheet is an Excel workbook.
+                expected_type="spreadsheetml",
+            )
+
+    @task(1)
+    def detail(self):
+        self.open_candidate()
@@ -0,0 +1,86 @@
+"""
+Per-endpoint p50/p95/p99 latency, throughput and error rate of Locust runs.
+
+Reads the ``<prefix>_stats.csv`` files written by ``locust --csv <prefix>``.
+Given several prefixes, e.g. one run per gunicorn worker count, prints the
+runs one after the other so they can be compared:
+
+    python loadtests/summarize.py results/w2 results/w4 results/w8
+    python loadtests/summarize.py results/w4 --json results/w4.json
+
+Standard library only.
+"""
+import argparse
+import csv
+import json
+
+AGGREGATED = "Aggregated"
+
+
+def summarize_stats(entries):
+    """Rows sorted by p95, slowest first, with the error rate filled in."""
+    rows = []
+    for entry in entries:
+        if not entry["requests"]:
+            continue
+        rows.append(dict(entry, error_rate=entry["failures"] / entry["requests"]))
+    rows.sort(key=lambda row: (row["name"] == AGGREGATED, -(row["p95"] or 0)))
+    return rows
+
+
+def read_locust_csv(prefix):
+    with open(f"{prefix}_stats.csv", newline="", encoding="utf-8") as stream:
+        return summarize_stats(
+            {
+                "name": row["Name"],
+                "method": row["Type"],
+                "requests": int(row["Request Count"]),
+                "failures": int(row["Failure Count"]),
+                "rps": float(row["Requests/s"]),
+                "p50": _number(row["50%"]),
+                "p95": _number(row["95%"]),
+                "p99": _number(row["99%"]),
+            }
+            for row in csv.DictReader(stream)
+        )
+
+
+def _number(value):
+    return None if value in ("", "N/A") else float(value)
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def format_summary(rows, title=None):
+    width = max(len(row["name"]) for row in rows)
+    lines = [title] if title else []
+    lines.append(
+        f"{'endpoint':<{width}}  {'requests':>8}  {'req/s':>7}  {'p50 ms':>7}  "
+        f"{'p95 ms':>7}  {'p99 ms':>7}  {'errors':>7}"
+    )
+    for row in rows:
+        lines.append(
+            f"{row['name']:<{width}}  {row['requests']:>8}  {row['rps']:>7.1f}  "
+            f"{_ms(row['p50']):>7}  {_ms(row['p95']):>7}  {_ms(row['p99']):>7}  "
+            f"{row['error_rate']:>7.1%}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("prefixes", nargs="+", help="Prefixes given to locust --csv.")
+    parser.add_argument("--json", help="Also write the summaries to this JSON file.")
+    options = parser.parse_args()
+
+    summaries = {prefix: read_locust_csv(prefix) for prefix in options.prefixes}
+    print("\n\n".join(format_summary(rows, title=prefix) for prefix, rows in summaries.items()))
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as stream:
+            json.dump(summaries, stream, indent=2)
+
+
+if __name__ == "__main__":
+    main()
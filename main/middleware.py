@@ -0,0 +1,200 @@
+# main/middleware.py
+import heapq
+import json
+import logging
+import time
+import traceback
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = getattr(settings, "REQUEST_METRICS_SLOW_MS", 500)
+MAX_QUERIES = getattr(settings, "REQUEST_METRICS_MAX_QUERIES", 50)
+WORST_QUERIES = getattr(settings, "REQUEST_METRICS_WORST_QUERIES", 5)
+SERVER_TIMING = getattr(settings, "REQUEST_METRICS_SERVER_TIMING", True)
+
+# Frames from these paths are not reported as the origin of a query.
+_FRAMEWORK_PATHS = ("site-packages", "/django/", "/asgiref/", __file__)
+
+# Metrics of the request being handled; contextvars follow the request into
+# the threads sync_to_async() runs ORM calls in.
+_current = ContextVar("request_metrics", default=None)
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # Heap of the slowest statements: (duration, sequence, sql, origin).
+    worst: list = field(default_factory=list)
+    statements: Counter = field(default_factory=Counter)
+
+    def record_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        self.statements[sql] += 1
+        if len(self.worst) < WORST_QUERIES or duration > self.worst[0][0]:
+            # Only the statements that make the list pay for a stack walk.
+            entry = (duration, self.queries, sql, query_origin())
+            if len(self.worst) < WORST_QUERIES:
+                heapq.heappush(self.worst, entry)
+            else:
+                heapq.heapreplace(self.worst, entry)
+
+    def worst_queries(self):
+        return [
+            {"ms": round(duration * 1000, 2), "sql": sql, "origin": origin}
+            for duration, _, sql, origin in sorted(self.worst, reverse=True)
+        ]
+
+    def repeated_queries(self, limit=3):
+        """The statements run more than once, a sign of N+1 queries."""
+        return [
+            {"count": count, "sql": sql}
+            for sql, count in self.statements.most_common(limit)
+            if count > 1
+        ]
+
+
+def query_origin(limit=3):
+    """The innermost project frames of the current stack, e.g. views.py:42 in candidate_list."""
+    base_dir = f"{settings.BASE_DIR}/"
+    frames = [
+        f"{frame.filename.removeprefix(base_dir)}:{frame.lineno} in {frame.name}"
+        for frame in reversed(traceback.extract_stack())
+        if frame.filename.startswith(base_dir)
+        and not any(path in frame.filename for path in _FRAMEWORK_PATHS)
+    ]
+    return frames[:limit]
+
+
+def _measure_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def _install_query_wrapper(connection, **kwargs):
+    # At the front, so execute_wrapper() context managers (which pop the
+    # last wrapper) never remove it.
+    if _measure_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _measure_query)
+
+
+connection_created.connect(_install_query_wrapper)
+
+_MISSING = object()
+
+
+def _instrument_cache(cache):
+    """Count hits and misses of get() / get_many(), which most cache calls go through."""
+    if getattr(cache, "_request_metrics", False):
+        return
+    get, get_many = cache.get, cache.get_many
+
+    def counted_get(key, default=None, version=None):
+        value = get(key, _MISSING, version=version)
+        metrics = _current.get()
+        if metrics is not None:
+            if value is _MISSING:
+                metrics.cache_misses += 1
+            else:
+                metrics.cache_hits += 1
+        return default if value is _MISSING else value
+
+    def counted_get_many(keys, version=None):
+        keys = list(keys)
+        values = get_many(keys, version=version)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.cache_hits += len(values)
+            metrics.cache_misses += len(keys) - len(values)
+        return values
+
+    cache.get, cache.get_many = counted_get, counted_get_many
+    cache._request_metrics = True
+
+
+class RequestMetricsMiddleware:
+    """
+    Per-request query count, DB time, cache hits and total render time.
+
+    Adds a Server-Timing header (shown in the browser's network panel) and
+    logs a JSON line with the slowest statements and where they were run
+    from when a request is slow or runs too many queries.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def start(self):
+        for connection in connections.all():
+            _install_query_wrapper(connection)
+        for cache in caches.all():
+            _instrument_cache(cache)
+        metrics = RequestMetrics()
+        return metrics, _current.set(metrics), time.perf_counter()
+
+    def finish(self, request, response, metrics, token, started):
+        _current.reset(token)
+        elapsed = time.perf_counter() - started
+        if SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+                    f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+                    f"render;dur={elapsed * 1000:.1f}",
+                ]
+            )
+        if elapsed * 1000 >= SLOW_REQUEST_MS or metrics.queries > MAX_QUERIES:
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "slow_request",
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "view": getattr(request.resolver_match, "view_name", None),
+                        "ms": round(elapsed * 1000, 1),
+                        "queries": metrics.queries,
+                        "db_ms": round(metrics.db_time * 1000, 1),
+                        "cache_hits": metrics.cache_hits,
+                        "cache_misses": metrics.cache_misses,
+                        "worst_queries": metrics.worst_queries(),
+                        "repeated_queries": metrics.repeated_queries(),
+                    }
+                )
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token, started = self.start()
+        response = self.get_response(request)
+        return self.finish(request, response, metrics, token, started)
+
+    async def __acall__(self, request):
+        metrics, token, started = self.start()
+        response = await self.get_response(request)
+        return self.finish(request, response, metrics, token, started)
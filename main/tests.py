@@ -1,3 +1,78 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from .middleware import RequestMetricsMiddleware
+
+User = get_user_model()
+
+
+def count_users(request):
+    User.objects.count()
+    User.objects.count()
+    cache.get("request-metrics-test")
+    return HttpResponse()
+
+
+async def acount_users(request):
+    await User.objects.acount()
+    return HttpResponse()
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/metrics/")
+
+    def test_server_timing_header(self):
+        self.client.force_login(User.objects.create_user("viewer", "viewer@example.com", "x"))
+        response = self.client.get(reverse("home_page"))
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", cache;')
+        self.assertIn("render;dur=", response["Server-Timing"])
+
+    def test_queries_and_cache_lookups_are_counted(self):
+        User.objects.count()  # Outside a request: not counted.
+        response = RequestMetricsMiddleware(count_users)(self.request)
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        self.assertIn('cache;desc="0 hits, 1 misses"', response["Server-Timing"])
+
+    def test_wrapper_survives_execute_wrapper_blocks(self):
+        def view(request):
+            with connection.execute_wrapper(lambda execute, *args: execute(*args)):
+                User.objects.count()
+            User.objects.count()
+            return HttpResponse()
+
+        response = RequestMetricsMiddleware(view)(self.request)
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+
+    async def test_async_requests(self):
+        response = await RequestMetricsMiddleware(acount_users)(self.request)
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    def test_slow_requests_are_logged(self):
+        with mock.patch("main.middleware.SLOW_REQUEST_MS", 0), self.assertLogs(
+            "main.middleware", "WARNING"
+        ) as logs:
+            RequestMetricsMiddleware(count_users)(self.request)
+        report = json.loads(logs.records[0].getMessage())
+        self.assertEqual(
+            (report["event"], report["path"], report["status"]), ("slow_request", "/metrics/", 200)
+        )
+        self.assertEqual((report["queries"], report["cache_misses"]), (2, 1))
+        self.assertEqual(len(report["worst_queries"]), 2)
+        self.assertIn("main/tests.py", report["worst_queries"][0]["origin"][0])
+        self.assertEqual(report["repeated_queries"][0]["count"], 2)
+
+    @mock.patch("main.middleware.SLOW_REQUEST_MS", 60_000)
+    def test_requests_with_too_many_queries_are_logged(self):
+        with mock.patch("main.middleware.MAX_QUERIES", 1), self.assertLogs("main.middleware"):
+            RequestMetricsMiddleware(count_users)(self.request)
+        with mock.patch("main.middleware.MAX_QUERIES", 2), self.assertNoLogs("main.middleware"):
+            RequestMetricsMiddleware(count_users)(self.request)
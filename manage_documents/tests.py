@@ -1,3 +1,39 @@
+import factory.random
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from candidates.factories import (
+    EducationFactory,
+    FullCandidateFactory,
+    LicenseFactory,
+)
+from utilities.testing import QueryBudgetMixin
+
+
+class DocumentExportQueryCountTests(QueryBudgetMixin, TestCase):
+    """The CV and HMC sheet run one query per relation, however many rows it has."""
+
+    @classmethod
+    def setUpTestData(cls):
+        factory.random.reseed_random("documents")
+        cls.candidate = FullCandidateFactory()
+        EducationFactory.create_batch(3, candidate=cls.candidate)
+        LicenseFactory.create_batch(3, candidate=cls.candidate)
+        cls.user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_candidate_export_pdf_CV(self):
+        with self.assertMaxQueries(7):
+            response = self.client.get(
+                reverse("documents:candidate_export_pdf_CV", args=[self.candidate.pk])
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+
+    def test_HMC_Sheet(self):
+        with self.assertMaxQueries(7):
+            response = self.client.get(reverse("documents:HMC_Sheet", args=[self.candidate.pk]))
+        self.assertEqual(response.status_code, 200)
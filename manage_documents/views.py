@@ -19,9 +19,8 @@ from reportlab.platypus import (
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
-from candidates.models import Candidate, Experience
-from django.templatetags.static import static
-from django.core.files.storage import default_storage
+from candidates.models import Candidate, Education, Experience, License
+from django.db.models import Prefetch
 logger = logging.getLogger(__name__)
 
 
@@ -78,14 +77,37 @@ def get_photo_url(candidate):
     if candidate.personal_image and hasattr(candidate.personal_image, 'url'):
         return candidate.personal_image.url
     else:
-        photo_url = static('images/avatar.png')
-        if default_storage.exists(photo_url):
-            return photo_url
+        # Local file from the static dirs; asking the (S3) default storage
+        # for a static URL cost a round-trip per CV and never matched.
+        photo_path = finders.find('images/avatar.png')
+        if photo_path:
+            return photo_path
         else:
             logger.error("Default avatar not found. Using placeholder text.")
             return None
 
 
+def candidate_documents_queryset():
+    """
+    Candidates with the related rows (and the lookups they print) that the
+    CV and HMC sheet list, fetched in one query per relation.
+    """
+    return Candidate.objects.prefetch_related(
+        Prefetch(
+            'educations',
+            queryset=Education.objects.select_related(
+                'degree', 'field_of_study', 'institution__country'
+            ),
+        ),
+        Prefetch(
+            'licenses',
+            queryset=License.objects.select_related('license_provider__country'),
+        ),
+        'experiences',
+        'training_courses',
+    )
+
+
 def get_related_values(obj, attr_name):
     try:
         return list(getattr(obj, attr_name).all())
@@ -233,16 +255,16 @@ def clone_html(html):
 
 
 def getResponsibilities(experience):
-    responsibilities = (getattr(experience, 'job_responsibilities', ''))
+    responsibilities = getattr(experience, 'job_responsibilities', None) or ''
     if len(responsibilities) > 15:
-        return  f"Responsibilities:<br/>  <ul>"+ "".join(clone_html(getattr(experience, 'job_responsibilities', '')))+ "</ul>"
+        return  f"Responsibilities:<br/>  <ul>"+ "".join(clone_html(responsibilities))+ "</ul>"
     else:
         return f" "
 
 
 def candidate_export_pdf_CV(request, pk):
     # Get the candidate instance or return 404 if not found
-    candidate = get_object_or_404(Candidate, pk=pk)
+    candidate = get_object_or_404(candidate_documents_queryset(), pk=pk)
 
     # Collecting candidate data
     candidate_data = {
@@ -368,7 +390,7 @@ from django.http import HttpResponse
 import tempfile
 
 def HMC_Sheet(request, pk):
-    candidate = get_object_or_404(Candidate, pk=pk)
+    candidate = get_object_or_404(candidate_documents_queryset(), pk=pk)
 
     # Create a workbook and select the active worksheet
     workbook = openpyxl.Workbook()
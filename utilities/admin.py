@@ -1,7 +1,9 @@
-# candidates/admin.py
+# utilities/admin.py
 
 from django.contrib import admin
 from simple_history.admin import SimpleHistoryAdmin
+
+from .admin_mixins import LookupListFilter
 from .models import (
     Country,
     Nationality,
@@ -46,8 +48,10 @@ class FieldOfStudyAdmin(SimpleHistoryAdmin):
 @admin.register(Institution)
 class InstitutionAdmin(SimpleHistoryAdmin):
     list_display = ("abbreviation", "type", "institution", "country")
+    list_select_related = ("country",)
     search_fields = ("abbreviation", "institution", "country__name")
-    list_filter = ("type", "country")
+    list_filter = ("type", ("country", LookupListFilter))
+    autocomplete_fields = ("country",)
     ordering = ("type", "institution")
 
 
@@ -73,7 +77,9 @@ class DepartmentAdmin(SimpleHistoryAdmin):
 
 
 @admin.register(LicenseProvider)
-class DepartmentAdmin(SimpleHistoryAdmin):
+class LicenseProviderAdmin(SimpleHistoryAdmin):
     list_display = ("name", "country")
-    search_fields = ("country", "name")
+    list_select_related = ("country",)
+    search_fields = ("name", "country__name")
+    autocomplete_fields = ("country",)
     ordering = ("name",)
@@ -0,0 +1,81 @@
+# utilities/autocomplete.py
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .cache import cache_timeout
+from .lookups import lookup_version
+from .models import (
+    Country,
+    DegreeChoices,
+    Department,
+    EducationGradeChoices,
+    FieldOfStudy,
+    Institution,
+    LanguageChoices,
+    LicenseProvider,
+    Nationality,
+)
+
+AUTOCOMPLETE_PAGE_SIZE = 20
+AUTOCOMPLETE_CACHE_TIMEOUT = 60 * 60
+
+# Fields matched by prefix (case-insensitive). The large tables have an
+# UPPER(field) index for each, see the models' Meta.indexes.
+AUTOCOMPLETE_SEARCH_FIELDS = {
+    Country: ["name", "code"],
+    Nationality: ["nationality_name"],
+    DegreeChoices: ["degree"],
+    FieldOfStudy: ["field_of_study"],
+    Institution: ["institution", "abbreviation"],
+    EducationGradeChoices: ["grade"],
+    LanguageChoices: ["language"],
+    Department: ["title", "abbreviation"],
+    LicenseProvider: ["name"],
+}
+AUTOCOMPLETE_MODELS = {model._meta.model_name: model for model in AUTOCOMPLETE_SEARCH_FIELDS}
+
+
+def with_label_relations(queryset):
+    """select_related() whatever the model's __str__ reads (the country)."""
+    if any(field.name == "country" for field in queryset.model._meta.fields):
+        return queryset.select_related("country")
+    return queryset
+
+
+def search_lookup(model, query, page=1):
+    """
+    One page of a lookup table matching ``query``, in select2's format:
+    ``{"results": [{"id": ..., "text": ...}], "pagination": {"more": ...}}``.
+    Cached until the table changes.
+    """
+    key = "utilities:autocomplete:{}:{}:{}:{}".format(
+        model._meta.model_name,
+        lookup_version(model),
+        page,
+        hashlib.md5(query.lower().encode()).hexdigest(),
+    )
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    queryset = with_label_relations(model._default_manager.all())
+    if query:
+        condition = Q()
+        for field in AUTOCOMPLETE_SEARCH_FIELDS[model]:
+            condition |= Q(**{f"{field}__istartswith": query})
+        queryset = queryset.filter(condition)
+    offset = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+    # One row more than the page tells whether there is a next page.
+    records = list(
+        queryset.order_by(*model._meta.ordering, "pk")[offset : offset + AUTOCOMPLETE_PAGE_SIZE + 1]
+    )
+    data = {
+        "results": [
+            {"id": record.pk, "text": str(record)} for record in records[:AUTOCOMPLETE_PAGE_SIZE]
+        ],
+        "pagination": {"more": len(records) > AUTOCOMPLETE_PAGE_SIZE},
+    }
+    cache.set(key, data, cache_timeout(AUTOCOMPLETE_CACHE_TIMEOUT))
+    return data
@@ -0,0 +1,45 @@
+# utilities/cache.py
+from django.conf import settings
+from django.core import checks
+
+# Backends whose entries live in one process: what one gunicorn worker
+# deletes or invalidates (a version bump) stays cached in the others.
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_is_shared():
+    return settings.CACHES["default"]["BACKEND"] not in LOCAL_CACHE_BACKENDS
+
+
+def cache_timeout(timeout):
+    """
+    Timeout for an entry that is invalidated when its data changes. With a
+    per-process cache the invalidation only reaches the current process, so
+    the entry is kept LOCAL_CACHE_MAX_TIMEOUT seconds at most.
+    """
+    if cache_is_shared():
+        return timeout
+    if timeout is None:
+        return settings.LOCAL_CACHE_MAX_TIMEOUT
+    return min(timeout, settings.LOCAL_CACHE_MAX_TIMEOUT)
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if cache_is_shared():
+        return []
+    return [
+        checks.Warning(
+            "The default cache is local to each process.",
+            hint=(
+                "Set CACHE_URL to a cache shared by every worker (e.g. redis://): "
+                "otherwise changes only invalidate the cached lookups and results "
+                "of the process that made them, and the others serve stale data "
+                f"for up to LOCAL_CACHE_MAX_TIMEOUT ({settings.LOCAL_CACHE_MAX_TIMEOUT}s)."
+            ),
+            id="utilities.W001",
+        )
+    ]
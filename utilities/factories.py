@@ -0,0 +1,100 @@
+# utilities/factories.py
+import factory
+from factory.django import DjangoModelFactory
+
+from .models import (
+    Country,
+    DegreeChoices,
+    Department,
+    EducationGradeChoices,
+    FieldOfStudy,
+    Institution,
+    LanguageChoices,
+    LicenseProvider,
+    Nationality,
+)
+
+
+class CountryFactory(DjangoModelFactory):
+    class Meta:
+        model = Country
+        django_get_or_create = ("code",)
+
+    code = factory.Iterator(["JO", "SA", "QA", "AE", "EG"])
+    name = factory.LazyAttribute(
+        lambda country: {
+            "JO": "Jordan",
+            "SA": "Saudi Arabia",
+            "QA": "Qatar",
+            "AE": "United Arab Emirates",
+            "EG": "Egypt",
+        }[country.code]
+    )
+
+
+class NationalityFactory(DjangoModelFactory):
+    class Meta:
+        model = Nationality
+        django_get_or_create = ("nationality_name",)
+
+    nationality_name = factory.Iterator(["Jordanian", "Egyptian", "Filipino", "Indian"])
+
+
+class DegreeChoicesFactory(DjangoModelFactory):
+    class Meta:
+        model = DegreeChoices
+        django_get_or_create = ("degree",)
+
+    degree = factory.Iterator(["Bachelor", "Master", "PhD", "Diploma"])
+
+
+class FieldOfStudyFactory(DjangoModelFactory):
+    class Meta:
+        model = FieldOfStudy
+        django_get_or_create = ("field_of_study",)
+
+    field_of_study = factory.Iterator(["Nursing", "Midwifery", "Pharmacy", "Radiology"])
+
+
+class InstitutionFactory(DjangoModelFactory):
+    class Meta:
+        model = Institution
+
+    institution = factory.Faker("company")
+    type = "University"
+    abbreviation = factory.Faker("lexify", text="???U", letters="ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    country = factory.SubFactory(CountryFactory)
+
+
+class EducationGradeChoicesFactory(DjangoModelFactory):
+    class Meta:
+        model = EducationGradeChoices
+        django_get_or_create = ("grade",)
+
+    grade = factory.Iterator(["Excellent", "Very Good", "Good"])
+
+
+class LanguageChoicesFactory(DjangoModelFactory):
+    class Meta:
+        model = LanguageChoices
+        django_get_or_create = ("language",)
+
+    language = factory.Iterator(["Arabic", "English", "French"])
+
+
+class DepartmentFactory(DjangoModelFactory):
+    class Meta:
+        model = Department
+        django_get_or_create = ("title",)
+
+    abbreviation = factory.Iterator(["ICU", "ER", "OR", "NICU", "CCU"])
+    title = factory.LazyAttribute(lambda department: f"{department.abbreviation} Department")
+
+
+class LicenseProviderFactory(DjangoModelFactory):
+    class Meta:
+        model = LicenseProvider
+        django_get_or_create = ("name",)
+
+    name = factory.Iterator(["Jordan Nursing Council", "DHP Qatar", "Saudi Commission"])
+    country = factory.SubFactory(CountryFactory)
@@ -0,0 +1,45 @@
+# utilities/files.py
+from django.db import models, transaction
+
+
+def file_fields(model):
+    """The model's FileFields (ImageFields included) by name."""
+    return {
+        field.name: field for field in model._meta.fields if isinstance(field, models.FileField)
+    }
+
+
+class ClearableFilesMixin:
+    """
+    Model mixin to delete stored files: ``clear_files(*names)`` nulls the
+    fields in one UPDATE of just those columns (and the auto_now ones), so
+    the history records a single version for all of them, and deletes the
+    storage objects once the transaction commits.
+    """
+
+    def clear_files(self, *names):
+        fields = file_fields(type(self))
+        unknown = [name for name in names if name not in fields]
+        if unknown:
+            raise ValueError(f"Not file fields of {type(self).__name__}: {', '.join(unknown)}")
+        cleared = [name for name in names if getattr(self, name)]
+        if not cleared:
+            return []
+
+        files = [(getattr(self, name).storage, getattr(self, name).name) for name in cleared]
+        for name in cleared:
+            setattr(self, name, None)
+        update_fields = cleared + [
+            field.name for field in self._meta.fields if getattr(field, "auto_now", False)
+        ]
+        self._change_reason = "Deleted " + ", ".join(
+            str(fields[name].verbose_name) for name in cleared
+        )
+        try:
+            with transaction.atomic():
+                self.save(update_fields=update_fields)
+                for storage, name in files:
+                    transaction.on_commit(lambda storage=storage, name=name: storage.delete(name))
+        finally:
+            del self._change_reason
+        return cleared
@@ -0,0 +1,335 @@
+# utilities/history.py
+import datetime
+import json
+
+from django.apps import apps
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from simple_history.models import HistoricalRecords
+
+# Versions shown per page of the history view.
+HISTORY_PAGE_SIZE = 25
+# jsonb_build_object() takes at most 100 arguments, i.e. 50 fields.
+_JSONB_FIELDS_PER_CALL = 50
+
+
+def compared_fields(fields):
+    """Tracked fields that count as a change (auto_now timestamps do not)."""
+    return [field for field in fields if not getattr(field, "auto_now", False)]
+
+
+class ChangedOnlyHistoricalRecords(HistoricalRecords):
+    """
+    HistoricalRecords that writes no historical row for a save() that left
+    every tracked field as the latest version has it: an unchanged form
+    resubmitted, or a file-deletion helper called on an empty field.
+    Costs one single-row query per update, reading only the
+    ``update_fields`` when the save was given them.
+    """
+
+    def post_save(self, instance, created, using=None, **kwargs):
+        if (
+            not created
+            and not kwargs.get("raw", False)
+            and self.is_unchanged(instance, kwargs.get("update_fields"))
+        ):
+            return
+        super().post_save(instance, created, using=using, **kwargs)
+
+    def is_unchanged(self, instance, update_fields=None):
+        fields = compared_fields(self.fields_included(instance))
+        if update_fields is not None:
+            fields = [field for field in fields if field.name in update_fields]
+        latest = (
+            getattr(instance, self.manager_name)
+            .values("history_id", *[field.attname for field in fields])
+            .first()
+        )
+        if latest is None:
+            return False
+        return all(
+            field.get_prep_value(getattr(instance, field.attname))
+            == field.get_prep_value(latest[field.attname])
+            for field in fields
+        )
+
+
+def history_models():
+    """The historical model of every history-tracked model."""
+    return [
+        getattr(model, model._meta.simple_history_manager_attribute).model
+        for model in apps.get_models()
+        if hasattr(model._meta, "simple_history_manager_attribute")
+    ]
+
+
+# Retention
+
+def prunable_history(history_model, cutoff):
+    """
+    Records older than ``cutoff`` that a newer version supersedes, or that
+    belong to a deleted object. The latest version of a live object is kept
+    however old, so its history never becomes empty.
+    """
+    pk_name = history_model.instance_type._meta.pk.attname
+    newer = history_model.objects.filter(
+        **{pk_name: OuterRef(pk_name)}, history_date__gt=OuterRef("history_date")
+    )
+    deleted = history_model.objects.filter(**{pk_name: OuterRef(pk_name)}, history_type="-")
+    return history_model.objects.filter(history_date__lt=cutoff).filter(
+        Q(Exists(newer)) | Q(Exists(deleted))
+    )
+
+
+def prune_history(history_model, cutoff, batch_size=5000, progress=None):
+    """
+    Delete prunable_history() in batches of ``batch_size`` records, each
+    in its own transaction so locks and WAL stay bounded. Returns the
+    number of deleted records.
+    """
+    queryset = prunable_history(history_model, cutoff).order_by("history_id")
+    total = 0
+    while True:
+        batch = list(queryset.values_list("history_id", flat=True)[:batch_size])
+        if not batch:
+            return total
+        with transaction.atomic(using=queryset.db):
+            deleted, _ = history_model.objects.filter(history_id__in=batch).delete()
+        total += deleted
+        if progress:
+            progress(total)
+
+
+# Monthly partitions
+
+def _quote(cursor, name):
+    return cursor.db.ops.quote_name(name)
+
+
+def month_start(moment):
+    return datetime.datetime(moment.year, moment.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def partition_name(table, month):
+    return f"{table}_y{month:%Y}m{month:%m}"
+
+
+def is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table]
+    )
+    return cursor.fetchone() is not None
+
+
+def create_monthly_partitions(cursor, table, first_month, last_month):
+    """
+    Create the missing monthly partitions of ``table`` from ``first_month``
+    to ``last_month``. Rows that went to the default partition for want of
+    one are moved into the new partition.
+    """
+    quoted = _quote(cursor, table)
+    default = _quote(cursor, f"{table}_default")
+    month = month_start(first_month)
+    created = []
+    while month <= last_month:
+        name = partition_name(table, month)
+        bounds = [month, next_month(month)]
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is None:
+            cursor.execute(
+                f"SELECT EXISTS (SELECT 1 FROM {default} "
+                "WHERE history_date >= %s AND history_date < %s)",
+                bounds,
+            )
+            misplaced = cursor.fetchone()[0]
+            if misplaced:
+                cursor.execute(f"ALTER TABLE {quoted} DETACH PARTITION {default}")
+            cursor.execute(
+                f"CREATE TABLE {_quote(cursor, name)} PARTITION OF {quoted} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                bounds,
+            )
+            if misplaced:
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {default} WHERE history_date >= %s "
+                    f"AND history_date < %s RETURNING *) INSERT INTO {quoted} SELECT * FROM moved",
+                    bounds,
+                )
+                cursor.execute(f"ALTER TABLE {quoted} ATTACH PARTITION {default} DEFAULT")
+            created.append(name)
+        month = next_month(month)
+    return created
+
+
+def _rebuild_table(cursor, table, partition_by_month, months_ahead):
+    """
+    Rebuild ``table`` as a table range-partitioned on history_date (or back
+    into a plain one), keeping its columns, identity sequence, indexes and
+    foreign keys. The primary key of a partitioned table has to include the
+    partition key, so it becomes (history_id, history_date).
+    """
+    quoted = _quote(cursor, table)
+    old = _quote(cursor, f"{table}_old")
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s AND indexname <> %s",
+        [table, f"{table}_pkey"],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+
+    cursor.execute(f"ALTER TABLE {quoted} RENAME TO {old}")
+    like = f"(LIKE {old} INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS)"
+    if partition_by_month:
+        cursor.execute(f"CREATE TABLE {quoted} {like} PARTITION BY RANGE (history_date)")
+        cursor.execute(
+            f"CREATE TABLE {_quote(cursor, table + '_default')} PARTITION OF {quoted} DEFAULT"
+        )
+        cursor.execute(f"SELECT MIN(history_date) FROM {old}")
+        now = datetime.datetime.now(datetime.timezone.utc)
+        first = cursor.fetchone()[0] or now
+        last = month_start(now)
+        for _ in range(months_ahead):
+            last = next_month(last)
+        create_monthly_partitions(cursor, table, first, last)
+    else:
+        cursor.execute(f"CREATE TABLE {quoted} {like}")
+    cursor.execute(f"INSERT INTO {quoted} SELECT * FROM {old}")
+    cursor.execute(f"DROP TABLE {old} CASCADE")
+
+    primary_key = "history_id, history_date" if partition_by_month else "history_id"
+    cursor.execute(
+        f"ALTER TABLE {quoted} ADD CONSTRAINT {_quote(cursor, table + '_pkey')} "
+        f"PRIMARY KEY ({primary_key})"
+    )
+    for index in indexes:
+        cursor.execute(index)
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {quoted} ADD CONSTRAINT {_quote(cursor, name)} {definition}")
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, 'history_id'), "
+        f"COALESCE(MAX(history_id), 1), MAX(history_id) IS NOT NULL) FROM {quoted}",
+        [table],
+    )
+
+
+def partition_history_table(cursor, table, months_ahead):
+    if not is_partitioned(cursor, table):
+        _rebuild_table(cursor, table, True, months_ahead)
+
+
+def unpartition_history_table(cursor, table):
+    if is_partitioned(cursor, table):
+        _rebuild_table(cursor, table, False, 0)
+
+
+def partitioned_history_models(using="default"):
+    with connections[using].cursor() as cursor:
+        return [
+            model
+            for model in history_models()
+            if is_partitioned(cursor, model._meta.db_table)
+        ]
+
+
+# Compact diffs
+
+def _changes_sql(cursor, fields):
+    """
+    jsonb of {field: [old, new]} for the fields a version changed, built
+    with LAG() so that unchanged (and potentially large) values never
+    leave the database.
+    """
+    parts = []
+    for i in range(0, len(fields), _JSONB_FIELDS_PER_CALL):
+        arguments = []
+        for field in fields[i:i + _JSONB_FIELDS_PER_CALL]:
+            column = _quote(cursor, field.column)
+            arguments.append(
+                f"'{field.attname}', CASE WHEN {column} IS DISTINCT FROM LAG({column}) OVER w "
+                f"THEN jsonb_build_array(LAG({column}) OVER w, {column}) END"
+            )
+        parts.append(f"jsonb_strip_nulls(jsonb_build_object({', '.join(arguments)}))")
+    return " || ".join(parts)
+
+
+def history_changes(history_model, object_id, page=1, page_size=HISTORY_PAGE_SIZE):
+    """
+    One page (newest first) of an object's versions as dicts with
+    history_id, history_date, history_type, history_user_id,
+    history_change_reason and ``changes`` ({attname: [old, new]}; None for
+    creations and deletions). Updates that changed no compared field are
+    left out. Returns (versions, has_next).
+    """
+    instance_type = history_model.instance_type
+    fields = [
+        field
+        for field in compared_fields(history_model.tracked_fields)
+        if not field.primary_key
+    ]
+    pk_column = instance_type._meta.pk.column
+    connection = connections[history_model.objects.db]
+    with connection.cursor() as cursor:
+        sql = (
+            "SELECT history_id, history_date, history_type, history_user_id, "
+            "history_change_reason, changes FROM ("
+            "SELECT history_id, history_date, history_type, history_user_id, "
+            "history_change_reason, "
+            f"CASE WHEN history_type = '~' THEN {_changes_sql(cursor, fields)} END AS changes "
+            f"FROM {_quote(cursor, history_model._meta.db_table)} "
+            f"WHERE {_quote(cursor, pk_column)} = %s "
+            "WINDOW w AS (ORDER BY history_date, history_id)"
+            ") AS versions WHERE changes IS NULL OR changes <> '{}'::jsonb "
+            "ORDER BY history_date DESC, history_id DESC LIMIT %s OFFSET %s"
+        )
+        cursor.execute(sql, [object_id, page_size + 1, (page - 1) * page_size])
+        columns = [column[0] for column in cursor.description]
+        versions = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    for version in versions:
+        # Django's psycopg2 backend leaves jsonb undecoded.
+        if isinstance(version["changes"], str):
+            version["changes"] = json.loads(version["changes"])
+    return versions[:page_size], len(versions) > page_size
+
+
+HISTORY_TYPES = {"+": "Created", "~": "Changed", "-": "Deleted"}
+
+
+def _display_value(field, value):
+    # Imported here: lookups imports the models, which import this module.
+    from .lookups import is_lookup_model, lookup_label
+
+    if value is None or value == "":
+        return ""
+    if field.is_relation:
+        if is_lookup_model(field.related_model):
+            return lookup_label(field.related_model, field.target_field.to_python(value), value)
+        return f"#{value}"
+    if field.flatchoices:
+        return dict(field.flatchoices).get(value, value)
+    return field.to_python(value)
+
+
+def describe_changes(history_model, changes):
+    """
+    [(verbose name, old, new)] of a history_changes() ``changes`` dict in
+    field order, with lookups by label and choices by display value.
+    """
+    return [
+        (
+            field.verbose_name,
+            _display_value(field, changes[field.attname][0]),
+            _display_value(field, changes[field.attname][1]),
+        )
+        for field in history_model.tracked_fields
+        if field.attname in changes
+    ]
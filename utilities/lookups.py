@@ -0,0 +1,199 @@
+# utilities/lookups.py
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.forms.models import ModelChoiceIterator
+
+from .cache import cache_is_shared
+
+from .models import (
+    Country,
+    DegreeChoices,
+    Department,
+    EducationGradeChoices,
+    FieldOfStudy,
+    Institution,
+    LanguageChoices,
+    LicenseProvider,
+    Nationality,
+)
+
+LOOKUP_MODELS = [
+    Country,
+    Nationality,
+    DegreeChoices,
+    FieldOfStudy,
+    Institution,
+    EducationGradeChoices,
+    LanguageChoices,
+    Department,
+    LicenseProvider,
+]
+# Lookups whose labels include a Country: reloaded when a country changes.
+COUNTRY_DEPENDENT_MODELS = [Institution, LicenseProvider]
+
+LOOKUP_VERSION_CACHE_KEY = "utilities:lookup_version:{}"
+
+
+class LookupTable:
+    """
+    Every row of one lookup model, in the model's default ordering, with
+    pk -> record and pk -> label maps. Records are model instances, so they
+    can be assigned to foreign keys and rendered as usual.
+    """
+
+    def __init__(self, model, records, version):
+        self.model = model
+        self.records = records
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.by_pk = {record.pk: record for record in records}
+        self._labels = None
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, pk, default=None):
+        return self.by_pk.get(pk, default)
+
+    @property
+    def labels(self):
+        if self._labels is None:
+            self._labels = {record.pk: str(record) for record in self.records}
+        return self._labels
+
+    def label(self, pk, default=""):
+        return self.labels.get(pk, default)
+
+
+class LookupRegistry:
+    """
+    Per-process copies of the lookup tables. Each table is loaded once and
+    reused until its version in the shared cache changes, which
+    ``invalidate`` does (on save/delete, see utilities/signals.py), so every
+    process reloads it on its next use. With a per-process cache the other
+    processes never see the new version: tables are then reloaded once
+    they are LOCAL_CACHE_MAX_TIMEOUT seconds old.
+    """
+
+    def __init__(self):
+        self._tables = {}
+        # Reentrant: loading a country-dependent table loads the countries.
+        self._lock = threading.RLock()
+
+    def table(self, model):
+        version = lookup_version(model)
+        table = self._tables.get(model)
+        if self._is_stale(table, version):
+            with self._lock:
+                table = self._tables.get(model)
+                if self._is_stale(table, version):
+                    table = self._load(model, version)
+                    self._tables[model] = table
+        return table
+
+    def _is_stale(self, table, version):
+        if table is None or table.version != version:
+            return True
+        age = time.monotonic() - table.loaded_at
+        return not cache_is_shared() and age > settings.LOCAL_CACHE_MAX_TIMEOUT
+
+    def _load(self, model, version):
+        records = list(model._default_manager.all())
+        if model in COUNTRY_DEPENDENT_MODELS:
+            countries = self.table(Country)
+            for record in records:
+                record.country = countries.get(record.country_id)
+        return LookupTable(model, records, version)
+
+    def invalidate(self, model):
+        self._tables.pop(model, None)
+        for key_model in [model, *(COUNTRY_DEPENDENT_MODELS if model is Country else [])]:
+            try:
+                cache.incr(_version_key(key_model))
+            except ValueError:
+                cache.set(_version_key(key_model), time.time_ns(), None)
+            self._tables.pop(key_model, None)
+
+    def clear(self):
+        """Drop this process's copies (the shared versions are left alone)."""
+        self._tables.clear()
+
+
+def _version_key(model):
+    return LOOKUP_VERSION_CACHE_KEY.format(model._meta.label_lower)
+
+
+def lookup_version(model):
+    """Current version of a lookup table; changes whenever a row does."""
+    version = cache.get(_version_key(model))
+    if version is None:
+        # Never set, or lost with the cache: start a version no loaded
+        # table can have.
+        cache.add(_version_key(model), time.time_ns(), None)
+        version = cache.get(_version_key(model))
+    return version
+
+
+registry = LookupRegistry()
+
+
+def lookup_table(model):
+    return registry.table(model)
+
+
+def lookup_label(model, pk, default=""):
+    """Display value of a lookup foreign key, e.g. lookup_label(Nationality, candidate.nationality_id)."""
+    if pk is None:
+        return default
+    return registry.table(model).label(pk, default)
+
+
+def invalidate_lookup(model):
+    registry.invalidate(model)
+
+
+def is_lookup_model(model):
+    return model in LOOKUP_MODELS
+
+
+class LookupChoiceIterator(ModelChoiceIterator):
+    """ModelChoiceIterator that takes the choices from the registry."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for record in lookup_table(self.queryset.model):
+            yield self.choice(record)
+
+    def __len__(self):
+        return len(lookup_table(self.queryset.model)) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(len(lookup_table(self.queryset.model)))
+
+
+class LookupChoicesMixin:
+    """
+    ModelForm mixin: select fields over a whole lookup table render their
+    options from the registry instead of querying the table (and, for
+    institutions and license providers, every row's country). Submitted
+    values are still validated against the database.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            queryset = getattr(field, "queryset", None)
+            if (
+                queryset is not None
+                and is_lookup_model(queryset.model)
+                and not queryset.query.has_filters()
+            ):
+                field.iterator = LookupChoiceIterator
+                field.widget.choices = field.choices
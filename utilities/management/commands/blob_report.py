@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from utilities.storage import blob_usage, recount_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the storage the content-addressed file blobs use and the "
+        "space their deduplication saves."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help=(
+                "First recount the references from the file fields and forget "
+                "unreferenced blobs (storage_gc --prefix blobs/ deletes their objects)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["recount"]:
+            forgotten = recount_blobs()
+            self.stdout.write(f"Recounted references; {forgotten} unreferenced blobs forgotten.")
+        usage = blob_usage()
+        logical = usage["stored_bytes"] + usage["saved_bytes"]
+        ratio = usage["saved_bytes"] / logical if logical else 0
+        self.stdout.write(
+            f"{usage['blobs']} blobs for {usage['references']} file references: "
+            f"{filesizeformat(usage['stored_bytes'])} stored of {filesizeformat(logical)} uploaded."
+        )
+        saved = filesizeformat(usage["saved_bytes"])
+        self.stdout.write(self.style.SUCCESS(f"Deduplication saves {saved} ({ratio:.0%})."))
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from utilities.history import (
+    create_monthly_partitions,
+    month_start,
+    next_month,
+    partitioned_history_models,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the upcoming monthly partitions of the partitioned history "
+        "tables. Run it monthly; rows of months without a partition go to "
+        "the default partition and are moved when theirs is created."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.HISTORY_PARTITION_MONTHS_AHEAD,
+            help="Months after the current one (default: HISTORY_PARTITION_MONTHS_AHEAD).",
+        )
+
+    def handle(self, *args, **options):
+        first = month_start(timezone.now())
+        last = first
+        for _ in range(options["months_ahead"]):
+            last = next_month(last)
+        total = 0
+        for model in partitioned_history_models():
+            with transaction.atomic(), connection.cursor() as cursor:
+                created = create_monthly_partitions(cursor, model._meta.db_table, first, last)
+            for name in created:
+                self.stdout.write(f"Created {name}")
+            total += len(created)
+        self.stdout.write(self.style.SUCCESS(f"Created {total} partitions."))
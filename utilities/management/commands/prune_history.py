@@ -0,0 +1,65 @@
+import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from utilities.history import history_models, prunable_history, prune_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete historical records older than the retention period that a "
+        "newer version supersedes (or whose object was deleted), in batches. "
+        "The latest version of every live object is kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.HISTORY_RETENTION_DAYS,
+            help="Retention period in days (default: HISTORY_RETENTION_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--model",
+            action="append",
+            help="Only the history of this model, e.g. candidates.Candidate (repeatable).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only count the prunable records."
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--days and --batch-size must be positive.")
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        models = history_models()
+        if options["model"]:
+            try:
+                tracked = {apps.get_model(label) for label in options["model"]}
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+            models = [model for model in models if model.instance_type in tracked]
+
+        total = 0
+        for model in models:
+            label = model.instance_type._meta.label
+            if options["dry_run"]:
+                count = prunable_history(model, cutoff).count()
+            else:
+                count = prune_history(
+                    model,
+                    cutoff,
+                    batch_size=options["batch_size"],
+                    progress=lambda done: self.stdout.write(f"{label}: {done} deleted"),
+                )
+            if count:
+                self.stdout.write(f"{label}: {count} records")
+            total += count
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {total} historical records older than {cutoff:%Y-%m-%d}.")
+        )
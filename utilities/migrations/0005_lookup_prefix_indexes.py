@@ -0,0 +1,85 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:57
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("utilities", "0004_alter_historicalinstitution_type_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="country",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="text_pattern_ops",
+                ),
+                name="country_name_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="department",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"),
+                    name="text_pattern_ops",
+                ),
+                name="department_title_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="department",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("abbreviation"),
+                    name="text_pattern_ops",
+                ),
+                name="department_abbr_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fieldofstudy",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("field_of_study"),
+                    name="text_pattern_ops",
+                ),
+                name="field_of_study_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="institution",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("institution"),
+                    name="text_pattern_ops",
+                ),
+                name="institution_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="institution",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("abbreviation"),
+                    name="text_pattern_ops",
+                ),
+                name="institution_abbr_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="licenseprovider",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="text_pattern_ops",
+                ),
+                name="license_provider_prefix_idx",
+            ),
+        ),
+    ]
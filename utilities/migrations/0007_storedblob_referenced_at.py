@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("utilities", "0006_storedblob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="storedblob",
+            name="referenced_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,11 +1,15 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from simple_history.models import HistoricalRecords
+
+from .history import ChangedOnlyHistoricalRecords
 
 
 # Create your models here.
 class Country(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     code = models.CharField(
         max_length=3,
@@ -23,10 +27,14 @@ class Country(models.Model):
         verbose_name = _("Country")
         verbose_name_plural = _("Countries")
         ordering = ["name"]
+        # Prefix search of the autocomplete (utilities/autocomplete.py).
+        indexes = [
+            models.Index(OpClass(Upper("name"), name="text_pattern_ops"), name="country_name_prefix_idx"),
+        ]
 
 
 class Nationality(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
 
     nationality_name = models.CharField(
         max_length=100, verbose_name=_("Nationality Name")
@@ -42,7 +50,7 @@ class Nationality(models.Model):
 
 
 class DegreeChoices(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
     degree = models.CharField(
         max_length=255,
         verbose_name=_("Degree"),
@@ -66,7 +74,7 @@ class DegreeChoices(models.Model):
 
 
 class FieldOfStudy(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
     field_of_study = models.CharField(
         max_length=255,
         verbose_name=_("Field of Study"),
@@ -80,10 +88,14 @@ class FieldOfStudy(models.Model):
         verbose_name = _("Field of Study")
         verbose_name_plural = _("Fields of Study")
         ordering = ["field_of_study"]
+        # Prefix search of the autocomplete (utilities/autocomplete.py).
+        indexes = [
+            models.Index(OpClass(Upper("field_of_study"), name="text_pattern_ops"), name="field_of_study_prefix_idx"),
+        ]
 
 
 class Institution(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
     institution = models.CharField(
         max_length=255,
         verbose_name=_("Institution"),
@@ -113,17 +125,22 @@ class Institution(models.Model):
 
     def __str__(self):
         return r"{} , {} , {} at {}".format(
-            self.abbreviation, self.type, self.institution, self.country.name
+            self.abbreviation, self.type, self.institution, getattr(self.country, "name", "")
         )
 
     class Meta:
         verbose_name = _("Institution")
         verbose_name_plural = _("Institutions")
         ordering = ["type", "institution"]
+        # Prefix search of the autocomplete (utilities/autocomplete.py).
+        indexes = [
+            models.Index(OpClass(Upper("institution"), name="text_pattern_ops"), name="institution_prefix_idx"),
+            models.Index(OpClass(Upper("abbreviation"), name="text_pattern_ops"), name="institution_abbr_prefix_idx"),
+        ]
 
 
 class EducationGradeChoices(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
     grade = models.CharField(
         max_length=255,
         verbose_name=_("Grade"),
@@ -141,7 +158,7 @@ class EducationGradeChoices(models.Model):
 
 
 class LanguageChoices(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
     language = models.CharField(
         max_length=255,
         verbose_name=_("Language-Name"),
@@ -159,7 +176,7 @@ class LanguageChoices(models.Model):
 
 
 class Department(models.Model):
-    history = HistoricalRecords()
+    history = ChangedOnlyHistoricalRecords()
     abbreviation = models.CharField(
         max_length=20,
         blank=True,
@@ -185,6 +202,11 @@ class Department(models.Model):
         verbose_name = _("Department")
         verbose_name_plural = _("Departments")
         ordering = ["title"]
+        # Prefix search of the autocomplete (utilities/autocomplete.py).
+        indexes = [
+            models.Index(OpClass(Upper("title"), name="text_pattern_ops"), name="department_title_prefix_idx"),
+            models.Index(OpClass(Upper("abbreviation"), name="text_pattern_ops"), name="department_abbr_prefix_idx"),
+        ]
 
 
 class LicenseProvider(models.Model):
@@ -204,9 +226,36 @@ class LicenseProvider(models.Model):
     )
 
     def __str__(self):
-        return r"{} / {}".format(self.name, self.country.name)
+        return r"{} / {}".format(self.name, getattr(self.country, "name", ""))
 
     class Meta:
         verbose_name = _("License Provider")
         verbose_name_plural = _("License Providers")
         ordering = ["name"]
+        # Prefix search of the autocomplete (utilities/autocomplete.py).
+        indexes = [
+            models.Index(OpClass(Upper("name"), name="text_pattern_ops"), name="license_provider_prefix_idx"),
+        ]
+
+
+class StoredBlob(models.Model):
+    """
+    A file stored once under its content hash by ContentAddressedStorage
+    (utilities/storage.py); ``ref_count`` file field values refer to it.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    key = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=1)
+    # When a file field was last given this blob; recount_blobs leaves the
+    # counts of recently referenced blobs alone.
+    referenced_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.key
+
+    class Meta:
+        verbose_name = _("Stored Blob")
+        verbose_name_plural = _("Stored Blobs")
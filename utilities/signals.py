@@ -0,0 +1,17 @@
+# utilities/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .lookups import LOOKUP_MODELS, invalidate_lookup
+
+
+def _invalidate(sender, **kwargs):
+    # Now, so this process sees its own change inside the transaction, and
+    # again after the commit in case another process reloaded in between.
+    invalidate_lookup(sender)
+    transaction.on_commit(lambda: invalidate_lookup(sender))
+
+
+for model in LOOKUP_MODELS:
+    post_save.connect(_invalidate, sender=model, dispatch_uid=f"invalidate_lookup_{model.__name__}")
+    post_delete.connect(_invalidate, sender=model, dispatch_uid=f"delete_lookup_{model.__name__}")
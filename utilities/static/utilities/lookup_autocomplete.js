@@ -0,0 +1,22 @@
+// utilities/static/utilities/lookup_autocomplete.js
+// select2 for the LookupAutocompleteSelect widgets: the options are loaded
+// page by page from the lookup_autocomplete endpoint as the user types.
+document.addEventListener("DOMContentLoaded", function () {
+    $("select.lookup-autocomplete").each(function () {
+        const select = this;
+        $(select).select2({
+            width: "100%",
+            placeholder: "---------",
+            allowClear: !select.multiple && !select.required,
+            ajax: {
+                url: select.dataset.autocompleteUrl,
+                dataType: "json",
+                delay: 250,
+                cache: true,
+                data: function (params) {
+                    return {q: params.term || "", page: params.page || 1};
+                },
+            },
+        });
+    });
+});
@@ -0,0 +1,215 @@
+# utilities/storage.py
+import hashlib
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import Storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .files import file_fields
+from .models import StoredBlob
+
+BLOB_PREFIX = "blobs/"
+# The file field row that refers to a new blob reference is committed some
+# time after the reference is counted (at the end of the request); recounts
+# leave the blobs referenced more recently than this alone.
+RECOUNT_SETTLE_TIME = timedelta(hours=1)
+RECOUNT_BATCH_SIZE = 2000
+
+
+def is_blob_key(name):
+    return bool(name) and name.startswith(BLOB_PREFIX)
+
+
+def blob_key(digest, name):
+    """``blobs/ab/<sha256><ext>``; the extension keeps the content type guessable."""
+    ext = os.path.splitext(name)[1].lower()
+    return f"{BLOB_PREFIX}{digest[:2]}/{digest}{ext}"
+
+
+def content_digest(content):
+    """sha256 and size of ``content``, read chunk by chunk and rewound."""
+    digest = hashlib.sha256()
+    size = 0
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+        size += len(chunk)
+    content.seek(0)
+    return digest.hexdigest(), size
+
+
+class ContentAddressedStorage(Storage):
+    """
+    Storage wrapper that stores the files saved under ``prefixes`` once per
+    distinct content: the name saved on the file field is the shared blob's
+    key, and a StoredBlob row counts the references to it. Re-uploading a
+    document, or uploading the same scan to several fields, costs no new
+    object. delete() releases one reference; the object goes with the last.
+
+    Other names (exports, ...) are passed to the wrapped ``backend``.
+    """
+
+    def __init__(
+        self,
+        backend="storages.backends.s3.S3StaticStorage",
+        options=None,
+        prefixes=("candidates/",),
+    ):
+        self.backend = import_string(backend)(**(options or {}))
+        self.prefixes = tuple(prefixes)
+
+    def _deduplicated(self, name):
+        return name.startswith(self.prefixes)
+
+    def get_available_name(self, name, max_length=None):
+        if self._deduplicated(name):
+            # _save() replaces the name with the blob's key.
+            return name
+        return self.backend.get_available_name(name, max_length=max_length)
+
+    def _save(self, name, content):
+        if not self._deduplicated(name):
+            return self.backend.save(name, content)
+        digest, size = content_digest(content)
+        if self._add_reference(digest):
+            return StoredBlob.objects.values_list("key", flat=True).get(sha256=digest)
+
+        key = blob_key(digest, name)
+        # The same content always has the same key, so overwriting is harmless.
+        self.backend._save(key, content)
+        try:
+            with transaction.atomic():
+                StoredBlob.objects.create(sha256=digest, key=key, size=size)
+        except IntegrityError:
+            # Uploaded concurrently by another request.
+            self._add_reference(digest)
+        return key
+
+    def _add_reference(self, digest):
+        return StoredBlob.objects.filter(sha256=digest).update(
+            ref_count=F("ref_count") + 1, referenced_at=timezone.now()
+        )
+
+    def delete(self, name):
+        if not is_blob_key(name):
+            return self.backend.delete(name)
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(key=name).first()
+            if blob is not None and blob.ref_count > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+                return
+            if blob is not None:
+                blob.delete()
+            transaction.on_commit(lambda: self._delete_unreferenced(name))
+
+    def _delete_unreferenced(self, name):
+        # The same content may have been uploaded again since the row was
+        # deleted: the new row refers to the same key, so the object stays.
+        if not StoredBlob.objects.filter(key=name).exists():
+            self.backend.delete(name)
+
+    def _open(self, name, mode="rb"):
+        return self.backend.open(name, mode)
+
+    def generate_filename(self, filename):
+        return self.backend.generate_filename(filename)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def url(self, name):
+        return self.backend.url(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+    def get_accessed_time(self, name):
+        return self.backend.get_accessed_time(name)
+
+    def get_created_time(self, name):
+        return self.backend.get_created_time(name)
+
+    def get_modified_time(self, name):
+        return self.backend.get_modified_time(name)
+
+
+def blob_references():
+    """How many file field values refer to each blob key, over all models."""
+    references = Counter()
+    for model in apps.get_models():
+        names = list(file_fields(model))
+        if not names:
+            continue
+        for row in model._default_manager.values_list(*names).iterator(chunk_size=2000):
+            references.update(name for name in row if is_blob_key(name))
+    return references
+
+
+def recount_blobs(settle_time=RECOUNT_SETTLE_TIME, batch_size=RECOUNT_BATCH_SIZE):
+    """
+    Set the StoredBlobs' ref_count from the file fields (references are
+    lost when rows are deleted or files replaced) and forget the blobs no
+    field refers to; their objects are left to the storage_gc command.
+    Returns the number of forgotten blobs.
+
+    Uploads keep running meanwhile. Counts are raised freely, but only
+    lowered (or the blob forgotten) when the blob got no new reference
+    within ``settle_time`` of the recount: a newer reference may not be
+    committed yet, and dropping it would delete a file still in use. The
+    rows are locked while they are updated, so uploads and deletions
+    counting references at the same time wait and apply on top.
+    """
+    cutoff = timezone.now() - settle_time
+    references = blob_references()
+    forgotten = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                StoredBlob.objects.select_for_update()
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", "key", "ref_count", "referenced_at")[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            changed = []
+            unreferenced = []
+            for blob in batch:
+                count = references.get(blob.key, 0)
+                if count == blob.ref_count or (
+                    count < blob.ref_count and blob.referenced_at >= cutoff
+                ):
+                    continue
+                if count:
+                    blob.ref_count = count
+                    changed.append(blob)
+                else:
+                    unreferenced.append(blob.pk)
+            StoredBlob.objects.bulk_update(changed, ["ref_count"])
+            StoredBlob.objects.filter(pk__in=unreferenced).delete()
+            forgotten += len(unreferenced)
+    return forgotten
+
+
+def blob_usage():
+    """Blobs, references, bytes stored and bytes the deduplication saved."""
+    return StoredBlob.objects.aggregate(
+        blobs=Count("pk"),
+        references=Sum("ref_count", default=0),
+        stored_bytes=Sum("size", default=0),
+        saved_bytes=Sum(F("size") * (F("ref_count") - 1), default=0),
+    )
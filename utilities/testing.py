@@ -0,0 +1,61 @@
+# utilities/testing.py
+from django.contrib import admin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class QueryBudgetMixin:
+    """
+    ``assertMaxQueries`` for TestCase classes: like assertNumQueries, but
+    an upper bound, so a view that gets cheaper does not fail the test.
+    """
+
+    def assertMaxQueries(self, limit, func=None, *args, **kwargs):
+        context = _MaxQueriesContext(self, limit)
+        if func is None:
+            return context
+        with context:
+            return func(*args, **kwargs)
+
+    def assertChangelistQueries(self, model, limit, search="a"):
+        """
+        Load the model's admin changelist (the client must be logged in as
+        a superuser) unfiltered, searched and sorted by each column, each
+        within ``limit`` queries.
+        """
+        opts = model._meta
+        url = reverse(f"admin:{opts.app_label}_{opts.model_name}_changelist")
+        model_admin = admin.site._registry[model]
+        requests = [{}, {"q": search}]
+        requests += [{"o": str(i)} for i in range(1, len(model_admin.list_display) + 1)]
+        for params in requests:
+            with self.subTest(model=opts.model_name, **params), self.assertMaxQueries(limit):
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+
+
+class _MaxQueriesContext(CaptureQueriesContext):
+    def __init__(self, test_case, limit):
+        self.test_case = test_case
+        self.limit = limit
+        super().__init__(connection)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        executed = len(self)
+        self.test_case.assertLessEqual(
+            executed,
+            self.limit,
+            "%d queries executed, at most %d expected\nCaptured queries were:\n%s"
+            % (
+                executed,
+                self.limit,
+                "\n".join(
+                    "%d. %s" % (i, query["sql"])
+                    for i, query in enumerate(self.captured_queries, start=1)
+                ),
+            ),
+        )
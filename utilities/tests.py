@@ -1,3 +1,386 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from candidates.exporters import EXPORT_HEADERS, export_queryset, iter_export_rows
+from candidates.factories import CandidateFactory, EducationFactory
+from candidates.forms import CandidateForm, EducationForm
+from candidates.models import Candidate
+from candidates.storage_gc import candidate_files
+
+from .autocomplete import AUTOCOMPLETE_PAGE_SIZE
+from .cache import cache_is_shared, cache_timeout, check_shared_cache
+from .factories import CountryFactory, InstitutionFactory, NationalityFactory
+from .history import (
+    create_monthly_partitions,
+    history_changes,
+    is_partitioned,
+    month_start,
+    next_month,
+)
+from .lookups import LOOKUP_MODELS, lookup_label, lookup_table
+from .models import (
+    Country,
+    FieldOfStudy,
+    Institution,
+    LicenseProvider,
+    Nationality,
+    StoredBlob,
+)
+from . import storage
+from .storage import blob_usage, recount_blobs
+from .testing import QueryBudgetMixin
+
+
+class LookupRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_table_is_loaded_once(self):
+        nationality = NationalityFactory(nationality_name="Jordanian")
+        with self.assertNumQueries(1):
+            lookup_table(Nationality)
+        with self.assertNumQueries(0):
+            self.assertEqual(lookup_label(Nationality, nationality.pk), "Jordanian")
+            self.assertEqual(lookup_label(Nationality, None), "")
+
+    def test_save_and_delete_invalidate(self):
+        nationality = NationalityFactory(nationality_name="Jordanian")
+        lookup_table(Nationality)
+        nationality.nationality_name = "Egyptian"
+        nationality.save()
+        self.assertEqual(lookup_label(Nationality, nationality.pk), "Egyptian")
+        nationality.delete()
+        self.assertIsNone(lookup_table(Nationality).get(nationality.pk))
+
+    @override_settings(LOCAL_CACHE_MAX_TIMEOUT=0)
+    def test_tables_expire_without_a_shared_cache(self):
+        lookup_table(Nationality)
+        # Saved by another process, whose invalidation this one never sees.
+        nationality = Nationality.objects.bulk_create([Nationality(nationality_name="Filipino")])[0]
+        self.assertEqual(lookup_label(Nationality, nationality.pk), "Filipino")
+
+    def test_cleared_cache_reloads(self):
+        lookup_table(Nationality)
+        nationality = Nationality.objects.bulk_create([Nationality(nationality_name="Filipino")])[0]
+        cache.clear()
+        self.assertEqual(lookup_label(Nationality, nationality.pk), "Filipino")
+
+    def test_institution_labels_use_the_countries_table(self):
+        institution = InstitutionFactory(country=CountryFactory(code="JO", name="Jordan"))
+        lookup_table(Institution)
+        with self.assertNumQueries(0):
+            self.assertTrue(lookup_label(Institution, institution.pk).endswith("at Jordan"))
+
+        Country.objects.filter(code="JO").update(name="Hashemite Kingdom of Jordan")
+        Country.objects.get(code="JO").save()
+        self.assertTrue(
+            lookup_label(Institution, institution.pk).endswith("at Hashemite Kingdom of Jordan")
+        )
+
+    def test_form_choices_come_from_the_registry(self):
+        nationality = NationalityFactory(nationality_name="Jordanian")
+        CandidateForm().as_p()
+        with self.assertNumQueries(0):
+            html = CandidateForm().as_p()
+        self.assertIn(f'<option value="{nationality.pk}">Jordanian</option>', html)
+
+        form = CandidateForm(data={"nationality": "0"})
+        form.is_valid()
+        self.assertIn("nationality", form.errors)
+
+    def test_export_rows_resolve_lookup_names(self):
+        candidate = CandidateFactory(
+            nationality=NationalityFactory(nationality_name="Jordanian"),
+            country=CountryFactory(code="JO", name="Jordan"),
+        )
+        [row] = iter_export_rows(export_queryset({}))
+        row = dict(zip(EXPORT_HEADERS, row))
+        self.assertEqual(row["ID"], candidate.pk)
+        self.assertEqual((row["Nationality"], row["Country"]), ("Jordanian", "Jordan"))
+
+
+@override_settings(LOCAL_CACHE_MAX_TIMEOUT=60)
+class CacheTimeoutTests(SimpleTestCase):
+    def test_per_process_cache(self):
+        self.assertFalse(cache_is_shared())
+        self.assertEqual(cache_timeout(60 * 60), 60)
+        self.assertEqual(cache_timeout(None), 60)
+        self.assertEqual(cache_timeout(10), 10)
+        [warning] = check_shared_cache(None)
+        self.assertEqual(warning.id, "utilities.W001")
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "cache"}}
+    )
+    def test_shared_cache(self):
+        self.assertTrue(cache_is_shared())
+        self.assertEqual(cache_timeout(60 * 60), 60 * 60)
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class LookupAutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("recruiter", password="secret")
+        FieldOfStudy.objects.bulk_create(
+            [FieldOfStudy(field_of_study=f"Nursing {i:02d}") for i in range(25)]
+            + [FieldOfStudy(field_of_study="Pharmacy")]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def autocomplete(self, model_name, **params):
+        response = self.client.get(
+            reverse("utilities:lookup_autocomplete", args=[model_name]), params
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_of_prefix_matches(self):
+        first = self.autocomplete("fieldofstudy", q="nurs")
+        self.assertEqual(len(first["results"]), AUTOCOMPLETE_PAGE_SIZE)
+        self.assertTrue(first["pagination"]["more"])
+        self.assertEqual(first["results"][0]["text"], "Nursing 00")
+
+        second = self.autocomplete("fieldofstudy", q="nurs", page=2)
+        self.assertEqual(len(second["results"]), 5)
+        self.assertFalse(second["pagination"]["more"])
+
+        self.assertEqual(
+            [result["text"] for result in self.autocomplete("fieldofstudy", q="PHA")["results"]],
+            ["Pharmacy"],
+        )
+
+    def test_results_are_cached_until_the_table_changes(self):
+        self.autocomplete("fieldofstudy", q="pha")
+        FieldOfStudy.objects.filter(field_of_study="Pharmacy").update(field_of_study="Pharmacology")
+        self.assertEqual(self.autocomplete("fieldofstudy", q="pha")["results"][0]["text"], "Pharmacy")
+
+        FieldOfStudy.objects.get(field_of_study="Pharmacology").save()
+        self.assertEqual(
+            self.autocomplete("fieldofstudy", q="pha")["results"][0]["text"], "Pharmacology"
+        )
+
+    def test_unknown_lookup(self):
+        response = self.client.get(reverse("utilities:lookup_autocomplete", args=["candidate"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_form_renders_only_the_selected_options(self):
+        education = EducationFactory()
+        other = InstitutionFactory(institution="Another University")
+        html = EducationForm(instance=education).as_p()
+        self.assertIn(f'<option value="{education.institution.pk}" selected>', html)
+        self.assertNotIn(f'value="{other.pk}"', html)
+        self.assertNotIn("Nursing 00", html)
+        self.assertIn(reverse("utilities:lookup_autocomplete", args=["institution"]), html)
+
+        form = EducationForm(data={"institution": "not-a-pk"})
+        form.as_p()
+        self.assertIn("institution", form.errors)
+
+    def test_prefix_search_uses_the_indexes(self):
+        queryset = Institution.objects.filter(
+            Q(institution__istartswith="uni") | Q(abbreviation__istartswith="uni")
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+            try:
+                plan = queryset.explain()
+            finally:
+                cursor.execute("SET enable_seqscan = on")
+        self.assertIn("institution_prefix_idx", plan)
+        self.assertIn("institution_abbr_prefix_idx", plan)
+
+
+class LookupAdminQueryCountTests(QueryBudgetMixin, TestCase):
+    """Query budgets of the lookup admin changelists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("staff", "staff@example.com", "x")
+        countries = CountryFactory.create_batch(5)
+        for country in countries:
+            InstitutionFactory.create_batch(3, country=country)
+            LicenseProvider.objects.create(name=f"Council of {country.name}", country=country)
+        # A provider whose country was deleted (SET_NULL).
+        LicenseProvider.objects.create(name="Orphan Council")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_changelists(self):
+        for model in LOOKUP_MODELS:
+            self.assertChangelistQueries(model, 6)
+
+
+class HistoryTests(TestCase):
+    def age(self, records, days):
+        """Date the records ``days`` ago, a second apart in their order."""
+        for i, record in enumerate(sorted(records, key=lambda record: record.history_id)):
+            record.__class__.objects.filter(history_id=record.history_id).update(
+                history_date=timezone.now() - datetime.timedelta(days=days, seconds=-i)
+            )
+
+    def test_unchanged_saves_are_not_recorded(self):
+        candidate = CandidateFactory()
+        candidate.save()
+        Candidate.objects.get(pk=candidate.pk).save()
+        candidate.delete_resume()
+        self.assertEqual(candidate.history.count(), 1)
+
+        candidate.first_name = "Changed"
+        candidate.save()
+        self.assertEqual(candidate.history.count(), 2)
+
+    def test_changes_hold_only_the_changed_fields(self):
+        jordanian = NationalityFactory(nationality_name="Jordanian")
+        egyptian = NationalityFactory(nationality_name="Egyptian")
+        candidate = CandidateFactory(first_name="Ali", nationality=jordanian)
+        candidate.first_name = "Omar"
+        candidate.nationality = egyptian
+        candidate.save()
+
+        versions, has_next = history_changes(Candidate.history.model, candidate.pk)
+        self.assertFalse(has_next)
+        self.assertEqual([version["history_type"] for version in versions], ["~", "+"])
+        self.assertEqual(
+            versions[0]["changes"],
+            {"first_name": ["Ali", "Omar"], "nationality_id": [jordanian.pk, egyptian.pk]},
+        )
+        self.assertIsNone(versions[1]["changes"])
+
+    def test_prune_keeps_the_latest_version_of_live_objects(self):
+        kept = NationalityFactory(nationality_name="Jordanian")
+        kept.nationality_name = "Jordanian (JO)"
+        kept.save()
+        deleted = NationalityFactory(nationality_name="Syrian")
+        deleted.delete()
+        self.age(Nationality.history.all(), days=400)
+        recent = NationalityFactory(nationality_name="Iraqi")
+        recent.nationality_name = "Iraqi (IQ)"
+        recent.save()
+
+        out = StringIO()
+        call_command("prune_history", days=365, batch_size=1, stdout=out)
+        self.assertIn("Deleted 3 historical records", out.getvalue())
+        self.assertEqual(
+            list(Nationality.history.order_by("history_id").values_list("nationality_name", flat=True)),
+            ["Jordanian (JO)", "Iraqi", "Iraqi (IQ)"],
+        )
+
+    def test_candidate_history_is_partitioned_by_month(self):
+        table = Candidate.history.model._meta.db_table
+        with connection.cursor() as cursor:
+            self.assertTrue(is_partitioned(cursor, table))
+
+        candidate = CandidateFactory()
+        far = month_start(timezone.now() + datetime.timedelta(days=3 * 365))
+        Candidate.history.filter(id=candidate.pk).update(history_date=far)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT tableoid::regclass::text FROM {table} WHERE id = %s", [candidate.pk])
+            self.assertEqual(cursor.fetchone()[0], f"{table}_default")
+
+            [name] = create_monthly_partitions(cursor, table, far, far)
+            cursor.execute(f"SELECT tableoid::regclass::text FROM {table} WHERE id = %s", [candidate.pk])
+            self.assertEqual(cursor.fetchone()[0], name)
+            self.assertEqual(create_monthly_partitions(cursor, table, far, far), [])
+        self.assertEqual(next_month(far).month, far.month % 12 + 1)
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "utilities.storage.ContentAddressedStorage",
+            "OPTIONS": {"backend": "django.core.files.storage.InMemoryStorage"},
+        },
+    }
+)
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.first, self.second = CandidateFactory.create_batch(2)
+        self.first.passport_copy.save("scan.PDF", ContentFile(b"passport"), save=False)
+        self.first.resume_copy.save("cv.pdf", ContentFile(b"resume"))
+        self.second.resume_copy.save("passport.pdf", ContentFile(b"passport"))
+
+    def test_identical_uploads_share_one_blob(self):
+        key = self.first.passport_copy.name
+        self.assertTrue(key.startswith("blobs/") and key.endswith(".pdf"))
+        self.assertEqual(self.second.resume_copy.name, key)
+        self.assertEqual(StoredBlob.objects.get(key=key).ref_count, 2)
+        self.assertEqual(
+            blob_usage(),
+            {"blobs": 2, "references": 3, "stored_bytes": 14, "saved_bytes": 8},
+        )
+        self.assertEqual(candidate_files(self.second), [("resume_copy.pdf", key)])
+        # Files outside the candidate directories are not deduplicated.
+        name = default_storage.save("exports/a.csv", ContentFile(b"passport"))
+        self.assertEqual(name, "exports/a.csv")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.clear_files("passport_copy")
+        self.assertEqual(StoredBlob.objects.get(key=key).ref_count, 1)
+        self.assertTrue(default_storage.exists(key))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.clear_files("resume_copy")
+        self.assertFalse(StoredBlob.objects.filter(key=key).exists())
+        self.assertFalse(default_storage.exists(key))
+
+    def test_deleted_blob_uploaded_again_before_commit_is_kept(self):
+        key = self.first.resume_copy.name
+        with self.captureOnCommitCallbacks() as callbacks:
+            default_storage.delete(key)
+        self.assertFalse(StoredBlob.objects.filter(key=key).exists())
+        # Another request stores the same content before the deletion runs.
+        self.assertEqual(default_storage.save("candidates/x/cv.pdf", ContentFile(b"resume")), key)
+        for callback in callbacks:
+            callback()
+        self.assertTrue(default_storage.exists(key))
+
+    def test_recount_blobs(self):
+        key = self.first.resume_copy.name
+        StoredBlob.objects.update(referenced_at=timezone.now() - datetime.timedelta(hours=2))
+        StoredBlob.objects.filter(key=key).update(ref_count=5)
+        Candidate.objects.filter(pk=self.second.pk).update(resume_copy=None)
+        self.assertEqual(recount_blobs(), 0)
+        Candidate.objects.filter(pk=self.first.pk).update(passport_copy=None)
+        self.assertEqual(recount_blobs(), 1)
+        self.assertEqual(list(StoredBlob.objects.values_list("key", "ref_count")), [(key, 1)])
+
+    def test_recount_keeps_references_of_concurrent_uploads(self):
+        StoredBlob.objects.update(referenced_at=timezone.now() - datetime.timedelta(hours=2))
+        passport = self.first.passport_copy.name
+        read_references = storage.blob_references
+
+        def upload_meanwhile():
+            # Saved to the storage but not yet to a file field when the
+            # references are counted.
+            references = read_references()
+            default_storage.save("candidates/x/passport.pdf", ContentFile(b"passport"))
+            default_storage.save("candidates/x/new.pdf", ContentFile(b"new"))
+            return references
+
+        with mock.patch.object(storage, "blob_references", upload_meanwhile):
+            self.assertEqual(recount_blobs(), 0)
+        self.assertEqual(StoredBlob.objects.get(key=passport).ref_count, 3)
+        self.assertEqual(StoredBlob.objects.count(), 3)
+
+        # Once settled, the references that never made it are dropped.
+        self.assertEqual(recount_blobs(settle_time=datetime.timedelta(0)), 1)
+        self.assertEqual(StoredBlob.objects.get(key=passport).ref_count, 2)
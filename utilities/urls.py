@@ -0,0 +1,13 @@
+# utilities/urls.py
+from django.urls import path
+
+from . import views
+
+app_name = "utilities"
+urlpatterns = [
+    path(
+        "autocomplete/<str:model_name>/",
+        views.lookup_autocomplete,
+        name="lookup_autocomplete",
+    ),
+]
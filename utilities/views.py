@@ -0,0 +1,19 @@
+# utilities/views.py
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
+
+from .autocomplete import AUTOCOMPLETE_MODELS, search_lookup
+
+
+@require_GET
+def lookup_autocomplete(request, model_name):
+    """Paginated select2 options of one lookup table, filtered by ``q``."""
+    model = AUTOCOMPLETE_MODELS.get(model_name)
+    if model is None:
+        raise Http404("Unknown lookup.")
+    try:
+        page = max(int(request.GET.get("page") or 1), 1)
+    except ValueError:
+        page = 1
+    query = request.GET.get("q", "").strip()[:100]
+    return JsonResponse(search_lookup(model, query, page))
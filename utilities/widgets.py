@@ -0,0 +1,63 @@
+# utilities/widgets.py
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+from .autocomplete import with_label_relations
+
+
+class LookupAutocompleteMixin:
+    """
+    Select widget for a lookup ModelChoiceField that renders only the
+    selected options; select2 fetches the others page by page from the
+    lookup_autocomplete endpoint as the user types.
+    """
+
+    class Media:
+        js = ["utilities/lookup_autocomplete.js"]
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        model = self.choices.queryset.model
+        widget_attrs = context["widget"]["attrs"]
+        widget_attrs["class"] = f"{widget_attrs.get('class', '')} lookup-autocomplete".strip()
+        widget_attrs["data-autocomplete-url"] = reverse(
+            "utilities:lookup_autocomplete", args=[model._meta.model_name]
+        )
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        options = []
+        if not self.allow_multiple_selected and field.empty_label is not None:
+            options.append(self.create_option(name, "", field.empty_label, False, 0, attrs=attrs))
+        selected = [pk for pk in value if pk not in ("", None)]
+        records = []
+        if selected:
+            try:
+                records = list(
+                    with_label_relations(self.choices.queryset.filter(pk__in=selected))
+                )
+            except (ValueError, TypeError, ValidationError):
+                # A tampered value in a bound form; the field reports the error.
+                pass
+        for record in records:
+            options.append(
+                self.create_option(
+                    name,
+                    record.pk,
+                    field.label_from_instance(record),
+                    True,
+                    len(options),
+                    attrs=attrs,
+                )
+            )
+        return [(None, options, 0)]
+
+
+class LookupAutocompleteSelect(LookupAutocompleteMixin, forms.Select):
+    pass
+
+
+class LookupAutocompleteSelectMultiple(LookupAutocompleteMixin, forms.SelectMultiple):
+    pass